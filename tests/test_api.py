@@ -0,0 +1,14 @@
+import unittest
+
+from httpd.api import MAX_LIMIT, create_app
+
+
+class ListLimitTest(unittest.TestCase):
+    def setUp(self):
+        self.client = create_app(workers=1).test_client()
+
+    def test_limits_are_clamped(self):
+        for limit in (0, -1, MAX_LIMIT + 1):
+            response = self.client.get(f"/characters?limit={limit}")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()["next"], None)
@@ -0,0 +1,29 @@
+import os
+import tempfile
+import unittest
+
+from archive import ArchiveWriter, CharacterArchive
+
+
+class ArchiveWriterTest(unittest.TestCase):
+    def test_reopened_archives_survive_a_crash(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "characters.thar")
+            with ArchiveWriter(path) as writer:
+                writer.add({"name": "First", "level": 1})
+
+            # A crash leaves the writer open: its trailer is never written.
+            writer = ArchiveWriter(path)
+            writer.add({"name": "Second", "level": 2})
+            writer._file.close()
+            with CharacterArchive(path) as archive:
+                self.assertEqual([c["name"] for c in archive], ["First"])
+
+            with ArchiveWriter(path) as writer:
+                writer.add({"name": "Third", "level": 3})
+            with CharacterArchive(path) as archive:
+                self.assertEqual([c["name"] for c in archive], ["First", "Third"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from attributes import ABILITIES
+from balance import get_score_table
+from batch import build_character, get_random_policy, make_build_request
+from characters import RulesetReader
+from policies import ScriptedPolicy
+
+BUILDS = 1000
+
+
+class ScoreTableTest(unittest.TestCase):
+    def assertMatchesSimulation(self, options: dict, primaries: tuple) -> None:
+        """Checks a table's expected scores against seeded level 1 builds."""
+        options_by_rank = RulesetReader.get_entry_class(options["klass"])[
+            "primary_ability"
+        ].values()
+        answers = {
+            "primary_ability": [
+                a for a, o in zip(primaries, options_by_rank) if isinstance(o, list)
+            ]
+        }
+
+        def get_policy(seed):
+            return ScriptedPolicy(answers, get_random_policy(seed))
+
+        totals = [0] * len(ABILITIES)
+        for seed in range(BUILDS):
+            request = make_build_request({**options, "level": 1, "seed": seed})
+            character = build_character(request, get_policy).to_dict()
+            for index, ability in enumerate(ABILITIES):
+                totals[index] += character[ability.lower()]["score"]
+
+        table = get_score_table(
+            options["klass"], primaries, options["race"], options.get("subrace", "")
+        )
+        for ability, total, expected in zip(ABILITIES, totals, table.expected):
+            self.assertAlmostEqual(total / BUILDS, expected, delta=0.25, msg=ability)
+
+    def test_subrace_bonuses(self):
+        self.assertMatchesSimulation(
+            {"race": "Dwarf", "subrace": "Hill", "klass": "Fighter"},
+            ("Strength", "Constitution"),
+        )
+
+    def test_bonus_choices(self):
+        self.assertMatchesSimulation(
+            {"race": "HalfElf", "klass": "Wizard"}, ("Intelligence", "Constitution")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+
+from batch import build_character, get_random_policy, make_build_request
+from cache import ResultCache, get_build_key
+from policies import ScriptedPolicy
+
+DECISIONS = {"upgrade": ["Feat"], "feat": ["Ritual Caster"]}
+
+
+def get_scripted_policy(seed):
+    return ScriptedPolicy(DECISIONS, get_random_policy(seed))
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.request = make_build_request(
+            {
+                "race": "Elf",
+                "subrace": "Drow",
+                "klass": "Artificer",
+                "subclass": "Alchemist",
+                "level": 20,
+                "seed": 2,
+            }
+        )
+
+    def test_decisions_are_applied(self):
+        character = ResultCache().get_or_build(self.request, decisions=DECISIONS)
+        expected = build_character(self.request, get_scripted_policy).to_dict()
+        self.assertEqual(character, expected)
+        self.assertNotEqual(character, build_character(self.request).to_dict())
+
+    def test_anonymous_policies_are_not_cached(self):
+        with self.assertRaises(ValueError):
+            get_build_key(self.request, lambda seed: get_random_policy(seed))
+
+        cache = ResultCache()
+        cache.get_or_build(self.request, lambda seed: get_random_policy(seed))
+        self.assertEqual(cache.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+
+from characters import RULESET_CACHE_SIZE, get_ruleset
+
+
+def get_overlay(index):
+    return {"alignments": [f"Test Alignment {index}"]}
+
+
+class RulesetCacheTest(unittest.TestCase):
+    def test_least_recently_used_views_are_dropped(self):
+        first = get_ruleset([get_overlay(0)])
+        for index in range(1, RULESET_CACHE_SIZE + 1):
+            latest = get_ruleset([get_overlay(index)])
+
+        self.assertIs(get_ruleset([get_overlay(RULESET_CACHE_SIZE)]), latest)
+        self.assertIsNot(get_ruleset([get_overlay(0)]), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from attributes import ABILITIES
+from balance import get_score_tables
+from recommender import RecommendationMatrix
+
+
+class RecommendationMatrixTest(unittest.TestCase):
+    def test_scores_match_the_score_tables(self):
+        # Races without bonus choices have the same expected scores in both.
+        matrix = RecommendationMatrix()
+        tables = get_score_tables()
+        for ability in ABILITIES:
+            scores = matrix.get_scores({ability: 1})
+            for row, (race, subrace) in enumerate(matrix.races):
+                if matrix.bonus_choices[row][1] != 0:
+                    continue
+                for column, (klass, primaries) in enumerate(matrix.classes):
+                    expected = max(
+                        tables[(klass, p, race, subrace)].expected[
+                            ABILITIES.index(ability)
+                        ]
+                        for p in primaries
+                    )
+                    self.assertAlmostEqual(scores[row][column], expected)
+
+    def test_rankings_are_cached_per_matrix(self):
+        first, second = RecommendationMatrix(), RecommendationMatrix()
+        first.recommend({"Strength": 1})
+        self.assertEqual(first._rank.cache_info().currsize, 1)
+        self.assertEqual(second._rank.cache_info().currsize, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
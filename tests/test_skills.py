@@ -0,0 +1,42 @@
+import unittest
+
+from characters import get_ruleset, use_ruleset
+from thespian import expand_skills
+
+SCORES = {
+    "Strength": 8,
+    "Dexterity": 16,
+    "Constitution": 10,
+    "Intelligence": 10,
+    "Wisdom": 10,
+    "Charisma": 10,
+}
+
+
+class ExpandSkillsTest(unittest.TestCase):
+    def test_skills_follow_the_active_ruleset(self):
+        ruleset = get_ruleset(
+            [
+                {
+                    "skills": {
+                        "Athletics": {"associated_ability": "Dexterity"},
+                        "Parkour": {"associated_ability": "Dexterity"},
+                    }
+                }
+            ]
+        )
+        with use_ruleset(ruleset):
+            skills = expand_skills(["Parkour"], SCORES)
+        self.assertEqual(skills["Athletics"]["ability"], "Dexterity")
+        self.assertEqual(skills["Athletics"]["rank"], 3)
+        self.assertEqual(skills["Parkour"]["rank"], 5)
+        self.assertTrue(skills["Parkour"]["is_class_skill"])
+
+        skills = expand_skills(["Athletics"], SCORES)
+        self.assertEqual(skills["Athletics"]["ability"], "Strength")
+        self.assertEqual(skills["Athletics"]["rank"], 1)
+        self.assertNotIn("Parkour", skills)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+import unittest
+
+from batch import build_character, make_build_request
+from spells import SPELLCASTING
+
+
+class SpellSelectionTest(unittest.TestCase):
+    def test_prepared_spells_follow_the_class_table(self):
+        request = make_build_request({"seed": 5, "klass": "Artificer", "level": 9})
+        character = build_character(request).to_dict()
+        spellbook = character["spellbook"]
+        modifier = character["intelligence"]["modifier"]
+        self.assertEqual(len(spellbook[0]), 2)
+        self.assertEqual(sum(len(spellbook[l]) for l in (1, 2, 3)), modifier + 4)
+        self.assertNotIn(4, spellbook)
+
+    def test_pact_slots_reach_their_spell_level(self):
+        warlock = SPELLCASTING["Warlock"]
+        self.assertEqual(warlock.get_max_spell_level(5, "2"), 3)
+        self.assertEqual(warlock.get_max_spell_level(11, "3"), 5)
+        self.assertEqual(warlock.cantrips[4], 3)
+        self.assertEqual(warlock.get_spells_count(5, "2", dict()), 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
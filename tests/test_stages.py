@@ -0,0 +1,37 @@
+from dataclasses import replace
+import unittest
+
+from batch import build_character, make_build_request
+
+
+class FieldSubsetTest(unittest.TestCase):
+    def test_subsets_are_projections_of_the_full_build(self):
+        # The Skilled feat only offers skills the background did not grant.
+        request = make_build_request({"seed": 92, "level": 13})
+        full = build_character(request).to_dict()
+        for fields in (("feats",), ("feet", "initiative"), ("spellbook",)):
+            subset = build_character(replace(request, fields=fields)).to_dict()
+            self.assertEqual(subset, {f: full[f] for f in fields})
+
+
+class FeaturesFieldTest(unittest.TestCase):
+    def test_features_are_in_level_order(self):
+        options = {"seed": 7, "klass": "Fighter", "subclass": "Battle Master"}
+        request = make_build_request(dict(options, level=7, fields=("features",)))
+        self.assertEqual(
+            build_character(request).to_dict()["features"],
+            [
+                "Fighting Style",
+                "Second Wind",
+                "Action Surge",
+                "Martial Archetype",
+                "Combat Superiority",
+                "Student of War",
+                "Extra Attack",
+                "Know Your Enemy",
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import os
+import tempfile
+import unittest
+
+from store import CharacterStore
+
+
+class ReserveIdsTest(unittest.TestCase):
+    def test_reserved_ids_are_not_reused_by_other_writers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "characters.db")
+            store = CharacterStore(path)
+            other = CharacterStore(path)
+            reserved = store.reserve_ids(2)
+            stored = other.add_many([{"name": "Other"}, {"name": "Other"}])
+            self.assertEqual(set(reserved) & set(stored), set())
+
+            store.add_many([{"name": "Reserved"}] * 2, reserved[0])
+            self.assertEqual(len(store), 4)
+            store.close()
+            other.close()
@@ -0,0 +1,48 @@
+import random
+import unittest
+
+from batch import build_character, make_build_request
+from policies import RandomPolicy, ScriptedPolicy
+from session import BuildSession
+from thespian import thespian
+
+
+class RitualCasterTest(unittest.TestCase):
+    def test_requirements_read_the_primary_abilities(self):
+        # Both abilities are 13 or higher, so the Ritual Caster check runs.
+        # Later upgrades are ability increases, so no other feat is taken.
+        policy = ScriptedPolicy(
+            {"upgrade": ["Feat"] + ["Ability"] * 4, "feat": ["Ritual Caster"]},
+            RandomPolicy(random.Random(2)),
+        )
+        character = thespian(
+            "Nameless One",
+            "Elf",
+            "Drow",
+            "Female",
+            "Guild Artisan",
+            "Lawful Good",
+            "Artificer",
+            "Alchemist",
+            20,
+            session=BuildSession(policy, 2, verbose=False),
+        )
+        self.assertEqual(character.blueprint["primary_ability"][0], "Intelligence")
+        self.assertIn("Ritual Caster", character["feats"])
+
+    def test_seeded_build(self):
+        request = make_build_request(
+            {
+                "race": "Elf",
+                "subrace": "Drow",
+                "klass": "Artificer",
+                "subclass": "Alchemist",
+                "level": 20,
+                "seed": 261700922,
+            }
+        )
+        self.assertEqual(build_character(request)["level"], 20)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+
+from characters import (
+    RulesetWatcher,
+    get_active_ruleset,
+    get_ruleset,
+    sourcebooks,
+)
+
+
+class RulesetWatcherTest(unittest.TestCase):
+    def test_sourcebooks_are_watched(self):
+        watcher = RulesetWatcher(set_default=False)
+        self.assertIn(sourcebooks.__file__, watcher.sources)
+
+    def test_reloads_are_warmed_before_the_swap(self):
+        active = list()
+        watcher = RulesetWatcher(
+            set_default=False,
+            sourcebooks=["PHB"],
+            warmers=(lambda: active.append(get_active_ruleset()),),
+        )
+        self.assertTrue(watcher.reload())
+        self.assertEqual(active, [watcher.ruleset])
+        self.assertIsNotNone(watcher.ruleset._proficiencies)
+        self.assertIsNotNone(watcher.ruleset._strings)
+
+    def test_shards_are_part_of_the_ruleset_key(self):
+        # Untagging a feat keeps it whatever sourcebooks are enabled.
+        phb = sourcebooks.shards["PHB"]
+        shards = {
+            **sourcebooks.shards,
+            "PHB": {**phb, "feats": [f for f in phb["feats"] if f != "Alert"]},
+        }
+        imported = get_ruleset(sourcebooks=["XGtE"])
+        reloaded = get_ruleset(sourcebooks=["XGtE"], shards=shards)
+        self.assertNotIn("Alert", imported.rules["feats"])
+        self.assertIn("Alert", reloaded.rules["feats"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import mmap
+import os
+import shutil
+import struct
+import sys
+from typing import Callable
+
+from batch import build_character, get_random_policy
+from characters import StringTable, get_active_ruleset, use_ruleset
+from codec import decode_character, encode_character
+
+log = logging.getLogger("thespian.archive")
+
+MAGIC = b"THSPARC1"
+# Trailer: string table offset, offset index offset, record count, magic.
+FOOTER = struct.Struct("<QQQ8s")
+OFFSET = struct.Struct("<Q")
+SPAN = struct.Struct("<QQ")
+COPY_CHUNK_SIZE = 1 << 24
+
+
+class CharacterArchive:
+    """Class to read the characters of an archive through a memory map.
+
+    An archive is a run of binary character records followed by the string
+    table they were encoded against, an index of every record's offset and a
+    fixed size footer. Opening one reads only the footer and string table; a
+    record is found with one lookup in the index, so reading any character
+    takes the same time whatever the archive's size.
+
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"'{path}' is not a character archive.")
+
+        size = len(self._map)
+        magic = None
+        if size >= len(MAGIC) + FOOTER.size and self._map[: len(MAGIC)] == MAGIC:
+            table_offset, index_offset, count, magic = FOOTER.unpack_from(
+                self._map, size - FOOTER.size
+            )
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"'{path}' is not a (closed) character archive.")
+
+        self.table = StringTable(json.loads(self._map[table_offset:index_offset]))
+        self.records_end = table_offset
+        self._count = count
+        self._index_offset = index_offset
+
+    def __enter__(self) -> "CharacterArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getitem__(self, position: int) -> dict:
+        return decode_character(self.get_record(position), self.table)
+
+    def __iter__(self):
+        for position in range(self._count):
+            yield self[position]
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Unmaps and closes the archive file."""
+        self._map.close()
+        self._file.close()
+
+    def get_offsets(self) -> array:
+        """Returns the offset of every record, then the end of the records."""
+        start = self._index_offset
+        end = start + (self._count + 1) * OFFSET.size
+        return _get_offsets(self._map[start:end])
+
+    def get_record(self, position: int) -> bytes:
+        """Returns the binary record of the character at a position."""
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(f"Archive position {position} is out of range.")
+
+        start, end = SPAN.unpack_from(
+            self._map, self._index_offset + position * OFFSET.size
+        )
+        return self._map[start:end]
+
+
+class ArchiveWriter:
+    """Class to append characters to an archive.
+
+    Records are written as they are added; the string table, offset index and
+    footer are written when the writer is closed. The archive is written under
+    a temporary name and renamed over path when closed, so path always holds
+    the last closed archive, even if the writer never closes (i.e a crash).
+    Opening an existing archive copies its records and appends after them.
+
+    """
+
+    def __init__(self, path: str, table: StringTable | None = None):
+        self.path = path
+        self._temporary_path = f"{path}.{os.getpid()}.tmp"
+        if os.path.exists(path) and os.path.getsize(path) != 0:
+            with CharacterArchive(path) as archive:
+                if table is not None and table.version != archive.table.version:
+                    raise ValueError(
+                        f"Archive '{path}' uses another string table version."
+                    )
+                self.table = archive.table
+                self.offsets = archive.get_offsets()[:-1]
+                end = archive.records_end
+            shutil.copyfile(path, self._temporary_path)
+            self._file = open(self._temporary_path, "r+b")
+            self._file.truncate(end)
+            self._file.seek(end)
+        else:
+            self.table = get_active_ruleset().strings if table is None else table
+            self.offsets = array("Q")
+            self._file = open(self._temporary_path, "wb")
+            self._file.write(MAGIC)
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def add(self, character: dict) -> int:
+        """Appends a character, returning its position in the archive."""
+        record = encode_character(character, self.table)
+        self.offsets.append(self._file.tell())
+        self._file.write(record)
+        return len(self.offsets) - 1
+
+    def close(self) -> None:
+        """Writes the archive's trailer, closes it and moves it to path."""
+        if self._file.closed:
+            return
+
+        table_offset = self._file.tell()
+        self._file.write(
+            json.dumps(self.table.strings, separators=(",", ":")).encode("utf-8")
+        )
+        index_offset = self._file.tell()
+        offsets = array("Q", self.offsets)
+        offsets.append(table_offset)
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        self._file.write(offsets.tobytes())
+        self._file.write(
+            FOOTER.pack(table_offset, index_offset, len(self.offsets), MAGIC)
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._temporary_path, self.path)
+
+    def extend(self, archive: CharacterArchive) -> None:
+        """Appends every record of another archive, copied as they are."""
+        if archive.table.version != self.table.version:
+            raise ValueError(
+                f"Archive '{archive.path}' uses another string table version."
+            )
+
+        shift = self._file.tell() - len(MAGIC)
+        for start in range(len(MAGIC), archive.records_end, COPY_CHUNK_SIZE):
+            end = min(start + COPY_CHUNK_SIZE, archive.records_end)
+            self._file.write(archive._map[start:end])
+        self.offsets.extend(o + shift for o in archive.get_offsets()[:-1])
+
+
+def build_archive(
+    requests: list,
+    path: str,
+    policy_factory: Callable = get_random_policy,
+    workers: int | None = None,
+) -> int:
+    """Builds characters onto the end of an archive, returning its size.
+
+    Requests are split into one run per worker. Each worker builds its run
+    into its own shard (i.e 'path.0'), and the shards are then merged in
+    request order. Failed builds are logged and left out.
+
+    """
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(requests)))
+    run_size = max(1, -(-len(requests) // workers))
+    runs = [requests[i : i + run_size] for i in range(0, len(requests), run_size)]
+    shards = [f"{path}.{i}" for i in range(len(runs))]
+    ruleset = get_active_ruleset()
+
+    def build(shard: str, run: list) -> None:
+        if os.path.exists(shard):
+            os.remove(shard)
+        with use_ruleset(ruleset), ArchiveWriter(shard, ruleset.strings) as writer:
+            for request in run:
+                try:
+                    writer.add(build_character(request, policy_factory))
+                except Exception as e:
+                    log.warning(f"Could not build '{request.name}': {e}")
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for result in [executor.submit(build, s, r) for s, r in zip(shards, runs)]:
+                result.result()
+        return merge_archives(shards, path, ruleset.strings)
+    finally:
+        for shard in shards:
+            if os.path.exists(shard):
+                os.remove(shard)
+
+
+def merge_archives(paths: list, path: str, table: StringTable | None = None) -> int:
+    """Appends archives (i.e worker shards) to an archive, in order.
+
+    Records are copied without being decoded, so every archive must use the
+    same string table; the merged archive's index is rewritten. Returns the
+    number of records in the merged archive.
+
+    """
+    if path in paths:
+        raise ValueError(f"Cannot merge archive '{path}' into itself.")
+
+    archives = list()
+    try:
+        for shard in paths:
+            archives.append(CharacterArchive(shard))
+        if table is None:
+            table = archives[0].table if len(archives) != 0 else None
+
+        with ArchiveWriter(path, table) as writer:
+            for archive in archives:
+                writer.extend(archive)
+            return len(writer)
+    finally:
+        for archive in archives:
+            archive.close()
+
+
+def _get_offsets(data: bytes) -> array:
+    """Returns little endian 64 bit offsets as an array."""
+    offsets = array("Q", data)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    return offsets
@@ -1,21 +1,70 @@
-from collections import OrderedDict
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from itertools import combinations_with_replacement, product
 import logging
-from math import floor
-from random import choice, randint
+from math import factorial, floor, prod
+import random
 import re
 
 log = logging.getLogger("thespian.attributes")
 
+ABILITIES = (
+    "Strength",
+    "Dexterity",
+    "Constitution",
+    "Intelligence",
+    "Wisdom",
+    "Charisma",
+)
+
+# Ability modifiers for every score a character can reach (0-30).
+MODIFIER_TABLE = tuple(floor((score - 10) / 2) for score in range(0, 31))
+
+# Rolled score sets are rerolled until they meet all three minimums.
+MINIMUM_ROLL_TOTAL = 65
+MINIMUM_ROLL_LOWEST = 8
+MINIMUM_ROLL_HIGHEST = 15
+
+
+# Ability score generation methods. Rolled scores are 4d6 drop lowest; 3d6
+# scores are rolled straight, in ability order.
+SCORE_METHODS = ("roll", "point_buy", "standard_array", "3d6")
+
+POINT_BUY_BUDGET = 27
+POINT_BUY_COSTS = {8: 0, 9: 1, 10: 2, 11: 3, 12: 4, 13: 5, 14: 7, 15: 9}
+STANDARD_ARRAY = (15, 14, 13, 12, 10, 8)
+
 
 class AttributeGenerator:
-    """Class to handle the generation of character's attributes."""
+    """Class to handle the generation of character's attributes.
+
+    Score sets come from one of SCORE_METHODS. Except for straight 3d6 rolls,
+    the highest scores go to the primary attributes and the rest are assigned
+    at random. Point buy arrays are drawn uniformly from every legal array.
+
+    """
+
+    def __init__(
+        self,
+        primary_attributes: tuple | list,
+        racial_bonus: dict,
+        rng: random.Random | None = None,
+        method: str = "roll",
+    ):
+        if method not in SCORE_METHODS:
+            raise ValueError(f"Unknown ability score method '{method}'.")
 
-    def __init__(self, primary_attributes: tuple | list, racial_bonus: dict):
         self.primary_attributes = primary_attributes
         self.racial_bonus = racial_bonus
+        self.rng = random if rng is None else rng
+        self.method = method
 
     def generate(self) -> OrderedDict:
         """Generates/assigns character attributes."""
+        return self._assign_attributes(self._get_score_set())
+
+    def _assign_attributes(self, result_set: list) -> OrderedDict:
+        """Assigns a set of six scores to the abilities."""
         attribute_set = OrderedDict()
         attribute_set["Strength"] = None
         attribute_set["Dexterity"] = None
@@ -24,21 +73,23 @@ class AttributeGenerator:
         attribute_set["Wisdom"] = None
         attribute_set["Charisma"] = None
 
-        attribute_options = list(attribute_set.keys())
-        result_set = self._roll_attribute_set()
+        if self.method == "3d6":
+            for attribute, attribute_value in zip(ABILITIES, result_set):
+                attribute_set[attribute] = attribute_value
+        else:
+            attribute_options = list(attribute_set.keys())
+            for _, attribute in enumerate(self.primary_attributes):
+                attribute_options.remove(attribute)
+                attribute_value = max(result_set)
+                result_set.remove(attribute_value)
+                attribute_set[attribute] = attribute_value
 
-        for _, attribute in enumerate(self.primary_attributes):
-            attribute_options.remove(attribute)
-            attribute_value = max(result_set)
-            result_set.remove(attribute_value)
-            attribute_set[attribute] = attribute_value
-
-        for _ in range(0, 4):
-            attribute = choice(attribute_options)
-            attribute_options.remove(attribute)
-            attribute_value = choice(result_set)
-            result_set.remove(attribute_value)
-            attribute_set[attribute] = attribute_value
+            for _ in range(0, 4):
+                attribute = self.rng.choice(attribute_options)
+                attribute_options.remove(attribute)
+                attribute_value = self.rng.choice(result_set)
+                result_set.remove(attribute_value)
+                attribute_set[attribute] = attribute_value
 
         for attribute, bonus in self.racial_bonus.items():
             attribute_value = attribute_set[attribute] + bonus
@@ -46,23 +97,42 @@ class AttributeGenerator:
 
         return attribute_set
 
+    def _get_score_set(self) -> list:
+        """Generates a set of six ability scores."""
+        if self.method == "roll":
+            return self._roll_attribute_set()
+        elif self.method == "point_buy":
+            return list(self.rng.choice(get_point_buy_arrays()))
+        elif self.method == "standard_array":
+            return list(STANDARD_ARRAY)
+
+        return [sum(roll_die("3d6", self.rng)) for _ in ABILITIES]
+
     def _roll_attribute_set(self) -> list:
         """Generates six ability scores."""
 
         def generate_score():
-            rolls = roll_die("4d6")
+            rolls = roll_die("4d6", self.rng)
             rolls.remove(min(rolls))
             return sum(rolls)
 
         results = list()
-        while sum(results) < 65 or min(results) < 8 or max(results) < 15:
+        while (
+            sum(results) < MINIMUM_ROLL_TOTAL
+            or min(results) < MINIMUM_ROLL_LOWEST
+            or max(results) < MINIMUM_ROLL_HIGHEST
+        ):
             results = [generate_score() for _ in range(6)]
 
         return results
 
 
 def generate_hit_points(
-    level: int, hit_die: str, attributes: OrderedDict, roll_hp: bool
+    level: int,
+    hit_die: str,
+    attributes: OrderedDict,
+    roll_hp: bool,
+    rng: random.Random | None = None,
 ) -> tuple:
     """Generates the character's hit points."""
     if roll_hp:
@@ -75,32 +145,117 @@ def generate_hit_points(
     total_hit_points = hit_die + modifier
 
     if level > 1:
-        die_rolls = list()
-        for _ in range(1, level):
-            if not roll_hp:
-                hp_result = int((hit_die / 2) + 1)
-            else:
-                hp_result = randint(1, hit_die)
-            hp_result = hp_result + modifier
-
-            if hp_result < 1:
-                hp_result = 1
-            die_rolls.append(hp_result)
+        die_rolls = get_hit_point_increments(
+            level - 1, hit_die, modifier, roll_hp, rng
+        )
         total_hit_points += sum(die_rolls)
 
     return f"{level}d{hit_die}", total_hit_points
 
 
+def get_expected_rolls() -> tuple:
+    """Returns the expected rolled scores, highest first."""
+    return _compile_expected_rolls()
+
+
+def get_expected_scores(primary_attributes: tuple | list, racial_bonus: dict) -> dict:
+    """Returns the exact expected scores of AttributeGenerator.generate.
+
+    Primary attributes get the expected highest rolls, in order, and the
+    other abilities share the expectation of the remaining rolls.
+
+    """
+    expected_rolls = get_expected_rolls()
+    primary_count = len(primary_attributes)
+    remaining = expected_rolls[primary_count:]
+    other_score = sum(remaining) / len(remaining)
+
+    scores = dict()
+    for ability in ABILITIES:
+        if ability in primary_attributes:
+            score = expected_rolls[primary_attributes.index(ability)]
+        else:
+            score = other_score
+        scores[ability] = score + racial_bonus.get(ability, 0)
+    return scores
+
+
+def get_hit_point_increments(
+    levels: int,
+    hit_die: int,
+    modifier: int,
+    roll_hp: bool,
+    rng: random.Random | None = None,
+) -> list:
+    """Returns the hit points gained for each level after the first."""
+    if rng is None:
+        rng = random
+
+    die_rolls = list()
+    for _ in range(levels):
+        if not roll_hp:
+            hp_result = int((hit_die / 2) + 1)
+        else:
+            hp_result = rng.randint(1, hit_die)
+        hp_result = hp_result + modifier
+
+        if hp_result < 1:
+            hp_result = 1
+        die_rolls.append(hp_result)
+
+    return die_rolls
+
+
 def get_ability_modifier(ability: str, scores: dict) -> int:
     """Returns modifier for ability in scores."""
     try:
-        return floor((int(scores[ability]) - 10) / 2)
+        return get_score_modifier(int(scores[ability]))
     except KeyError:
         return 0
 
 
-def roll_die(format: str) -> list:
+def get_point_buy_arrays() -> tuple:
+    """Returns every legal point buy array (highest score first)."""
+    return _compile_point_buy_arrays()
+
+
+def get_roll_distribution() -> tuple:
+    """Returns the exact distribution of accepted rolled score sets.
+
+    Each item is a pair of six scores (highest first) and the probability of
+    rolling them in any order, given the set is not rerolled.
+
+    """
+    return _compile_roll_distribution()
+
+
+def get_score_distributions(
+    primary_attributes: tuple | list, method: str = "roll"
+) -> tuple:
+    """Returns the exact distribution of each ability's generated score.
+
+    The distributions are {score: probability} mappings in ABILITIES order,
+    before racial bonuses. Point buy arrays are taken as equally likely.
+
+    """
+    if method not in SCORE_METHODS:
+        raise ValueError(f"Unknown ability score method '{method}'.")
+    return _compile_score_distributions(tuple(primary_attributes), method)
+
+
+def get_score_modifier(score: int) -> int:
+    """Returns the modifier for an ability score."""
+    try:
+        return MODIFIER_TABLE[score]
+    except IndexError:
+        return floor((score - 10) / 2)
+
+
+def roll_die(format: str, rng: random.Random | None = None) -> list:
     """Rolls a die (i.e 4d6)."""
+    if rng is None:
+        rng = random
+
     if not isinstance(format, str):
         raise TypeError(f"Argument must be of type 'str'.")
 
@@ -117,4 +272,81 @@ def roll_die(format: str) -> list:
     if die_type not in (1, 4, 6, 8, 10, 12, 20, 100):
         raise ValueError("Die type invalid.")
 
-    return [randint(1, die_type) for r in range(num_of_rolls)]
+    return [rng.randint(1, die_type) for r in range(num_of_rolls)]
+
+
+@lru_cache(maxsize=None)
+def _compile_expected_rolls() -> tuple:
+    distribution = get_roll_distribution()
+    return tuple(sum(s[rank] * p for s, p in distribution) for rank in range(6))
+
+
+@lru_cache(maxsize=None)
+def _compile_point_buy_arrays() -> tuple:
+    scores = sorted(POINT_BUY_COSTS, reverse=True)
+    return tuple(
+        array
+        for array in combinations_with_replacement(scores, 6)
+        if sum(POINT_BUY_COSTS[s] for s in array) == POINT_BUY_BUDGET
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_roll_distribution() -> tuple:
+    # Distribution of one 4d6 drop lowest score.
+    score_counts = Counter(sum(r) - min(r) for r in product(range(1, 7), repeat=4))
+    score_probabilities = {k: v / 6**4 for k, v in sorted(score_counts.items())}
+
+    # Every sorted set of six scores, weighted by the orders it can be rolled in.
+    distribution = list()
+    for scores in combinations_with_replacement(score_probabilities, 6):
+        if (
+            sum(scores) < MINIMUM_ROLL_TOTAL
+            or scores[0] < MINIMUM_ROLL_LOWEST
+            or scores[-1] < MINIMUM_ROLL_HIGHEST
+        ):
+            continue
+        orders = factorial(6) // prod(factorial(c) for c in Counter(scores).values())
+        probability = orders * prod(score_probabilities[s] for s in scores)
+        distribution.append((scores[::-1], probability))
+
+    accepted = sum(p for _, p in distribution)
+    return tuple((scores, p / accepted) for scores, p in distribution)
+
+
+@lru_cache(maxsize=None)
+def _compile_score_distributions(primary_attributes: tuple, method: str) -> tuple:
+    if method == "3d6":
+        score_counts = Counter(sum(r) for r in product(range(1, 7), repeat=3))
+        return tuple(
+            {k: v / 6**3 for k, v in sorted(score_counts.items())} for _ in ABILITIES
+        )
+
+    if method == "roll":
+        distribution = get_roll_distribution()
+    elif method == "point_buy":
+        arrays = get_point_buy_arrays()
+        distribution = tuple((a, 1 / len(arrays)) for a in arrays)
+    else:
+        distribution = ((STANDARD_ARRAY, 1.0),)
+
+    # Primary attributes get the highest scores, in order. Every other ability
+    # is equally likely to get any of the remaining scores.
+    primary_count = len(primary_attributes)
+    other_count = len(ABILITIES) - primary_count
+    primary_scores = [Counter() for _ in primary_attributes]
+    other_scores = Counter()
+    for scores, probability in distribution:
+        for rank in range(primary_count):
+            primary_scores[rank][scores[rank]] += probability
+        for score in scores[primary_count:]:
+            other_scores[score] += probability / other_count
+
+    distributions = list()
+    for ability in ABILITIES:
+        if ability in primary_attributes:
+            scores = primary_scores[primary_attributes.index(ability)]
+        else:
+            scores = other_scores
+        distributions.append(dict(sorted(scores.items())))
+    return tuple(distributions)
@@ -0,0 +1,110 @@
+from collections import Counter
+from dataclasses import dataclass
+from itertools import product
+import logging
+
+from attributes import ABILITIES, SCORE_METHODS, get_score_distributions
+from characters import ArtifactCache, RulesetReader
+from recommender import get_primary_ability_options, get_race_bonus_options
+
+log = logging.getLogger("thespian.balance")
+
+
+@dataclass(frozen=True)
+class ScoreTable:
+    """Class to hold the exact ability score odds of one kind of character.
+
+    Both tuples are in ABILITIES order: the expected final score of each
+    ability, and its {score: probability} distribution. Racial bonus choices
+    are taken as made at random, as the random policy does.
+
+    """
+
+    klass: str
+    primary_abilities: tuple
+    race: str
+    subrace: str
+    expected: tuple
+    distributions: tuple
+
+
+def get_score_table(
+    klass: str,
+    primary_abilities: tuple | list,
+    race: str,
+    subrace: str = "",
+    method: str = "roll",
+) -> ScoreTable:
+    """Returns the score table of a class, primary ability choice and race."""
+    key = (klass, tuple(primary_abilities), race, subrace)
+    try:
+        return get_score_tables(method)[key]
+    except KeyError:
+        raise ValueError(f"No score table for {key}.")
+
+
+def get_score_tables(method: str = "roll") -> dict:
+    """Returns every score table, by (class, primary abilities, race, subrace).
+
+    Tables are built once per ruleset version and score method, and kept in
+    the artifact cache.
+
+    """
+    if method not in SCORE_METHODS:
+        raise ValueError(f"Unknown ability score method '{method}'.")
+    return ArtifactCache().load(
+        f"score_tables_{method}", lambda: _build_score_tables(method)
+    )
+
+
+def _build_score_tables(method: str) -> dict:
+    races = list()
+    for race in RulesetReader.get_all_races():
+        for subrace in RulesetReader.get_all_subraces(race) or ("",):
+            bonuses = _get_bonus_odds(get_race_bonus_options(race, subrace))
+            races.append((race, subrace, bonuses))
+
+    tables = dict()
+    for klass in RulesetReader.get_all_classes():
+        class_base = RulesetReader.get_entry_class(klass)
+        for primaries in get_primary_ability_options(class_base):
+            base = get_score_distributions(primaries, method)
+            for race, subrace, bonuses in races:
+                distributions = tuple(
+                    _shift(distribution, bonuses[index])
+                    for index, distribution in enumerate(base)
+                )
+                tables[(klass, primaries, race, subrace)] = ScoreTable(
+                    klass,
+                    primaries,
+                    race,
+                    subrace,
+                    tuple(sum(s * p for s, p in d.items()) for d in distributions),
+                    distributions,
+                )
+
+    log.info(f"Built {len(tables)} {method} score tables.")
+    return tables
+
+
+def _get_bonus_odds(bonus_options: tuple) -> tuple:
+    """Returns the {bonus: probability} odds of each ability's racial bonus.
+
+    Bonus choices are made at random, with repeats adding nothing new.
+
+    """
+    fixed, choices, count = bonus_options
+    odds = [Counter() for _ in ABILITIES]
+    outcomes = list(product(choices, repeat=count)) if count != 0 else [()]
+    for outcome in outcomes:
+        for index, bonus in enumerate(fixed):
+            odds[index][bonus + (1 if index in outcome else 0)] += 1 / len(outcomes)
+    return tuple(dict(o) for o in odds)
+
+
+def _shift(distribution: dict, bonus_odds: dict) -> dict:
+    """Returns a score distribution with a random bonus added."""
+    shifted = Counter()
+    for (score, p), (bonus, q) in product(distribution.items(), bonus_odds.items()):
+        shifted[score + bonus] += p * q
+    return dict(sorted(shifted.items()))
@@ -0,0 +1,213 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import logging
+import random
+from typing import Callable
+
+from attributes import SCORE_METHODS
+from characters import RulesetReader, get_active_ruleset, use_ruleset
+from policies import RandomPolicy
+from session import BuildSession
+from sheets import CharacterSheet
+from store import CharacterStore
+from thespian import thespian
+
+log = logging.getLogger("thespian.batch")
+
+STORE_BATCH_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class BuildRequest:
+    """Class to describe one character to generate."""
+
+    name: str
+    race: str
+    subrace: str
+    sex: str
+    background: str
+    alignment: str
+    klass: str
+    subclass: str
+    level: int
+    roll_hp: bool = False
+    use_dominant_sex: bool = False
+    seed: int | None = None
+    fields: tuple | None = None
+    score_method: str = "roll"
+
+
+def make_build_request(options: dict) -> BuildRequest:
+    """Validates build options, filling in any that are missing at random.
+
+    Missing options are drawn from a generator seeded with the 'seed' option,
+    so the same options always describe the same request.
+
+    """
+    seed = options.get("seed")
+    if seed is not None and not isinstance(seed, int):
+        raise ValueError("Option 'seed' must be an integer.")
+    rng = random.Random(seed)
+
+    race = options.get("race") or rng.choice(RulesetReader.get_all_races())
+    if race not in RulesetReader.get_all_races():
+        raise ValueError(f"Unknown player race '{race}'.")
+
+    subraces = RulesetReader.get_all_subraces(race)
+    subrace = options.get("subrace")
+    if subrace is None:
+        subrace = rng.choice(subraces) if len(subraces) != 0 else ""
+    if len(subraces) != 0 and subrace not in subraces:
+        raise ValueError(f"Invalid {race} subrace '{subrace}'.")
+
+    klass = options.get("klass") or rng.choice(RulesetReader.get_all_classes())
+    if klass not in RulesetReader.get_all_classes():
+        raise ValueError(f"Unknown player class '{klass}'.")
+
+    level = options.get("level", 1)
+    if level not in range(1, 21):
+        raise ValueError("Option 'level' must be between 1 - 20.")
+
+    subclass = options.get("subclass")
+    if level < 3:
+        subclass = ""
+    else:
+        subclasses = RulesetReader.get_all_subclasses(klass)
+        if subclass is None:
+            subclass = rng.choice(subclasses)
+        if subclass not in subclasses:
+            raise ValueError(f"Invalid {klass} subclass '{subclass}'.")
+
+    background = options.get("background")
+    if background not in RulesetReader.get_all_backgrounds():
+        background = RulesetReader.get_default_background(klass)
+
+    alignment = options.get("alignment") or rng.choice(
+        RulesetReader.get_all_alignments()
+    )
+    if alignment not in RulesetReader.get_all_alignments():
+        raise ValueError(f"Invalid alignment specified '{alignment}'.")
+
+    sex = options.get("sex") or rng.choice(("Female", "Male"))
+    if sex not in ("Female", "Male"):
+        raise ValueError("Option 'sex' must be either Female or Male.")
+
+    score_method = options.get("score_method", "roll")
+    if score_method not in SCORE_METHODS:
+        raise ValueError(f"Option 'score_method' must be one of {SCORE_METHODS}.")
+
+    fields = options.get("fields")
+    return BuildRequest(
+        name=options.get("name") or "Nameless One",
+        race=race,
+        subrace=subrace,
+        sex=sex,
+        background=background,
+        alignment=alignment,
+        klass=klass,
+        subclass=subclass,
+        level=level,
+        roll_hp=bool(options.get("roll_hp", False)),
+        use_dominant_sex=bool(options.get("use_dominant_sex", False)),
+        seed=seed,
+        fields=None if fields is None else tuple(fields),
+        score_method=score_method,
+    )
+
+
+def get_random_policy(seed: int | None) -> Callable:
+    """Returns a random choice policy seeded with seed."""
+    return RandomPolicy(random.Random(seed))
+
+
+def build_character(
+    request: BuildRequest, policy_factory: Callable = get_random_policy
+) -> CharacterSheet:
+    """Builds one character headlessly in its own session."""
+    session = BuildSession(policy_factory(request.seed), request.seed, verbose=False)
+    return thespian(
+        request.name,
+        request.race,
+        request.subrace,
+        request.sex,
+        request.background,
+        request.alignment,
+        request.klass,
+        request.subclass,
+        request.level,
+        request.roll_hp,
+        request.use_dominant_sex,
+        fields=request.fields,
+        session=session,
+        score_method=request.score_method,
+    )
+
+
+def generate_characters(
+    requests: list,
+    policy_factory: Callable = get_random_policy,
+    workers: int | None = None,
+    return_exceptions: bool = False,
+    store: CharacterStore | None = None,
+) -> list:
+    """Builds characters on a thread pool, returning them in request order.
+
+    policy_factory is called with each request's seed and returns the policy
+    that makes that build's choices. If workers is 1, characters are built in
+    the calling thread. If return_exceptions is set, a failed build's exception
+    takes its place in the results instead of being raised. If a store is given,
+    built characters are written to it in batches as they complete.
+
+    """
+    if workers == 1:
+        outcomes = [_try_build(r, policy_factory) for r in requests]
+        return _collect(requests, outcomes, return_exceptions, store)
+
+    # Worker threads do not inherit the caller's context, so they are handed
+    # its active ruleset explicitly.
+    ruleset = get_active_ruleset()
+
+    def build(request: BuildRequest) -> CharacterSheet | Exception:
+        with use_ruleset(ruleset):
+            return _try_build(request, policy_factory)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(build, requests)
+        return _collect(requests, outcomes, return_exceptions, store)
+
+
+def _collect(
+    requests: list,
+    outcomes,
+    return_exceptions: bool,
+    store: CharacterStore | None,
+) -> list:
+    """Checks build outcomes in order, storing built characters in batches."""
+    results = list()
+    pending = list()
+    for request, outcome in zip(requests, outcomes):
+        if isinstance(outcome, Exception):
+            if not return_exceptions:
+                raise outcome
+            log.warning(f"Could not build '{request.name}': {outcome}")
+        elif store is not None:
+            pending.append(outcome.to_dict())
+            if len(pending) == STORE_BATCH_SIZE:
+                store.add_many(pending)
+                pending = list()
+        results.append(outcome)
+
+    if store is not None and len(pending) != 0:
+        store.add_many(pending)
+
+    return results
+
+
+def _try_build(
+    request: BuildRequest, policy_factory: Callable
+) -> CharacterSheet | Exception:
+    """Builds a character, returning the exception if the build fails."""
+    try:
+        return build_character(request, policy_factory)
+    except Exception as e:
+        return e
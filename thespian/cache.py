@@ -0,0 +1,214 @@
+from collections import OrderedDict
+from dataclasses import asdict
+from functools import partial
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Callable
+
+from batch import BuildRequest, build_character, get_random_policy
+from characters import RulesetReader
+from policies import ScriptedPolicy
+from store import decode_payload, encode_payload
+
+log = logging.getLogger("thespian.cache")
+
+
+class ResultCache:
+    """Class to memoize generated characters by their build inputs.
+
+    Characters are kept as encoded payloads in an in-memory LRU tier, so
+    callers always get their own copy. If a directory is given, they are also
+    written to an on-disk tier, which drops its least recently used entries
+    once it grows past max_bytes.
+
+    """
+
+    def __init__(
+        self,
+        capacity: int = 1024,
+        directory: str | None = None,
+        max_bytes: int = 64 * 1024 * 1024,
+    ):
+        self.capacity = capacity
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def get(self, key: str) -> dict | None:
+        """Returns a cached character, or None if key is not cached."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+            elif key in self._disk:
+                payload = self._read(key)
+                if payload is not None:
+                    self._remember(key, payload)
+
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return decode_payload(payload)
+
+    def get_or_build(
+        self,
+        request: BuildRequest,
+        policy_factory: Callable = get_random_policy,
+        decisions: dict | None = None,
+    ) -> dict:
+        """Returns a generated character, building it only on a cache miss.
+
+        If decisions (answers by prompt category) are given, a ScriptedPolicy
+        makes them before policy_factory's policy decides. Only seeded builds
+        by a named policy factory are known to repeat, so others always build.
+
+        """
+        build_factory = policy_factory
+        if decisions is not None:
+            build_factory = partial(_get_scripted_policy, decisions, policy_factory)
+        if request.seed is None or get_policy_id(policy_factory) is None:
+            return build_character(request, build_factory).to_dict()
+
+        key = get_build_key(request, policy_factory, decisions)
+        character = self.get(key)
+        if character is None:
+            character = build_character(request, build_factory).to_dict()
+            self.put(key, character)
+        return character
+
+    def put(self, key: str, character: dict) -> None:
+        """Caches a character under key."""
+        payload = encode_payload(character)
+        with self._lock:
+            self._remember(key, payload)
+            if self.directory is not None and key not in self._disk:
+                self._write(key, payload)
+
+    def _evict(self) -> None:
+        """Deletes least recently used disk entries until under max_bytes."""
+        while self._disk_bytes > self.max_bytes and len(self._disk) != 0:
+            key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            try:
+                os.remove(self._get_path(key))
+            except FileNotFoundError:
+                pass
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key)
+
+    def _read(self, key: str) -> bytes | None:
+        try:
+            with open(self._get_path(key), "rb") as entry:
+                payload = entry.read()
+        except FileNotFoundError:
+            self._disk_bytes -= self._disk.pop(key)
+            return None
+
+        self._disk.move_to_end(key)
+        return payload
+
+    def _remember(self, key: str, payload: bytes) -> None:
+        self._memory[key] = payload
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def _scan(self) -> None:
+        """Indexes the disk tier, oldest entries first."""
+        entries = list()
+        for prefix in os.listdir(self.directory):
+            prefix_path = os.path.join(self.directory, prefix)
+            if not os.path.isdir(prefix_path):
+                continue
+            for key in os.listdir(prefix_path):
+                if key.endswith(".tmp"):
+                    continue
+                stat = os.stat(os.path.join(prefix_path, key))
+                entries.append((stat.st_mtime, key, stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict()
+
+    def _write(self, key: str, payload: bytes) -> None:
+        path = self._get_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Written under a temporary name, so readers never see partial entries.
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as entry:
+            entry.write(payload)
+        os.replace(temporary_path, path)
+
+        self._disk[key] = len(payload)
+        self._disk_bytes += len(payload)
+        self._evict()
+
+
+def get_build_key(
+    request: BuildRequest,
+    policy_factory: Callable = get_random_policy,
+    decisions: dict | None = None,
+) -> str:
+    """Returns the cache key of a build.
+
+    The key covers the build request (including its seed), the policy that
+    makes its choices, any scripted decisions and the ruleset contents.
+
+    """
+    policy_id = get_policy_id(policy_factory)
+    if policy_id is None:
+        raise ValueError(
+            f"Policy factory {policy_factory!r} has no stable id to cache by."
+        )
+
+    build = {
+        "request": asdict(request),
+        "policy": policy_id,
+        "decisions": decisions,
+        "ruleset": RulesetReader.version(),
+    }
+    return hashlib.blake2b(
+        json.dumps(build, sort_keys=True, default=str).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+
+def get_policy_id(policy_factory: Callable) -> str | None:
+    """Returns the stable id of a policy factory, if it has one.
+
+    A factory's policy_id attribute names it; otherwise its module and
+    qualified name do. Lambdas, nested functions and callable objects are
+    anonymous, since two of them can share a name but choose differently.
+
+    """
+    policy_id = getattr(policy_factory, "policy_id", None)
+    if policy_id is not None:
+        return policy_id
+
+    name = getattr(policy_factory, "__qualname__", None)
+    if name is None or "<" in name:
+        return None
+    return f"{policy_factory.__module__}.{name}"
+
+
+def _get_scripted_policy(
+    decisions: dict, policy_factory: Callable, seed: int | None
+) -> Callable:
+    """Returns a policy making scripted decisions before policy_factory's."""
+    return ScriptedPolicy(decisions, policy_factory(seed))
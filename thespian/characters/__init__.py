@@ -1,2 +1,28 @@
+from ._artifacts import ArtifactCache, get_cache_root
+from ._features import FEATURE_CATEGORIES, FeatureIndex, FeatureSource
 from ._loader import RulesetLoader
+from ._overlays import (
+    BASE_RULESET,
+    FEATURES,
+    PROFICIENCIES,
+    RULESET_CACHE_SIZE,
+    SKILLS,
+    SPELLS,
+    STRINGS,
+    Ruleset,
+    get_active_ruleset,
+    get_ruleset,
+    load_overlay,
+    merge_rules,
+    set_default_ruleset,
+    use_ruleset,
+)
+from ._proficiencies import PROFICIENCY_CATEGORIES, ProficiencyIndex
+from ._queries import CategoryIndex, Predicate, at_least, at_most, has, match
 from ._reader import RulesetReader
+from ._skills import SkillTable
+from ._sourcebooks import filter_rules, get_sourcebook
+from ._spells import SpellIndex, SpellSource, normalize_spell_name
+from ._strings import StringTable
+from ._watcher import RulesetWatcher
+from .sourcebooks import SOURCEBOOKS
@@ -0,0 +1,71 @@
+import logging
+import os
+import pickle
+import shutil
+from typing import Callable
+
+from ._overlays import get_active_ruleset
+
+log = logging.getLogger("thespian.characters")
+
+
+def get_cache_root() -> str:
+    """Returns the directory derived ruleset artifacts are kept under."""
+    root = os.environ.get("THESPIAN_CACHE_DIR")
+    if root:
+        return root
+
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_home, "thespian")
+
+
+class ArtifactCache:
+    """Class to persist artifacts derived from the ruleset.
+
+    Artifacts are stored under a directory named after the version of the
+    active ruleset, so they are rebuilt exactly when the rules change. If the
+    cache directory cannot be used, artifacts are built in memory instead.
+
+    """
+
+    def __init__(self, root: str | None = None, version: str | None = None):
+        self.root = get_cache_root() if root is None else root
+        self.version = get_active_ruleset().version if version is None else version
+        self.directory = os.path.join(self.root, self.version)
+
+    def load(self, name: str, build: Callable) -> object:
+        """Returns a stored artifact, building and storing it if needed."""
+        path = os.path.join(self.directory, f"{name}.pickle")
+        try:
+            with open(path, "rb") as artifact:
+                return pickle.load(artifact)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.warning(f"Rebuilding unreadable artifact '{path}': {e}")
+
+        value = build()
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary_path = f"{path}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as artifact:
+                pickle.dump(value, artifact, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except OSError as e:
+            log.warning(f"Could not store artifact '{path}': {e}")
+
+        return value
+
+    def prune(self) -> None:
+        """Deletes the artifacts of every other ruleset version."""
+        try:
+            entries = os.listdir(self.root)
+        except FileNotFoundError:
+            return
+
+        for entry in entries:
+            path = os.path.join(self.root, entry)
+            if entry != self.version and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+
+FEATURE_CATEGORIES = ("classes", "subclasses")
+FEATURE_LEVELS = range(0, 21)
+
+
+@dataclass(frozen=True)
+class FeatureSource:
+    """Class to describe one class or subclass feature grant."""
+
+    category: str
+    name: str
+    level: int
+
+
+class FeatureIndex:
+    """Class to look up class and subclass features by name and level.
+
+    Each class and subclass has its features flattened in level order, with a
+    cumulative count of the features gained by each level. The features gained
+    between two levels are then a single slice of the flattened tuple.
+
+    """
+
+    def __init__(self, rules: dict):
+        self.sources = dict()
+        self.entities = {
+            (category, level): list()
+            for category in FEATURE_CATEGORIES
+            for level in FEATURE_LEVELS
+        }
+        self._features = dict()
+
+        for category in FEATURE_CATEGORIES:
+            for name, entry in rules[category].items():
+                features = list()
+                counts = list()
+                for level in FEATURE_LEVELS:
+                    level_features = entry["features"].get(level, ())
+                    for feature in level_features:
+                        self.sources.setdefault(feature, list()).append(
+                            FeatureSource(category, name, level)
+                        )
+                    if len(level_features) != 0:
+                        self.entities[(category, level)].append(name)
+                    features += level_features
+                    counts.append(len(features))
+                self._features[(category, name)] = (tuple(features), tuple(counts))
+
+        self.sources = {k: tuple(v) for k, v in self.sources.items()}
+        self.entities = {k: tuple(v) for k, v in self.entities.items()}
+
+    def get(self, feature: str) -> tuple:
+        """Returns the classes/subclasses (and levels) that grant a feature."""
+        return self.sources.get(feature, ())
+
+    def get_entities(self, category: str, level: int) -> tuple:
+        """Returns the classes or subclasses that gain features at a level."""
+        try:
+            return self.entities[(category, level)]
+        except KeyError:
+            raise ValueError(f"Unknown feature category/level '{category}/{level}'.")
+
+    def get_features(
+        self, category: str, name: str, level: int, from_level: int = 0
+    ) -> tuple:
+        """Returns the features gained after from_level, up to level."""
+        try:
+            features, counts = self._features[(category, name)]
+        except KeyError:
+            raise ValueError(f"Unknown feature category/entry '{category}/{name}'.")
+
+        return features[counts[from_level] : counts[level]]
@@ -0,0 +1,253 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+import json
+import os
+import threading
+import tomllib
+
+from ._features import FeatureIndex
+from ._loader import RulesetLoader
+from ._proficiencies import ProficiencyIndex
+from ._queries import CategoryIndex
+from ._skills import SkillTable
+from ._sourcebooks import filter_rules
+from ._spells import SpellIndex
+from ._strings import StringTable
+from ._versions import get_content_hash
+
+
+class Ruleset:
+    """Class to hold one merged, flattened view of the character rules.
+
+    Overlays are merged into the base rules once, when the view is built, so
+    reads never chain through them.
+
+    """
+
+    def __init__(
+        self,
+        rules: dict,
+        base: "Ruleset | None" = None,
+        sourcebooks: tuple | None = None,
+    ):
+        self.rules = rules
+        self.base = base
+        self.sourcebooks = sourcebooks
+        self.versions = {k: get_content_hash(v) for k, v in rules.items()}
+        self.version = get_content_hash(sorted(self.versions.items()))
+        self._features = None
+        self._indexes = dict()
+        self._proficiencies = None
+        self._skills = None
+        self._spells = None
+        self._strings = None
+
+    @property
+    def features(self) -> FeatureIndex:
+        """Returns the feature index of this view (built on first use)."""
+        if self._features is None:
+            self._features = FeatureIndex(self.rules)
+        return self._features
+
+    def get_index(self, category: str) -> CategoryIndex:
+        """Returns the secondary indexes of a category (built on first use)."""
+        index = self._indexes.get(category)
+        if index is None:
+            entries = self.rules.get(category)
+            if not isinstance(entries, dict):
+                raise ValueError(f"Unknown ruleset category '{category}'.")
+            index = self._indexes.setdefault(category, CategoryIndex(entries))
+        return index
+
+    @property
+    def proficiencies(self) -> ProficiencyIndex:
+        """Returns the proficiency index of this view (built on first use)."""
+        if self._proficiencies is None:
+            base_index = None if self.base is None else self.base.proficiencies
+            self._proficiencies = ProficiencyIndex(self.rules, base_index)
+        return self._proficiencies
+
+    @property
+    def skills(self) -> SkillTable:
+        """Returns the skill table of this view (built on first use)."""
+        if self._skills is None:
+            self._skills = SkillTable(self.rules, self.proficiencies)
+        return self._skills
+
+    @property
+    def spells(self) -> SpellIndex:
+        """Returns the spell index of this view (built on first use)."""
+        if self._spells is None:
+            self._spells = SpellIndex(self.rules)
+        return self._spells
+
+    @property
+    def strings(self) -> StringTable:
+        """Returns the string table of this view (built on first use)."""
+        if self._strings is None:
+            self._strings = StringTable.from_rules(self.rules)
+        return self._strings
+
+
+class _ActiveIndex:
+    """Class to forward index calls to the active ruleset's index."""
+
+    def __init__(self, index: str):
+        self._index = index
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(getattr(get_active_ruleset(), self._index), name)
+
+
+BASE_RULESET = Ruleset({rule.name: rule.value for rule in RulesetLoader})
+FEATURES = _ActiveIndex("features")
+PROFICIENCIES = _ActiveIndex("proficiencies")
+SKILLS = _ActiveIndex("skills")
+SPELLS = _ActiveIndex("spells")
+STRINGS = _ActiveIndex("strings")
+
+# Most merged views kept; the least recently used are dropped first.
+RULESET_CACHE_SIZE = 16
+
+_active_ruleset = ContextVar("active_ruleset", default=None)
+_default_ruleset = BASE_RULESET
+_rulesets = OrderedDict()
+_rulesets_lock = threading.Lock()
+
+
+def get_active_ruleset() -> Ruleset:
+    """Returns the ruleset used by the current context.
+
+    Contexts without a ruleset of their own use the process default.
+
+    """
+    ruleset = _active_ruleset.get()
+    return _default_ruleset if ruleset is None else ruleset
+
+
+def get_ruleset(
+    overlays: list | tuple = (),
+    base: Ruleset | None = None,
+    sourcebooks: list | tuple | None = None,
+    shards: dict | None = None,
+) -> Ruleset:
+    """Returns the base rules merged with overlays, in order.
+
+    Each overlay is a mapping or the path of a JSON/TOML overlay file. If
+    sourcebooks is set, only those books' shards (and untagged entries) are
+    kept; shards replaces the imported sourcebook shards if it is set. Merged
+    views are cached by the base version, the overlays' content hash, the
+    enabled sourcebooks and the shards' content hash; only the
+    RULESET_CACHE_SIZE most recently used are kept.
+
+    """
+    base = BASE_RULESET if base is None else base
+    overlays = tuple(load_overlay(o) if isinstance(o, str) else o for o in overlays)
+    if sourcebooks is not None:
+        sourcebooks = tuple(sorted(set(sourcebooks)))
+    if len(overlays) == 0 and sourcebooks is None:
+        return base
+
+    key = (
+        base.version,
+        get_content_hash(overlays),
+        sourcebooks,
+        None if shards is None else get_content_hash(shards),
+    )
+    with _rulesets_lock:
+        ruleset = _rulesets.get(key)
+        if ruleset is not None:
+            _rulesets.move_to_end(key)
+            return ruleset
+
+    rules = base.rules
+    for overlay in overlays:
+        rules = merge_rules(rules, overlay)
+    if sourcebooks is not None:
+        rules = filter_rules(rules, sourcebooks, shards)
+    ruleset = Ruleset(rules, base, sourcebooks)
+
+    with _rulesets_lock:
+        ruleset = _rulesets.setdefault(key, ruleset)
+        while len(_rulesets) > RULESET_CACHE_SIZE:
+            _rulesets.popitem(last=False)
+        return ruleset
+
+
+def load_overlay(path: str) -> dict:
+    """Loads a JSON or TOML ruleset overlay file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path, encoding="utf-8") as overlay_file:
+            overlay = json.load(overlay_file)
+    elif extension == ".toml":
+        with open(path, "rb") as overlay_file:
+            overlay = tomllib.load(overlay_file)
+    else:
+        raise ValueError(f"Unsupported ruleset overlay format '{path}'.")
+
+    if not isinstance(overlay, dict):
+        raise ValueError(f"Ruleset overlay '{path}' must be a table of categories.")
+
+    return _normalize_keys(overlay)
+
+
+def merge_rules(rules: dict, overlay: dict) -> dict:
+    """Returns rules with an overlay applied, leaving both unchanged.
+
+    Overlay entries add to a category or update an existing entry field by
+    field; an entry set to null is removed. List categories (i.e alignments)
+    are extended.
+
+    """
+    merged = dict(rules)
+    for category, entries in overlay.items():
+        current = merged.get(category)
+        if isinstance(current, dict) and isinstance(entries, dict):
+            category_rules = dict(current)
+            for name, entry in entries.items():
+                if entry is None:
+                    category_rules.pop(name, None)
+                elif isinstance(entry, dict) and isinstance(
+                    category_rules.get(name), dict
+                ):
+                    category_rules[name] = {**category_rules[name], **entry}
+                else:
+                    category_rules[name] = entry
+            merged[category] = category_rules
+        elif isinstance(current, list) and isinstance(entries, list):
+            merged[category] = list(dict.fromkeys(current + entries))
+        else:
+            merged[category] = entries
+
+    return merged
+
+
+def set_default_ruleset(ruleset: Ruleset) -> None:
+    """Replaces the process default ruleset."""
+    global _default_ruleset
+    _default_ruleset = ruleset
+
+
+@contextmanager
+def use_ruleset(ruleset: Ruleset):
+    """Makes ruleset the active ruleset within a with block."""
+    token = _active_ruleset.set(ruleset)
+    try:
+        yield ruleset
+    finally:
+        _active_ruleset.reset(token)
+
+
+def _normalize_keys(value: object) -> object:
+    """Converts numeric mapping keys (i.e level tables) back to integers."""
+    if isinstance(value, dict):
+        return {
+            int(k) if isinstance(k, str) and k.isdigit() else k: _normalize_keys(v)
+            for k, v in value.items()
+        }
+    elif isinstance(value, list):
+        return [_normalize_keys(v) for v in value]
+
+    return value
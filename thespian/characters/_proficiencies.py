@@ -0,0 +1,102 @@
+PROFICIENCY_CATEGORIES = ("armors", "languages", "skills", "tools", "weapons")
+
+
+def _flatten_names(value: object) -> list:
+    """Flattens a ruleset proficiency entry into a list of names."""
+    if isinstance(value, str):
+        return [value] if value != "" else []
+
+    names = list()
+    if isinstance(value, dict):
+        # Grouped options (i.e Weapon Master): group names are proficiencies too.
+        for group, members in value.items():
+            names += _flatten_names(group)
+            names += _flatten_names(members)
+    elif isinstance(value, (list, tuple)):
+        for member in value:
+            names += _flatten_names(member)
+
+    return names
+
+
+class ProficiencyIndex:
+    """Class to intern proficiency names as bitmask positions.
+
+    If a base index is given, its names keep their bits and names only found in
+    rules are assigned the following ones, so masks stay comparable.
+
+    """
+
+    def __init__(self, rules: dict, base: "ProficiencyIndex | None" = None):
+        pools = {category: set() for category in PROFICIENCY_CATEGORIES}
+        pools["skills"].update(rules["skills"].keys())
+
+        for category in ("backgrounds", "classes", "races", "subclasses", "subraces"):
+            for entry in rules[category].values():
+                for proficiency_type in PROFICIENCY_CATEGORIES:
+                    pools[proficiency_type].update(
+                        _flatten_names(entry.get(proficiency_type))
+                    )
+
+        for feat in rules["feats"].values():
+            for proficiency_type in PROFICIENCY_CATEGORIES:
+                pools[proficiency_type].update(
+                    _flatten_names(feat["perk"].get(proficiency_type))
+                )
+
+        # Sorted names keep bit positions stable between runs.
+        self.names = {k: tuple(sorted(v)) for k, v in pools.items()}
+        if base is not None:
+            self.names = {
+                k: base.names[k] + tuple(n for n in v if n not in base.bits[k])
+                for k, v in self.names.items()
+            }
+        self.bits = {
+            k: {name: 1 << position for position, name in enumerate(v)}
+            for k, v in self.names.items()
+        }
+
+    def bit(self, category: str, name: str) -> int:
+        """Returns the bit assigned to a proficiency name."""
+        try:
+            return self.bits[category][name]
+        except KeyError:
+            raise ValueError(f"Unknown {category} proficiency '{name}'.")
+
+    def decode(self, category: str, mask: int) -> list:
+        """Returns the proficiency names set in mask."""
+        names = self.names[category]
+        decoded = list()
+        position = 0
+        while mask:
+            if mask & 1:
+                decoded.append(names[position])
+            mask >>= 1
+            position += 1
+        return decoded
+
+    def decode_all(self, masks: dict) -> dict:
+        """Returns the proficiency names for each category mask."""
+        return {k: self.decode(k, v) for k, v in masks.items()}
+
+    def encode(self, category: str, names: object) -> int:
+        """Returns the bitmask for a collection of proficiency names."""
+        bits = self.bits[category]
+        mask = 0
+        for name in _flatten_names(names):
+            try:
+                mask |= bits[name]
+            except KeyError:
+                raise ValueError(f"Unknown {category} proficiency '{name}'.")
+        return mask
+
+    def encode_all(self, character: dict) -> dict:
+        """Returns a bitmask for each proficiency category in character."""
+        return {
+            k: self.encode(k, character.get(k)) for k in PROFICIENCY_CATEGORIES
+        }
+
+    def has(self, category: str, mask: int, name: str) -> bool:
+        """Checks if proficiency name is set in mask."""
+        return mask & self.bits[category].get(name, 0) != 0
+
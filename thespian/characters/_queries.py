@@ -0,0 +1,120 @@
+from typing import Callable
+
+
+class CategoryIndex:
+    """Class to hold the secondary indexes of one rules category.
+
+    Every entry is assigned a bit, in rules order. For each field, the entries
+    holding a value (a scalar, a list member or a mapping key) are kept as a
+    posting list bitmask, so predicates combine with integer bit operations.
+    Mappings of named fields (i.e feat requirements) are indexed per subfield
+    too, under a dotted name (i.e "required.race").
+
+    """
+
+    def __init__(self, entries: dict):
+        self.names = tuple(entries)
+        self.all = (1 << len(self.names)) - 1
+        self.postings = dict()
+        self.present = dict()
+
+        for position, entry in enumerate(entries.values()):
+            bit = 1 << position
+            for field, value in entry.items():
+                self._add(field, value, bit)
+
+    def decode(self, mask: int) -> tuple:
+        """Returns the entry names set in mask, in rules order."""
+        names = list()
+        while mask:
+            low_bit = mask & -mask
+            names.append(self.names[low_bit.bit_length() - 1])
+            mask ^= low_bit
+        return tuple(names)
+
+    def get(self, field: str, value: object) -> int:
+        """Returns the posting list of the entries holding a field value."""
+        return self.postings.get(field, dict()).get(value, 0)
+
+    def _add(self, field: str, value: object, bit: int) -> None:
+        postings = self.postings.setdefault(field, dict())
+        if isinstance(value, dict):
+            for key, member in value.items():
+                postings[key] = postings.get(key, 0) | bit
+                if isinstance(key, str):
+                    self._add(f"{field}.{key}", member, bit)
+        elif isinstance(value, (list, tuple)):
+            for member in _flatten_values(value):
+                postings[member] = postings.get(member, 0) | bit
+        elif value is not None:
+            postings[value] = postings.get(value, 0) | bit
+
+        if value:
+            self.present[field] = self.present.get(field, 0) | bit
+
+
+def _flatten_values(values: list | tuple) -> list:
+    """Flattens nested option lists into their hashable members."""
+    flattened = list()
+    for value in values:
+        if isinstance(value, (list, tuple)):
+            flattened += _flatten_values(value)
+        elif not isinstance(value, dict):
+            flattened.append(value)
+    return flattened
+
+
+class Predicate:
+    """Class to describe a composable rules query.
+
+    Predicates evaluate to posting list bitmasks of a category index; they are
+    combined with & (and), | (or) and ~ (not).
+
+    """
+
+    def __init__(self, evaluate: Callable):
+        self.evaluate = evaluate
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return Predicate(lambda i: self.evaluate(i) & other.evaluate(i))
+
+    def __invert__(self) -> "Predicate":
+        return Predicate(lambda i: i.all & ~self.evaluate(i))
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return Predicate(lambda i: self.evaluate(i) | other.evaluate(i))
+
+
+def at_least(field: str, minimum: int) -> Predicate:
+    """Matches entries with a numeric field value of at least minimum."""
+    return _compare(field, lambda v: v >= minimum)
+
+
+def at_most(field: str, maximum: int) -> Predicate:
+    """Matches entries with a numeric field value of at most maximum."""
+    return _compare(field, lambda v: v <= maximum)
+
+
+def has(field: str) -> Predicate:
+    """Matches entries with a non empty/non zero field (i.e bonus_magic)."""
+    return Predicate(lambda i: i.present.get(field, 0))
+
+
+def match(field: str, value: object) -> Predicate:
+    """Matches entries holding value in field (i.e a language of a race)."""
+    return Predicate(lambda i: i.get(field, value))
+
+
+def _compare(field: str, condition: Callable) -> Predicate:
+    def evaluate(index: CategoryIndex) -> int:
+        mask = 0
+        for value, postings in index.postings.get(field, dict()).items():
+            if (
+                isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and condition(value)
+            ):
+                mask |= postings
+        return mask
+
+    return Predicate(evaluate)
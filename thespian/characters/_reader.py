@@ -1,13 +1,16 @@
-from ._loader import RulesetLoader
+from ._overlays import get_active_ruleset
+from ._queries import Predicate
 
 
 class RulesetReader:
-    """Class to handle the retrieval of character rules."""
+    """Class to handle the retrieval of character rules.
+
+    Rules are read from the ruleset active in the current context.
+
+    """
 
     def __init__(self):
-        self.guidelines = dict()
-        for guideline in RulesetLoader:
-            self.guidelines[guideline.name] = guideline.value
+        self.guidelines = get_active_ruleset().rules
 
     def _read_(self, category: str) -> dict | None:
         """Main getter wrapper."""
@@ -204,3 +207,34 @@ class RulesetReader:
             return getter._read_("skills")[skill_name]["associated_ability"]
         except KeyError:
             return None
+
+    @classmethod
+    def get_spell_lists(cls) -> dict:
+        """Returns the spell lists by class and spell level."""
+        getter = cls()
+        spell_lists = getter._read_("spell_lists")
+        return dict() if spell_lists is None else spell_lists
+
+    @classmethod
+    def query(cls, category: str, predicate: Predicate | None = None) -> tuple:
+        """Returns the names of a category's entries matching predicate.
+
+        i.e RulesetReader.query("races", match("size", "Small") & has("spells"))
+
+        """
+        index = get_active_ruleset().get_index(category)
+        if predicate is None:
+            return index.names
+        return index.decode(predicate.evaluate(index))
+
+    @classmethod
+    def version(cls, category: str | None = None) -> str:
+        """Returns a content hash of the ruleset, or of one of its categories."""
+        ruleset = get_active_ruleset()
+        if category is None:
+            return ruleset.version
+
+        try:
+            return ruleset.versions[category]
+        except KeyError:
+            raise ValueError(f"Unknown ruleset category '{category}'.")
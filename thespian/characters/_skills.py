@@ -0,0 +1,40 @@
+from ._proficiencies import ProficiencyIndex
+
+
+class SkillTable:
+    """Class to compute skill ranks from ability modifiers and proficiency masks.
+
+    Skills, their abilities and their mask bits are read from one set of rules,
+    so a table only applies to characters built with its ruleset.
+
+    """
+
+    def __init__(self, rules: dict, proficiencies: ProficiencyIndex):
+        self.skills = tuple(rules["skills"].keys())
+        self.abilities = tuple(
+            rules["skills"][s]["associated_ability"] for s in self.skills
+        )
+        self.bits = tuple(proficiencies.bit("skills", s) for s in self.skills)
+        self._columns = tuple(zip(self.abilities, self.bits))
+
+    def expand(self, ranks: list, skill_mask: int) -> dict:
+        """Builds the skill dictionary output from a row of ranks."""
+        return {
+            skill: {
+                "ability": ability,
+                "rank": rank,
+                "is_class_skill": skill_mask & bit != 0,
+            }
+            for skill, ability, bit, rank in zip(
+                self.skills, self.abilities, self.bits, ranks
+            )
+        }
+
+    def ranks(
+        self, modifiers: dict, skill_mask: int, proficiency_bonus: int = 2
+    ) -> list:
+        """Returns the rank of every skill, from the modifiers by ability."""
+        return [
+            modifiers[ability] + (proficiency_bonus if skill_mask & bit else 0)
+            for ability, bit in self._columns
+        ]
@@ -0,0 +1,88 @@
+from .sourcebooks import shards as SHARDS
+
+SHARDED_CATEGORIES = (
+    "backgrounds",
+    "classes",
+    "feats",
+    "races",
+    "subclasses",
+    "subraces",
+)
+
+
+def filter_rules(
+    rules: dict, sourcebooks: list | tuple, shards: dict | None = None
+) -> dict:
+    """Returns only the rules found in the enabled sourcebooks' shards.
+
+    Entries without a sourcebook (i.e homebrew) are always kept. References to
+    dropped entries (class subclasses, race subraces, metrics and spell list
+    spells) are removed as well. If shards is set (i.e reloaded from their
+    source), it is used instead of the imported shards.
+
+    """
+    shards = SHARDS if shards is None else shards
+    for book in sourcebooks:
+        if book not in shards:
+            raise ValueError(f"Unknown sourcebook '{book}'.")
+    enabled = frozenset(sourcebooks)
+    index = SOURCEBOOK_INDEX if shards is SHARDS else _get_sourcebook_index(shards)
+
+    def is_enabled(category: str, name: str) -> bool:
+        book = index.get((category, name))
+        return book is None or book in enabled
+
+    filtered = dict(rules)
+    for category in SHARDED_CATEGORIES:
+        filtered[category] = {
+            k: v for k, v in rules[category].items() if is_enabled(category, k)
+        }
+
+    for category, reference, referenced_category in (
+        ("classes", "subclass", "subclasses"),
+        ("races", "subrace", "subraces"),
+    ):
+        for name, entry in filtered[category].items():
+            references = entry.get(reference)
+            if isinstance(references, list):
+                filtered[category][name] = {
+                    **entry,
+                    reference: [
+                        r for r in references if is_enabled(referenced_category, r)
+                    ],
+                }
+
+    # Metrics are kept by race, or by subrace where subraces differ.
+    filtered["metrics"] = {
+        k: v
+        for k, v in rules["metrics"].items()
+        if k in filtered["races"] or k in filtered["subraces"]
+    }
+    filtered["spell_lists"] = {
+        klass: {
+            level: [s for s in spells if is_enabled("spells", s)]
+            for level, spells in spell_list.items()
+        }
+        for klass, spell_list in rules["spell_lists"].items()
+        if klass in filtered["classes"]
+    }
+
+    return filtered
+
+
+def get_sourcebook(category: str, name: str) -> str | None:
+    """Returns the sourcebook an entry (or spell) was introduced in."""
+    return SOURCEBOOK_INDEX.get((category, name))
+
+
+def _get_sourcebook_index(shards: dict) -> dict:
+    """Returns the sourcebook of every entry, by (category, entry name)."""
+    return {
+        (category, name): book
+        for book, shard in shards.items()
+        for category, names in shard.items()
+        for name in names
+    }
+
+
+SOURCEBOOK_INDEX = _get_sourcebook_index(SHARDS)
@@ -0,0 +1,132 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+import re
+
+
+@dataclass(frozen=True)
+class SpellSource:
+    """Class to describe one source that grants a spell.
+
+    For class spell lists, level is the spell level. For races, subraces and
+    subclasses it is the character level the spell is granted at. Feats grant
+    their spells at any level, so their level is None.
+
+    """
+
+    category: str
+    name: str
+    level: int | None
+
+
+def normalize_spell_name(name: str) -> str:
+    """Returns the lookup form of a spell name.
+
+    Case and spacing are ignored, as is a trailing qualifier (i.e "Animal
+    Friendship (Snakes only)").
+
+    """
+    name = re.sub(r"\s*\([^)]*\)\s*$", "", name)
+    return " ".join(name.split()).casefold()
+
+
+def _flatten_spells(value: object) -> list:
+    """Flattens a spell entry (with nested choice lists) into spell names."""
+    if isinstance(value, str):
+        return [value] if value != "" else []
+
+    names = list()
+    if isinstance(value, (list, tuple)):
+        for member in value:
+            names += _flatten_spells(member)
+    return names
+
+
+class SpellIndex:
+    """Class to look up every source that grants a spell.
+
+    Spell names are normalized, so spellings used by different entries (i.e
+    "Faerie Fire" and "Faerie fire") share their sources. Names are kept
+    sorted for prefix searches and joined into one string for substring
+    searches, so neither scans the rules.
+
+    """
+
+    def __init__(self, rules: dict):
+        sources = dict()
+        self.titles = dict()
+
+        def add(spells: object, category: str, name: str, level: int | None):
+            for spell in _flatten_spells(spells):
+                key = normalize_spell_name(spell)
+                self.titles.setdefault(key, spell)
+                sources.setdefault(key, list()).append(
+                    SpellSource(category, name, level)
+                )
+
+        for klass, spell_list in rules["spell_lists"].items():
+            for spell_level, spells in spell_list.items():
+                add(spells, "classes", klass, spell_level)
+
+        for category in ("races", "subraces"):
+            for name, entry in rules[category].items():
+                spells = entry["spells"]
+                # List type spell entries are granted at level one.
+                if isinstance(spells, list):
+                    spells = {1: spells}
+                for level, level_spells in spells.items():
+                    add(level_spells, category, name, level)
+
+        for subclass, entry in rules["subclasses"].items():
+            for level, spells in entry["bonus_magic"].items():
+                add(spells, "subclasses", subclass, level)
+
+        for feat, entry in rules["feats"].items():
+            add(entry["perk"].get("spells"), "feats", feat, None)
+
+        self.sources = {k: tuple(v) for k, v in sources.items()}
+        self.keys = tuple(sorted(self.sources))
+
+        # Each name is preceded by a newline, so matches never span two names.
+        self._text = "".join(f"\n{k}" for k in self.keys)
+        self._offsets = list()
+        offset = 0
+        for key in self.keys:
+            self._offsets.append(offset)
+            offset += len(key) + 1
+
+    def get(self, spell: str) -> tuple:
+        """Returns the sources that grant a spell."""
+        return self.sources.get(normalize_spell_name(spell), ())
+
+    def search(self, text: str, limit: int | None = None) -> list:
+        """Returns the spells whose names contain text, in name order."""
+        needle = normalize_spell_name(text)
+        if needle == "":
+            return self._get_titles(self.keys, limit)
+
+        keys = list()
+        position = self._text.find(needle)
+        while position != -1 and (limit is None or len(keys) < limit):
+            index = bisect_right(self._offsets, position) - 1
+            keys.append(self.keys[index])
+            # Continue from the next name, so a name is only matched once.
+            next_offset = self._offsets[index] + len(self.keys[index]) + 1
+            position = self._text.find(needle, next_offset)
+
+        return self._get_titles(keys)
+
+    def search_prefix(self, text: str, limit: int | None = None) -> list:
+        """Returns the spells whose names start with text, in name order."""
+        needle = normalize_spell_name(text)
+        start = bisect_left(self.keys, needle)
+        # Every key with the prefix sorts before the prefix followed by U+10FFFF.
+        end = bisect_left(self.keys, f"{needle}\U0010ffff", start)
+        if limit is not None:
+            end = min(end, start + limit)
+
+        return self._get_titles(self.keys[start:end])
+
+    def _get_titles(self, keys: tuple | list, limit: int | None = None) -> list:
+        if limit is not None:
+            keys = keys[:limit]
+        return [self.titles[k] for k in keys]
@@ -0,0 +1,54 @@
+from collections import Counter
+
+from ._versions import get_content_hash
+
+
+class StringTable:
+    """Class to number the strings of a ruleset for compact encoding.
+
+    Every string value and mapping key of the rules gets an id, the most
+    frequent first (i.e skill and ability names), so the strings characters
+    repeat most take the fewest bytes as varints. The table's version is a
+    content hash of its strings in id order: encoded ids are only meaningful
+    against a table with the same version.
+
+    """
+
+    def __init__(self, strings: tuple | list):
+        self.strings = tuple(strings)
+        self.ids = {string: i for i, string in enumerate(self.strings)}
+        self.version = get_content_hash(self.strings)
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    @classmethod
+    def from_rules(cls, rules: dict) -> "StringTable":
+        """Returns the string table of a set of rules."""
+        counts = Counter()
+        _count_strings(rules, counts)
+        return cls(sorted(counts, key=lambda s: (-counts[s], s)))
+
+    def get(self, string: str) -> int | None:
+        """Returns the id of a string, if it is in the table."""
+        return self.ids.get(string)
+
+    def get_string(self, string_id: int) -> str:
+        """Returns the string with an id."""
+        try:
+            return self.strings[string_id]
+        except IndexError:
+            raise ValueError(f"Unknown string id {string_id}.")
+
+
+def _count_strings(value: object, counts: Counter) -> None:
+    if isinstance(value, str):
+        counts[value] += 1
+    elif isinstance(value, dict):
+        for key, member in value.items():
+            if isinstance(key, str):
+                counts[key] += 1
+            _count_strings(member, counts)
+    elif isinstance(value, (list, tuple)):
+        for member in value:
+            _count_strings(member, counts)
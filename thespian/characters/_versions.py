@@ -0,0 +1,13 @@
+import hashlib
+import json
+
+
+def get_content_hash(value: object) -> str:
+    """Returns a stable content hash of a JSON-like value."""
+    return hashlib.blake2b(
+        json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode(
+            "utf-8"
+        ),
+        digest_size=16,
+    ).hexdigest()
+
@@ -0,0 +1,148 @@
+import importlib.util
+import logging
+import os
+import threading
+import time
+
+from . import rulesets, sourcebooks as sourcebook_shards
+from ._overlays import (
+    BASE_RULESET,
+    Ruleset,
+    get_ruleset,
+    set_default_ruleset,
+    use_ruleset,
+)
+
+log = logging.getLogger("thespian.characters")
+
+
+class RulesetWatcher:
+    """Class to reload the rules when their source files change.
+
+    The base rules module, the sourcebooks module and the overlay files are
+    polled for modification times. On a change, a new ruleset is compiled and
+    its indexes built on the watcher thread, then it is swapped in as a single
+    reference assignment, so readers never see a half built ruleset nor pay
+    for its first use. Each of warmers is also called on the watcher thread,
+    with the new ruleset active, to compile tables kept outside of it (i.e
+    progression tables). If set_default is enabled, the watched ruleset is
+    also the process default; builds already running keep the ruleset they
+    started with.
+
+    """
+
+    def __init__(
+        self,
+        overlays: list | tuple = (),
+        interval: float = 2.0,
+        set_default: bool = True,
+        sourcebooks: list | tuple | None = None,
+        warmers: list | tuple = (),
+    ):
+        self.overlays = tuple(overlays)
+        self.sourcebooks = sourcebooks
+        self.interval = interval
+        self.set_default = set_default
+        self.warmers = tuple(warmers)
+        self.sources = (rulesets.__file__, sourcebook_shards.__file__) + self.overlays
+        self.ruleset = get_ruleset(self.overlays, sourcebooks=sourcebooks)
+        if set_default:
+            set_default_ruleset(self.ruleset)
+        self.reloads = 0
+        self.failures = 0
+        self.last_reload = None
+        self._mtimes = self._get_mtimes()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def poll(self) -> bool:
+        """Reloads the rules if a source changed, returning True if it did."""
+        mtimes = self._get_mtimes()
+        if mtimes == self._mtimes:
+            return False
+
+        self._mtimes = mtimes
+        return self.reload()
+
+    def reload(self) -> bool:
+        """Compiles the rules from their sources and swaps them in."""
+        started = time.perf_counter()
+        try:
+            base = Ruleset(_load_dict(rulesets.__file__, "rules"), BASE_RULESET)
+            shards = None
+            if self.sourcebooks is not None:
+                shards = _load_dict(sourcebook_shards.__file__, "shards")
+            ruleset = get_ruleset(self.overlays, base, self.sourcebooks, shards)
+            _warm(ruleset, self.warmers)
+        except Exception as e:
+            self.failures += 1
+            log.warning(f"Could not reload the rules, keeping the current ones: {e}")
+            return False
+
+        self.ruleset = ruleset
+        if self.set_default:
+            set_default_ruleset(ruleset)
+        self.reloads += 1
+        self.last_reload = time.time()
+        log.info(
+            f"Reloaded rules {ruleset.version} in "
+            f"{(time.perf_counter() - started) * 1000:.1f} ms."
+        )
+        return True
+
+    def start(self) -> "RulesetWatcher":
+        """Starts polling on a daemon thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="thespian-ruleset-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stops polling."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _get_mtimes(self) -> tuple:
+        mtimes = list()
+        for source in self.sources:
+            try:
+                stat = os.stat(source)
+                mtimes.append((stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.poll()
+
+
+def _load_dict(path: str, name: str) -> dict:
+    """Executes a rules module from its source, without touching sys.modules.
+
+    Returns the module's dict called name (i.e 'rules').
+
+    """
+    spec = importlib.util.spec_from_file_location("characters._reloaded_rules", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not isinstance(getattr(module, name, None), dict):
+        raise ValueError(f"Rules module '{path}' does not define a '{name}' dict.")
+    return getattr(module, name)
+
+
+def _warm(ruleset: Ruleset, warmers: tuple) -> None:
+    """Builds a ruleset's indexes, then runs warmers with it active."""
+    ruleset.proficiencies
+    ruleset.skills
+    ruleset.features
+    ruleset.spells
+    ruleset.strings
+    with use_ruleset(ruleset):
+        for warm in warmers:
+            warm()
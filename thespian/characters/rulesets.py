@@ -3996,7 +3996,7 @@ rules = {
             "tools": [],
             "weapons": [],
         },
-        "Colledge of Eloquence": {
+        "College of Eloquence": {
             "armors": [],
             "bonus_magic": {},
             "features": {
@@ -0,0 +1,386 @@
+"""
+=======================================
+# DUNGEONS & DRAGONS (5e) SOURCEBOOKS
+=======================================
+
+Every race, subrace, class, subclass, feat, background and spell list spell
+in the rulesets, by the sourcebook that introduced it. Each book's entries
+make up its shard of the rules.
+
+"""
+SOURCEBOOKS = {
+    "PHB": "Player's Handbook",
+    "MToF": "Mordenkainen's Tome of Foes",
+    "VGtM": "Volo's Guide to Monsters",
+    "XGtE": "Xanathar's Guide to Everything",
+    "TCoE": "Tasha's Cauldron of Everything",
+}
+
+shards = {
+    ########################################
+    # PLAYER'S HANDBOOK
+    ########################################
+    "PHB": {
+        "backgrounds": [
+            "Acolyte",
+            "Charlatan",
+            "Criminal",
+            "Entertainer",
+            "Folk Hero",
+            "Guild Artisan",
+            "Hermit",
+            "Noble",
+            "Outlander",
+            "Sage",
+            "Sailor",
+            "Soldier",
+            "Urchin",
+        ],
+        "classes": [
+            "Barbarian",
+            "Bard",
+            "Cleric",
+            "Druid",
+            "Fighter",
+            "Monk",
+            "Paladin",
+            "Ranger",
+            "Rogue",
+            "Sorcerer",
+            "Warlock",
+            "Wizard",
+        ],
+        "feats": [
+            "Actor",
+            "Alert",
+            "Athlete",
+            "Charger",
+            "Crossbow Expert",
+            "Defensive Duelist",
+            "Dual Wielder",
+            "Dungeon Delver",
+            "Durable",
+            "Elemental Adept",
+            "Grappler",
+            "Great Weapon Master",
+            "Healer",
+            "Heavily Armored",
+            "Heavy Armor Master",
+            "Inspiring Leader",
+            "Keen Mind",
+            "Lightly Armored",
+            "Linguist",
+            "Lucky",
+            "Mage Slayer",
+            "Magic Initiative",
+            "Martial Adept",
+            "Medium Armor Master",
+            "Mobile",
+            "Moderately Armored",
+            "Mounted Combatant",
+            "Observant",
+            "Polearm Master",
+            "Resilient",
+            "Ritual Caster",
+            "Savage Attacker",
+            "Sentinel",
+            "Sharpshooter",
+            "Shield Master",
+            "Skilled",
+            "Skulker",
+            "Spell Sniper",
+            "Tavern Brawler",
+            "Tough",
+            "War Caster",
+            "Weapon Master",
+        ],
+        "races": [
+            "Dragonborn",
+            "Dwarf",
+            "Elf",
+            "Gnome",
+            "HalfElf",
+            "HalfOrc",
+            "Halfling",
+            "Human",
+            "Tiefling",
+        ],
+        "spells": [
+            "Acid splash",
+            "Aid",
+            "Alarm",
+            "Alter self",
+            "Animate objects",
+            "Arcane eye",
+            "Arcane lock",
+            "Bigby's hand",
+            "Blink",
+            "Blur",
+            "Continual flame",
+            "Create food and water",
+            "Creation",
+            "Cure wounds",
+            "Dancing lights",
+            "Darkvision",
+            "Detect magic",
+            "Disguise self",
+            "Dispel magic",
+            "Elemental weapon",
+            "Enhance ability",
+            "Enlarge/reduce",
+            "Expeditious retreat",
+            "Fabricate",
+            "Faerie fire",
+            "False life",
+            "Feather fall",
+            "Fire bolt",
+            "Fly",
+            "Freedom of movements",
+            "Glyph of warding",
+            "Greater restoration",
+            "Grease",
+            "Guidance",
+            "Haste",
+            "Heat metal",
+            "Identify",
+            "Invisibility",
+            "Jump",
+            "Leomund's secret chess",
+            "Lesser restoration",
+            "Levitate",
+            "Light",
+            "Longstrider",
+            "Mage hand",
+            "Magic mouth",
+            "Mending",
+            "Message",
+            "Mordenkainen's faithful hound",
+            "Mordenkainen's private sanctum",
+            "Otiluke's resilient sphere",
+            "Poison spray",
+            "Prestidigitation",
+            "Protection from energy",
+            "Protection from poison",
+            "Purify food and drink",
+            "Ray of frost",
+            "Resistance",
+            "Revivify",
+            "Rope trick",
+            "Sanctuary",
+            "See invisibility",
+            "Shocking grasp",
+            "Spare the dying",
+            "Spider climb",
+            "Stone shape",
+            "Stoneskin",
+            "Thorn whip",
+            "Wall of stone",
+            "Water breathing",
+            "Water walk",
+            "Web",
+        ],
+        "subclasses": [
+            "Arcane Trickster",
+            "Assassin",
+            "Battle Master",
+            "Beast Master",
+            "Champion",
+            "Circle of the Arctic",
+            "Circle of the Coast",
+            "Circle of the Desert",
+            "Circle of the Forest",
+            "Circle of the Grassland",
+            "Circle of the Moon",
+            "Circle of the Mountain",
+            "Circle of the Swamp",
+            "Circle of the Underdark",
+            "College of Lore",
+            "College of Valor",
+            "Draconic Bloodline",
+            "Eldritch Knight",
+            "Hunter",
+            "Knowledge Domain",
+            "Life Domain",
+            "Light Domain",
+            "Nature Domain",
+            "Oath of Devotion",
+            "Oath of Vengeance",
+            "Oath of the Ancients",
+            "Path of the Berserker",
+            "Path of the Totem Warrior",
+            "School of Abjuration",
+            "School of Conjuration",
+            "School of Divination",
+            "School of Enchantment",
+            "School of Evocation",
+            "School of Illusion",
+            "School of Necromancy",
+            "School of Transmutation",
+            "Tempest Domain",
+            "The Archfey",
+            "The Fiend",
+            "The Great Old One",
+            "Thief",
+            "Trickery Domain",
+            "War Domain",
+            "Way of Shadow",
+            "Way of the Four Elements",
+            "Way of the Open Hand",
+            "Wild Magic",
+        ],
+        "subraces": [
+            "Drow",
+            "Forest",
+            "High",
+            "Hill",
+            "Lightfoot",
+            "Mountain",
+            "Rock",
+            "Stout",
+            "Wood",
+        ],
+    },
+    ########################################
+    # MORDENKAINEN'S TOME OF FOES
+    ########################################
+    "MToF": {
+        "races": ["Gith"],
+        "subraces": [
+            "Asmodeus",
+            "Baalzebul",
+            "Deep",
+            "Dispater",
+            "Duergar",
+            "Eladrin",
+            "Fierna",
+            "Githyanki",
+            "Githzerai",
+            "Glasya",
+            "Levistus",
+            "Mammon",
+            "Mephistopheles",
+            "Sea",
+            "Shadar-kai",
+            "Zariel",
+        ],
+    },
+    ########################################
+    # VOLO'S GUIDE TO MONSTERS
+    ########################################
+    "VGtM": {
+        "races": [
+            "Aasimar",
+            "Bugbear",
+            "Firbolg",
+            "Goblin",
+            "Goliath",
+            "Hobgoblin",
+            "Kenku",
+            "Kobold",
+            "Lizardfolk",
+            "Orc",
+            "Tabaxi",
+            "Triton",
+            "Yuanti",
+        ],
+        "subraces": ["Fallen", "Protector", "Scourge"],
+    },
+    ########################################
+    # XANATHAR'S GUIDE TO EVERYTHING
+    ########################################
+    "XGtE": {
+        "feats": [
+            "Bountiful Luck",
+            "Dragon Fear",
+            "Dragon Hide",
+            "Drow High Magic",
+            "Dwarven Fortitude",
+            "Elven Accuracy",
+            "Fade Away",
+            "Fey Teleportation",
+            "Flames of Phlegethos",
+            "Infernal Constitution",
+            "Orcish Fury",
+            "Prodigy",
+            "Second Chance",
+            "Squat Nimbleness",
+            "Svirfneblin Magic",
+            "Wood Elf Magic",
+        ],
+        "spells": [
+            "Absorb elements",
+            "Catapult",
+            "Catnap",
+            "Create bonfire",
+            "Elemental bane",
+            "Flame arrows",
+            "Frostbite",
+            "Magic stone",
+            "Pyrotechnics",
+            "Skill empowerment",
+            "Skywrite",
+            "Snare",
+            "Thunderclap",
+            "Tiny servant",
+            "Transmute rock",
+        ],
+        "subclasses": [
+            "Arcane Archer",
+            "Cavalier",
+            "Circle of Dreams",
+            "Circle of the Shepherd",
+            "College of Glamour",
+            "College of Swords",
+            "College of Whispers",
+            "Divine Soul",
+            "Forge Domain",
+            "Gloom Stalker",
+            "Grave Domain",
+            "Horizon Walker",
+            "Inquisitive",
+            "Mastermind",
+            "Monster Slayer",
+            "Oath of Conquest",
+            "Oath of Redemption",
+            "Path of the Ancestral Guardian",
+            "Path of the Storm Herald",
+            "Path of the Zealot",
+            "Samurai",
+            "Scout",
+            "Shadow Magic",
+            "Storm Sorcery",
+            "Swashbuckler",
+            "The Celestial",
+            "The Hexblade",
+            "War Magic",
+            "Way of the Drunken Master",
+            "Way of the Kensei",
+            "Way of the Sun Soul",
+        ],
+    },
+    ########################################
+    # TASHA'S CAULDRON OF EVERYTHING
+    ########################################
+    "TCoE": {
+        "classes": ["Artificer"],
+        "spells": [
+            "Booming blade",
+            "Green-flame blade",
+            "Intellect fortress",
+            "Lightning lure",
+            "Summon construct",
+            "Sword burst",
+            "Tasha's caustic brew",
+        ],
+        "subclasses": [
+            "Alchemist",
+            "Armorer",
+            "Artillerist",
+            "Battle Smith",
+            "College of Creation",
+            "College of Eloquence",
+            "Path of Wild Magic",
+            "Path of the Beast",
+        ],
+    },
+}
@@ -0,0 +1,361 @@
+from collections.abc import Mapping
+import logging
+import struct
+
+from attributes import ABILITIES
+from characters import StringTable, get_active_ruleset
+from sheets import CharacterSheet
+
+log = logging.getLogger("thespian.codec")
+
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<B4s")
+
+# Character fields, in record order, and how each one is encoded. Records
+# flag the fields they hold, so this order is part of the format: new fields
+# are only ever appended.
+FIELD_KINDS = {
+    "name": "string",
+    "race": "string",
+    "ancestry": "string",
+    "subrace": "string",
+    "sex": "string",
+    "alignment": "string",
+    "background": "string",
+    "feet": "B",
+    "inches": "B",
+    "weight": "H",
+    "size": "string",
+    "class": "string",
+    "subclass": "string",
+    "level": "B",
+    "hit_points": "H",
+    "proficiency_bonus": "B",
+    **{a.lower(): "ability" for a in ABILITIES},
+    "speed": "B",
+    "initiative": "b",
+    "armors": "strings",
+    "tools": "strings",
+    "weapons": "strings",
+    "languages": "strings",
+    "savingthrows": "strings",
+    "skills": "skills",
+    "feats": "strings",
+    "traits": "strings",
+    "features": "strings",
+    "spell_slots": "string",
+    "bonus_magic": "levels",
+    "spells": "strings",
+    "spellbook": "spellbook",
+    "equipment": "strings",
+}
+ABILITY_PROPERTIES = ("carry_capacity", "push_pull_carry", "maximum_lift")
+
+_ABILITY = struct.Struct("<Bb")
+_PROPERTY = struct.Struct("<H")
+_SKILL = struct.Struct("<b")
+_INTEGERS = {
+    kind: struct.Struct(f"<{kind}")
+    for kind in set(FIELD_KINDS.values())
+    if len(kind) == 1
+}
+
+
+def decode_character(
+    data: bytes | memoryview, table: StringTable | None = None
+) -> dict:
+    """Returns a character from its binary record.
+
+    Fields are returned in record order. The record must have been encoded
+    against the same string table version.
+
+    """
+    table = get_active_ruleset().strings if table is None else table
+    view = memoryview(data)
+    try:
+        version, table_id = HEADER.unpack_from(view, 0)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unknown character record format {version}.")
+        if table_id != get_table_id(table):
+            raise ValueError(
+                f"Character record uses string table {table_id.hex()}, "
+                f"not {get_table_id(table).hex()}."
+            )
+
+        strings = table.strings
+        mask, offset = _read_varint(view, HEADER.size)
+        character = dict()
+        previous_skills = None
+        for bit, (field, kind) in enumerate(FIELD_KINDS.items()):
+            if not mask >> bit & 1:
+                continue
+            if kind == "ability":
+                value, offset = _read_ability(view, offset, strings, previous_skills)
+                previous_skills = value["skills"]
+            elif kind in _INTEGERS:
+                (value,) = _INTEGERS[kind].unpack_from(view, offset)
+                offset += _INTEGERS[kind].size
+            else:
+                value, offset = _READERS[kind](view, offset, strings)
+            character[field] = value
+    except (IndexError, struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"Invalid character record: {e}")
+
+    if offset != len(view):
+        raise ValueError(
+            f"Invalid character record: {len(view) - offset} extra bytes."
+        )
+    return character
+
+
+def encode_character(character: Mapping, table: StringTable | None = None) -> bytes:
+    """Returns the compact binary record of a character.
+
+    Scores, hit points, level and metrics are fixed width integers; ruleset
+    strings (i.e races, feats, skills, traits, spells and equipment) are
+    varint ids into the string table, and other strings are stored inline.
+    Sheets are encoded against their own ruleset's table, other characters
+    against the active ruleset's.
+
+    """
+    if table is None:
+        ruleset = getattr(character, "ruleset", None)
+        if not isinstance(character, CharacterSheet) or ruleset is None:
+            ruleset = get_active_ruleset()
+        table = ruleset.strings
+
+    unknown = character.keys() - FIELD_KINDS.keys()
+    if len(unknown) != 0:
+        raise ValueError(f"Unknown character fields {sorted(unknown)}.")
+
+    mask = 0
+    for bit, field in enumerate(FIELD_KINDS):
+        if field in character:
+            mask |= 1 << bit
+
+    ids = table.ids
+    record = bytearray(HEADER.pack(FORMAT_VERSION, get_table_id(table)))
+    _write_varint(record, mask)
+    previous_skills = None
+    for field, kind in FIELD_KINDS.items():
+        if field not in character:
+            continue
+        value = character[field]
+        try:
+            if kind == "ability":
+                _write_ability(record, value, ids, previous_skills)
+                previous_skills = value["skills"]
+            elif kind in _INTEGERS:
+                record += _INTEGERS[kind].pack(value)
+            else:
+                _WRITERS[kind](record, value, ids)
+        except (AttributeError, KeyError, TypeError, struct.error) as e:
+            raise ValueError(f"Could not encode character field '{field}': {e}")
+
+    return bytes(record)
+
+
+def get_table_id(table: StringTable) -> bytes:
+    """Returns the short id records keep of a string table's version."""
+    return bytes.fromhex(table.version[:8])
+
+
+def _read_ability(
+    view: memoryview, offset: int, strings: tuple, previous_skills: list | None
+) -> tuple:
+    score, modifier = _ABILITY.unpack_from(view, offset)
+    offset += _ABILITY.size
+    count, offset = _read_varint(view, offset)
+    if count == 0:
+        if previous_skills is None:
+            raise ValueError("Invalid character record: no skills to repeat.")
+        skills = list(previous_skills)
+    else:
+        skills = list()
+        for _ in range(count - 1):
+            string, offset = _read_string(view, offset, strings)
+            skills.append(string)
+
+    block = {"score": score, "modifier": modifier, "skills": skills}
+    present = view[offset]
+    offset += 1
+    if present != 0:
+        properties = dict()
+        for bit, name in enumerate(ABILITY_PROPERTIES):
+            if present >> bit & 1:
+                (properties[name],) = _PROPERTY.unpack_from(view, offset)
+                offset += _PROPERTY.size
+        block["properties"] = properties
+    return block, offset
+
+
+def _read_levels(view: memoryview, offset: int, strings: tuple) -> tuple:
+    count, offset = _read_varint(view, offset)
+    levels = dict()
+    for _ in range(count):
+        level, offset = _read_varint(view, offset)
+        spells, offset = _read_strings(view, offset, strings)
+        levels[level] = ", ".join(spells)
+    return levels, offset
+
+
+def _read_skills(view: memoryview, offset: int, strings: tuple) -> tuple:
+    count, offset = _read_varint(view, offset)
+    skills = dict()
+    for _ in range(count):
+        skill, offset = _read_string(view, offset, strings)
+        ability, offset = _read_string(view, offset, strings)
+        (packed,) = _SKILL.unpack_from(view, offset)
+        offset += _SKILL.size
+        skills[skill] = {
+            "ability": ability,
+            "rank": packed >> 1,
+            "is_class_skill": bool(packed & 1),
+        }
+    return skills, offset
+
+
+def _read_spellbook(view: memoryview, offset: int, strings: tuple) -> tuple:
+    count, offset = _read_varint(view, offset)
+    spellbook = dict()
+    for _ in range(count):
+        level, offset = _read_varint(view, offset)
+        spellbook[level], offset = _read_strings(view, offset, strings)
+    return spellbook, offset
+
+
+def _read_string(view: memoryview, offset: int, strings: tuple) -> tuple:
+    """Reads a string id, or (for id 0) an inline UTF-8 string."""
+    string_id = view[offset]
+    if 0 < string_id < 0x80:
+        return strings[string_id - 1], offset + 1
+
+    string_id, offset = _read_varint(view, offset)
+    if string_id != 0:
+        if string_id > len(strings):
+            raise ValueError(f"Unknown string id {string_id - 1}.")
+        return strings[string_id - 1], offset
+
+    length, offset = _read_varint(view, offset)
+    if offset + length > len(view):
+        raise ValueError("Invalid character record: truncated string.")
+    return str(view[offset : offset + length], "utf-8"), offset + length
+
+
+def _read_strings(view: memoryview, offset: int, strings: tuple) -> tuple:
+    count, offset = _read_varint(view, offset)
+    values = list()
+    for _ in range(count):
+        string, offset = _read_string(view, offset, strings)
+        values.append(string)
+    return values, offset
+
+
+def _read_varint(view: memoryview, offset: int) -> tuple:
+    value = 0
+    shift = 0
+    while True:
+        byte = view[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def _write_ability(
+    record: bytearray, block: dict, ids: dict, previous_skills: list | None
+) -> None:
+    """Writes an ability block; a skill list equal to the last one is a 0."""
+    record += _ABILITY.pack(block["score"], block["modifier"])
+    skills = block["skills"]
+    if previous_skills is not None and skills == previous_skills:
+        record.append(0)
+    else:
+        _write_varint(record, len(skills) + 1)
+        for skill in skills:
+            _write_string(record, skill, ids)
+
+    properties = block.get("properties", dict())
+    unknown = properties.keys() - set(ABILITY_PROPERTIES)
+    if len(unknown) != 0:
+        raise KeyError(f"Unknown ability properties {sorted(unknown)}")
+    present = sum(1 << i for i, p in enumerate(ABILITY_PROPERTIES) if p in properties)
+    record.append(present)
+    for name in ABILITY_PROPERTIES:
+        if name in properties:
+            record += _PROPERTY.pack(properties[name])
+
+
+def _write_levels(record: bytearray, levels: dict, ids: dict) -> None:
+    """Writes spells by level, splitting each level's spells into names."""
+    # Stored characters come back from JSON with string keys.
+    _write_varint(record, len(levels))
+    for level, spells in levels.items():
+        _write_varint(record, int(level))
+        _write_strings(record, spells.split(", "), ids)
+
+
+def _write_skills(record: bytearray, skills: dict, ids: dict) -> None:
+    _write_varint(record, len(skills))
+    for skill, properties in skills.items():
+        _write_string(record, skill, ids)
+        _write_string(record, properties["ability"], ids)
+        # The rank and class skill flag share a byte.
+        record += _SKILL.pack(
+            properties["rank"] * 2 + bool(properties["is_class_skill"])
+        )
+
+
+def _write_spellbook(record: bytearray, spellbook: dict, ids: dict) -> None:
+    _write_varint(record, len(spellbook))
+    for level, spells in spellbook.items():
+        _write_varint(record, int(level))
+        _write_strings(record, spells, ids)
+
+
+def _write_string(record: bytearray, string: str, ids: dict) -> None:
+    """Writes a string's id plus 1, or a 0 and the string inline."""
+    string_id = ids.get(string)
+    if string_id is not None:
+        if string_id < 0x7F:
+            record.append(string_id + 1)
+        else:
+            _write_varint(record, string_id + 1)
+        return
+
+    data = string.encode("utf-8")
+    record.append(0)
+    _write_varint(record, len(data))
+    record += data
+
+
+def _write_strings(record: bytearray, strings: list, ids: dict) -> None:
+    _write_varint(record, len(strings))
+    for string in strings:
+        _write_string(record, string, ids)
+
+
+def _write_varint(record: bytearray, value: int) -> None:
+    if value < 0:
+        raise TypeError(f"Negative varint {value}")
+    while value >= 0x80:
+        record.append(value & 0x7F | 0x80)
+        value >>= 7
+    record.append(value)
+
+
+_READERS = {
+    "levels": _read_levels,
+    "skills": _read_skills,
+    "spellbook": _read_spellbook,
+    "string": _read_string,
+    "strings": _read_strings,
+}
+_WRITERS = {
+    "levels": _write_levels,
+    "skills": _write_skills,
+    "spellbook": _write_spellbook,
+    "string": _write_string,
+    "strings": _write_strings,
+}
@@ -0,0 +1,528 @@
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from dataclasses import asdict
+import logging
+import threading
+
+from flask import Flask, Response, jsonify, redirect, render_template, request
+
+from archive import CharacterArchive
+from attributes import ABILITIES
+from batch import build_character, make_build_request
+from cache import ResultCache, get_build_key
+from characters import (
+    Ruleset,
+    RulesetWatcher,
+    get_active_ruleset,
+    normalize_spell_name,
+    use_ruleset,
+)
+from progression import warm_progressions
+from recommender import get_recommendation_matrix, recommend
+from store import CharacterQuery, CharacterStore
+
+log = logging.getLogger("thespian.httpd")
+
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_PENDING = "pending"
+# Most results a list request (i.e GET /characters) returns at once.
+MAX_LIMIT = 500
+
+# Query string parameters for score bounds (i.e min_wis) and proficiencies.
+SCORE_PARAMETERS = {ability[:3].lower(): ability for ability in ABILITIES}
+PROFICIENCY_PARAMETERS = {
+    "armor": "armors",
+    "language": "languages",
+    "skill": "skills",
+    "tool": "tools",
+    "weapon": "weapons",
+}
+
+
+class CharacterRegistry:
+    """Class to track generation jobs and look up generated characters.
+
+    Pending and failed jobs are held in memory; generated characters are
+    written to the character store under their job's id, which the store
+    reserves so other writers to it never take the same id.
+
+    """
+
+    def __init__(self, store: CharacterStore | None = None):
+        self.store = CharacterStore() if store is None else store
+        self._lock = threading.Lock()
+        self._records = dict()
+
+    def complete(self, character_id: int, character: dict) -> None:
+        """Stores a generated character."""
+        self.store.add(character, character_id)
+        with self._lock:
+            del self._records[character_id]
+
+    def fail(self, character_id: int, error: str) -> None:
+        """Marks a generation job as failed."""
+        with self._lock:
+            self._records[character_id] = {
+                "id": character_id,
+                "status": STATUS_FAILED,
+                "error": error,
+            }
+
+    def get(self, character_id: int) -> dict | None:
+        """Returns a character record by id."""
+        with self._lock:
+            record = self._records.get(character_id)
+        if record is not None:
+            return record
+
+        character = self.store.get(character_id)
+        if character is None:
+            return None
+        return {"id": character_id, "status": STATUS_DONE, "character": character}
+
+    def page(
+        self, after: int = 0, limit: int = 50, query: CharacterQuery | None = None
+    ) -> list:
+        """Returns up to limit records with ids greater than after.
+
+        If a query is given, only generated characters that match it are
+        returned.
+
+        """
+        if query is not None:
+            return [
+                {"id": i, "status": STATUS_DONE, "character": c}
+                for i, c in self.store.query(query, after, limit)
+            ]
+
+        with self._lock:
+            records = {i: r for i, r in self._records.items() if i > after}
+        for character_id, character in self.store.page(after, limit):
+            records[character_id] = {
+                "id": character_id,
+                "status": STATUS_DONE,
+                "character": character,
+            }
+        return [records[i] for i in sorted(records)[:limit]]
+
+    def reserve(self, count: int = 1) -> list:
+        """Reserves ids for characters that are about to be generated."""
+        ids = self.store.reserve_ids(count)
+        with self._lock:
+            for character_id in ids:
+                self._records[character_id] = {
+                    "id": character_id,
+                    "status": STATUS_PENDING,
+                }
+            return ids
+
+
+class GenerationPool:
+    """Class to run generation jobs on a bounded pool of worker threads.
+
+    At most max_pending jobs are queued or running; further submissions are
+    refused instead of queued without bound.
+
+    """
+
+    def __init__(self, workers: int = 4, max_pending: int = 256):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="thespian-worker"
+        )
+        self.slots = threading.BoundedSemaphore(max_pending)
+
+    def reserve(self, count: int) -> bool:
+        """Claims count job slots, if that many are free."""
+        claimed = 0
+        while claimed < count:
+            if not self.slots.acquire(blocking=False):
+                self.release(claimed)
+                return False
+            claimed += 1
+        return True
+
+    def release(self, count: int = 1) -> None:
+        """Frees job slots."""
+        for _ in range(count):
+            self.slots.release()
+
+    def submit(self, job, *args) -> None:
+        """Runs a job on a worker thread. Requires a reserved slot.
+
+        The job runs in a copy of the caller's context (i.e its active ruleset).
+
+        """
+
+        def run():
+            try:
+                job(*args)
+            finally:
+                self.release()
+
+        self.executor.submit(copy_context().run, run)
+
+    def shutdown(self) -> None:
+        """Waits for running jobs and stops the workers."""
+        self.executor.shutdown(wait=True)
+
+
+def _get_ruleset(rulesets: dict, name: str | None) -> Ruleset:
+    """Returns a named ruleset's current version, or the active ruleset."""
+    if name is None:
+        return get_active_ruleset()
+
+    try:
+        ruleset = rulesets[name]
+    except KeyError:
+        raise ValueError(f"Unknown ruleset '{name}'.")
+
+    if isinstance(ruleset, RulesetWatcher):
+        return ruleset.ruleset
+    return ruleset
+
+
+def _get_query(args) -> CharacterQuery | None:
+    """Returns the character filter described by query string arguments."""
+    min_scores = dict()
+    max_scores = dict()
+    for parameter, ability in SCORE_PARAMETERS.items():
+        if f"min_{parameter}" in args:
+            min_scores[ability] = _get_int(args, f"min_{parameter}")
+        if f"max_{parameter}" in args:
+            max_scores[ability] = _get_int(args, f"max_{parameter}")
+
+    proficiencies = {
+        category: args.getlist(parameter)
+        for parameter, category in PROFICIENCY_PARAMETERS.items()
+        if parameter in args
+    }
+
+    query = CharacterQuery(
+        race=args.get("race"),
+        subrace=args.get("subrace"),
+        klass=args.get("class"),
+        subclass=args.get("subclass"),
+        min_level=_get_int(args, "min_level"),
+        max_level=_get_int(args, "max_level"),
+        min_scores=min_scores,
+        max_scores=max_scores,
+        proficiencies=proficiencies,
+    )
+    if query == CharacterQuery():
+        return None
+
+    # Checks the filter now, so invalid arguments are reported as such.
+    query.to_sql()
+    return query
+
+
+def _get_int(args, parameter: str) -> int | None:
+    """Returns an integer query string argument."""
+    value = args.get(parameter)
+    if value is None:
+        return None
+
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"Argument '{parameter}' must be an integer.")
+
+
+def _get_limit(args, default: int) -> int:
+    """Returns the 'limit' query string argument, clamped to 1 - MAX_LIMIT."""
+    return max(1, min(args.get("limit", default, type=int), MAX_LIMIT))
+
+
+def _summarize(record: dict) -> dict:
+    """Returns the list view of a character record."""
+    summary = {"id": record["id"], "status": record["status"]}
+    if record["status"] == STATUS_DONE:
+        character = record["character"]
+        for field in ("name", "race", "subrace", "class", "subclass", "level"):
+            summary[field] = character.get(field)
+    return summary
+
+
+def _wants_json() -> bool:
+    """Checks if the client asked for a JSON response."""
+    if request.args.get("format") == "json":
+        return True
+    best = request.accept_mimetypes.best_match(["text/html", "application/json"])
+    return best == "application/json"
+
+
+def create_app(
+    workers: int = 4,
+    max_pending: int = 256,
+    store: CharacterStore | None = None,
+    cache: ResultCache | None = None,
+    rulesets: dict | None = None,
+    watcher: RulesetWatcher | None = None,
+    archive: CharacterArchive | None = None,
+) -> Flask:
+    """Creates the character generation web application.
+
+    Generated characters are kept in store, or in memory if it is not set. If a
+    result cache is given, seeded requests it already holds are answered from
+    it without queueing a build. A request can pick one of the named rulesets
+    (or ruleset watchers) with its 'ruleset' option; otherwise the active
+    ruleset is used. Reloads of watcher and the named watchers are reported by
+    GET /metrics. If an archive is given, GET /archive/<position> previews its
+    characters.
+
+    """
+    rulesets = dict() if rulesets is None else rulesets
+    watchers = {k: v for k, v in rulesets.items() if isinstance(v, RulesetWatcher)}
+    if watcher is not None:
+        watchers["default"] = watcher
+    webapp = Flask(__name__)
+    registry = CharacterRegistry(store)
+    pool = GenerationPool(workers, max_pending)
+    webapp.config["THESPIAN_REGISTRY"] = registry
+    webapp.config["THESPIAN_POOL"] = pool
+
+    def generate(character_id: int, build_request) -> None:
+        try:
+            if cache is None:
+                character = build_character(build_request).to_dict()
+            else:
+                character = cache.get_or_build(build_request)
+            registry.complete(character_id, character)
+        except Exception as e:
+            log.warning(f"Could not generate character {character_id}: {e}")
+            registry.fail(character_id, str(e))
+
+    @webapp.route("/")
+    def index():
+        return redirect("/characters")
+
+    @webapp.route("/characters", methods=["POST"])
+    def create_characters():
+        options = request.get_json(silent=True)
+        if options is None:
+            options = dict()
+
+        batch = isinstance(options, list)
+        if not batch:
+            options = [options]
+
+        build_requests = list()
+        cached = dict()
+        try:
+            for index, o in enumerate(options):
+                ruleset = _get_ruleset(rulesets, o.get("ruleset"))
+                with use_ruleset(ruleset):
+                    build_request = make_build_request(o)
+                    if cache is not None and build_request.seed is not None:
+                        character = cache.get(get_build_key(build_request))
+                        if character is not None:
+                            cached[index] = character
+                build_requests.append((ruleset, build_request))
+        except (AttributeError, ValueError) as e:
+            return jsonify({"error": str(e)}), 400
+
+        queued = len(build_requests) - len(cached)
+        if not pool.reserve(queued):
+            return jsonify({"error": "Generation queue is full."}), 503, {
+                "Retry-After": "1"
+            }
+
+        ids = registry.reserve(len(build_requests))
+        for index, character_id in enumerate(ids):
+            ruleset, build_request = build_requests[index]
+            if index in cached:
+                registry.complete(character_id, cached[index])
+                continue
+            with use_ruleset(ruleset):
+                pool.submit(generate, character_id, build_request)
+
+        status = 202 if queued != 0 else 201
+        if batch:
+            return jsonify({"ids": ids}), status
+
+        return jsonify({"id": ids[0]}), status, {"Location": f"/characters/{ids[0]}"}
+
+    @webapp.route("/characters", methods=["GET"])
+    def list_characters():
+        after = request.args.get("after", 0, type=int)
+        limit = _get_limit(request.args, 50)
+        try:
+            query = _get_query(request.args)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        records = registry.page(after, limit, query)
+        next_after = records[-1]["id"] if len(records) == limit else None
+        return jsonify(
+            {"characters": [_summarize(r) for r in records], "next": next_after}
+        )
+
+    @webapp.route("/metrics")
+    def metrics():
+        lines = list()
+        for name, w in watchers.items():
+            labels = f'{{ruleset="{name}",version="{w.ruleset.version}"}}'
+            lines.append(f"thespian_ruleset_reloads_total{labels} {w.reloads}")
+            lines.append(
+                f"thespian_ruleset_reload_failures_total{labels} {w.failures}"
+            )
+        if cache is not None:
+            lines.append(f"thespian_cache_hits_total {cache.hits}")
+            lines.append(f"thespian_cache_misses_total {cache.misses}")
+        return Response("\n".join(lines) + "\n", mimetype="text/plain")
+
+    @webapp.route("/features")
+    def list_features():
+        category = request.args.get("category", "subclasses")
+        try:
+            level = _get_int(request.args, "level")
+            if level is None:
+                raise ValueError("Argument 'level' is required.")
+            features = _get_ruleset(rulesets, request.args.get("ruleset")).features
+            entities = features.get_entities(category, level)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return jsonify(
+            {
+                category: {
+                    name: features.get_features(category, name, level, level - 1)
+                    for name in entities
+                }
+            }
+        )
+
+    @webapp.route("/features/<string:feature>")
+    def get_feature(feature: str):
+        try:
+            features = _get_ruleset(rulesets, request.args.get("ruleset")).features
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        sources = features.get(feature)
+        if len(sources) == 0:
+            return jsonify({"error": f"Unknown feature '{feature}'."}), 404
+
+        return jsonify({"feature": feature, "sources": [asdict(s) for s in sources]})
+
+    @webapp.route("/recommendations")
+    def list_recommendations():
+        limit = _get_limit(request.args, 10)
+        weights = dict()
+        try:
+            for parameter, ability in SCORE_PARAMETERS.items():
+                if parameter in request.args:
+                    weights[ability] = float(request.args[parameter])
+        except ValueError:
+            return jsonify({"error": f"Weight '{parameter}' must be a number."}), 400
+        if len(weights) == 0:
+            return jsonify({"error": "No ability weights (i.e dex=2) given."}), 400
+
+        try:
+            ruleset = _get_ruleset(rulesets, request.args.get("ruleset"))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        with use_ruleset(ruleset):
+            recommendations = recommend(weights, limit)
+        return jsonify({"recommendations": [asdict(r) for r in recommendations]})
+
+    @webapp.route("/spells")
+    def search_spells():
+        text = request.args.get("q", "")
+        limit = _get_limit(request.args, 20)
+        try:
+            spells = _get_ruleset(rulesets, request.args.get("ruleset")).spells
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Prefix matches are listed first, i.e for search as you type.
+        names = spells.search_prefix(text, limit)
+        if len(names) < limit:
+            names += [n for n in spells.search(text, limit) if n not in names]
+        return jsonify({"spells": names[:limit]})
+
+    @webapp.route("/spells/<string:spell>")
+    def get_spell(spell: str):
+        try:
+            spells = _get_ruleset(rulesets, request.args.get("ruleset")).spells
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        sources = spells.get(spell)
+        if len(sources) == 0:
+            return jsonify({"error": f"Unknown spell '{spell}'."}), 404
+
+        return jsonify(
+            {
+                "spell": spells.titles[normalize_spell_name(spell)],
+                "sources": [asdict(s) for s in sources],
+            }
+        )
+
+    @webapp.route("/archive/<int:position>")
+    def get_archived_character(position: int):
+        if archive is None or position >= len(archive):
+            return jsonify({"error": f"Unknown archived character {position}."}), 404
+
+        character = archive[position]
+        if _wants_json():
+            return jsonify({"position": position, **character})
+
+        return render_template("index.html", **character)
+
+    @webapp.route("/characters/<int:character_id>")
+    def get_character(character_id: int):
+        record = registry.get(character_id)
+        if record is None:
+            return jsonify({"error": f"Unknown character {character_id}."}), 404
+
+        if record["status"] == STATUS_PENDING:
+            return jsonify(_summarize(record)), 202
+        elif record["status"] == STATUS_FAILED:
+            return jsonify(record), 500
+
+        if _wants_json():
+            return jsonify({"id": character_id, **record["character"]})
+
+        return render_template("index.html", **record["character"])
+
+    return webapp
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 5000,
+    workers: int = 4,
+    database: str | None = None,
+    cache_directory: str | None = None,
+    overlays: list | tuple = (),
+    reload: bool = True,
+    sourcebooks: list | tuple | None = None,
+    archive: str | None = None,
+) -> None:
+    """Runs the character generation web application.
+
+    If reload is set, the rules and overlays are reloaded when they change. If
+    sourcebooks is set, only content from those books is used. If archive is
+    set, the characters of that archive file can be previewed.
+
+    """
+    store = None if database is None else CharacterStore(database)
+    cache = ResultCache(directory=cache_directory)
+    watcher = RulesetWatcher(
+        overlays,
+        sourcebooks=sourcebooks,
+        warmers=(warm_progressions, get_recommendation_matrix),
+    )
+    if reload:
+        watcher.start()
+    webapp = create_app(
+        workers,
+        store=store,
+        cache=cache,
+        watcher=watcher,
+        archive=None if archive is None else CharacterArchive(archive),
+    )
+    webapp.run(host=host, port=port, threaded=True)
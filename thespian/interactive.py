@@ -5,7 +5,7 @@ from prettytable import PrettyTable
 
 from characters import RulesetLoader
 from httpd import Server
-from thespian import thespian
+from thespian import configure_logging, thespian
 
 
 class PromptValueError(ValueError):
@@ -59,7 +59,7 @@ class InteractivePrompt:
             if isinstance(rule.value, dict):
                 self.ruleset_options[rule.name] = list(rule.value.keys())
             else:
-                self.ruleset_options[rule.name] = rule.value
+                self.ruleset_options[rule.name] = list(rule.value)
 
             self.ruleset_options[rule.name].sort()
 
@@ -238,6 +238,7 @@ class InteractivePrompt:
 
 
 def main() -> None:
+    configure_logging()
     console = InteractivePrompt()
     console.run()
 
@@ -16,6 +16,7 @@ class AnthropometricCalculator:
     race: str
     sex: str
     subrace: str | None = None
+    rng: random.Random | None = None
 
     def _get_height_and_weight_base(self) -> tuple:
         """Gets the base height/weight information for race/subrace."""
@@ -51,18 +52,19 @@ class AnthropometricCalculator:
 
     def calculate(self, use_dominant_sex: bool = False) -> tuple:
         """Calculates character's height and weight."""
+        rng = random if self.rng is None else self.rng
         height_values, weight_values = self._get_height_and_weight_base()
         height_pair = height_values.split(",")
         weight_pair = weight_values.split(",")
 
         # Height formula = base + modifier result
         height_base = int(height_pair[0])
-        height_modifier = sum(roll_die(height_pair[1]))
+        height_modifier = sum(roll_die(height_pair[1], rng))
         height_calculation = height_base + height_modifier
 
         # Weight formula = height modifier * weight modifier + base
         weight_base = int(weight_pair[0])
-        weight_modifier = sum(roll_die(weight_pair[1]))
+        weight_modifier = sum(roll_die(weight_pair[1], rng))
         weight_calculation = (weight_modifier * height_modifier) + weight_base
 
         # "Unofficial" rule for height/weight differential by gender
@@ -80,14 +82,14 @@ class AnthropometricCalculator:
             # Make "non-dominant" sex smaller than the dominant sex.
             if self.sex != dominant_sex:
                 # Subtract 0-5 inches from height.
-                height_diff = random.randint(0, 5)
+                height_diff = rng.randint(0, 5)
                 height_calculation = height_calculation - height_diff
                 log.warning(
                     f"Using a non-dominant gender height differential of -{height_diff} inches.",
                 )
 
                 # Subtract 15-20% lbs from weight.
-                weight_diff = random.randint(15, 20) / 100
+                weight_diff = rng.randint(15, 20) / 100
                 weight_diff = math.floor(weight_calculation * weight_diff)
                 weight_calculation = weight_calculation - weight_diff
                 log.warning(
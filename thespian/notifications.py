@@ -2,6 +2,8 @@ import time
 
 from colorama import init, Fore, Style
 
+from policies import get_available_options
+
 
 STATUS_ERROR = 1
 STATUS_NORMAL = 0
@@ -14,7 +16,8 @@ init(autoreset=True)
 class PromptRecorder:
     """Class to store/recall user prompt selections."""
 
-    prompt_inputs: dict = dict()
+    def __init__(self):
+        self.prompt_inputs = dict()
 
     def recall(self, prompt_category: str) -> dict:
         """Returns/creates (if non-existent) prompt saved to a specified category."""
@@ -72,20 +75,21 @@ def init_status(
 
 
 def prompt(
-    message: str, prompt_options: list | tuple, selected_options: set = None
+    message: str,
+    prompt_options: list | tuple,
+    selected_options: set = None,
+    category: str | None = None,
 ) -> str | int:
-    """Runs user prompt."""
-    time.sleep(2.2)
+    """Runs user prompt.
 
-    # Sets used to keep the selected_option values unique.
-    # Forces conversion of selected_options to a tuple.
-    # Code breaks otherwise when filtering out already chosen options.
-    if isinstance(selected_options, set):
-        selected_options = tuple(selected_options)
+    The category names the kind of decision being made (i.e 'skills'). It is
+    not shown to the user but lets headless policies tell prompts apart.
+
+    """
+    time.sleep(2.2)
 
     # Remove options that are already selected.
-    if isinstance(selected_options, (list, tuple)):
-        prompt_options = [o for o in prompt_options if o not in selected_options]
+    prompt_options = get_available_options(prompt_options, selected_options)
 
     prompt_options = {x + 1: y for x, y in enumerate(prompt_options)}
     message = "[P] " + message + "\n"
@@ -104,6 +108,7 @@ def prompt(
             f"Please try again...",
             prompt_options.values(),
             selected_options,
+            category,
         )
 
     try:
@@ -118,6 +123,7 @@ def prompt(
             f"Please try again...",
             prompt_options.values(),
             selected_options,
+            category,
         )
 
     user_selection = prompt_options[user_input]
@@ -1,17 +1,20 @@
 import logging
 
 from builder import _RulesetGuidelineBuilder
-from notifications import prompt
-from characters import RulesetReader
+from characters import PROFICIENCIES, RulesetReader
+from session import BuildSession
 
 log = logging.getLogger("thespian.parsers")
 
 
 class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
-    def __init__(self, feat: str, character_base: dict):
+    def __init__(
+        self, feat: str, character_base: dict, session: BuildSession | None = None
+    ):
         super(_RulesetGuidelineBuilder, self).__init__()
         self.feat = feat
         self.character_base = character_base
+        self.session = BuildSession() if session is None else session
 
     def _get_bonus_proficiencies_by_type(self, proficiency_class: str) -> list:
         return RulesetReader.get_feat_proficiencies(self.feat, proficiency_class)
@@ -64,6 +67,10 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
         feat_guidelines = dict()
 
         for guide_name, guide_options in raw_guidelines.items():
+            # Saving throws come with the 'scores' guideline's choice.
+            if guide_name == "savingthrows":
+                continue
+
             increment = guide_options["increment"]
             if increment < 0:
                 raise ValueError("Guideline 'increment' requires a positive value.")
@@ -79,17 +86,21 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
                     # If 'savingthrows' guideline specified.
                     # Add proficiency for ability saving throw.
                     if "savingthrows" not in raw_guidelines:
-                        my_ability = prompt(
+                        my_ability = self.session.policy(
                             "Choose an attribute to upgrade.",
                             options,
+                            category="feat_scores",
                         )
                     else:
-                        my_ability = prompt(
+                        my_ability = self.session.policy(
                             "Choose an attribute to upgrade.",
                             options,
                             self.character_base["savingthrows"],
+                            category="feat_scores",
+                        )
+                        feat_guidelines.setdefault("savingthrows", list()).append(
+                            my_ability
                         )
-                        feat_guidelines["savingthrows"].append(my_ability)
                 feat_guidelines[guide_name] = {my_ability: increment}
             elif guide_name == "speed":
                 feat_perks = RulesetReader.get_feat_perks(self.feat)
@@ -115,9 +126,7 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
                 # Non tuple options must have at least one option.
                 # Otherwise, warn and ignore the guideline.
                 if not isinstance(options, tuple) and increment < 1:
-                    logging.warning(
-                        "Invalid 'increment' parameter specified. Ignoring..."
-                    )
+                    log.warning("Invalid 'increment' parameter specified. Ignoring...")
                     continue
 
                 # List/dict options allow the user to choose what to append.
@@ -126,9 +135,15 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
                     selection_groups = tuple(options.keys())
 
                     # Create proficiency selection list from applicable groups.
+                    # Groups the character is already proficient in are skipped.
+                    proficient_mask = PROFICIENCIES.encode(
+                        proficiency_type, self.character_base[proficiency_type]
+                    )
                     proficiency_selections = []
                     for group in selection_groups:
-                        if group not in self.character_base[proficiency_type]:
+                        if not PROFICIENCIES.has(
+                            proficiency_type, proficient_mask, group
+                        ):
                             proficiency_selections += options[group]
 
                     # Replace guideline options with proficiency selections.
@@ -136,11 +151,15 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
                     options = proficiency_selections
                     options.sort()
 
+                # Work on a copy so the ruleset's option list is left intact.
+                options = list(options)
+
                 for increment_count in range(increment):
-                    my_bonus = prompt(
+                    my_bonus = self.session.policy(
                         f"Choose your bonus: '{guide_name} >> {proficiency_type}' ({increment_count + 1}):",
                         options,
                         self.character_base[proficiency_type],
+                        category=f"feat_{proficiency_type}",
                     )
 
                     # Handle user's selections.
@@ -155,9 +174,10 @@ class FeatGuidelineBuilder(_RulesetGuidelineBuilder):
                     if not isinstance(spell, list):
                         continue
 
-                    my_spell = prompt(
+                    my_spell = self.session.policy(
                         f"Choose your spell:",
                         spell,
+                        category="feat_spells",
                     )
 
                     # Handle user's spell selections
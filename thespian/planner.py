@@ -0,0 +1,358 @@
+from dataclasses import dataclass
+import logging
+from typing import Callable
+
+from attributes import ABILITIES
+from characters import RulesetReader
+from progression import get_class_progression, get_spell_list
+from spells import SPELLCASTING
+from tweaks import get_number_of_upgrades, has_feat_requirements
+
+log = logging.getLogger("thespian.planner")
+
+
+@dataclass(frozen=True)
+class ChoicePoint:
+    """Class to describe one decision a character build will ask for.
+
+    The message and category match the prompt the generator will issue. The
+    options are known ahead of time; already granted values are excluded. If
+    the option set or the increment depends on the answers given to earlier
+    choice points, depends_on lists their indexes. An empty option set or an
+    increment of None means it can only be determined while building.
+
+    """
+
+    index: int
+    stage: str
+    category: str
+    message: str
+    options: tuple
+    increment: int | None
+    depends_on: tuple = ()
+
+
+class _PlanCompiler:
+    """Class to statically walk the generation stages of a build."""
+
+    def __init__(self):
+        self.granted = dict()
+        self.points = list()
+
+    def add(
+        self,
+        stage: str,
+        category: str,
+        message: str,
+        options: tuple,
+        increment: int | None,
+        depends_on: tuple = (),
+    ) -> ChoicePoint:
+        """Appends a choice point to the plan."""
+        point = ChoicePoint(
+            len(self.points), stage, category, message, options, increment, depends_on
+        )
+        self.points.append(point)
+        return point
+
+    def add_guidelines(self, stage: str, entry: dict) -> None:
+        """Adds the choice points of an entry's guideline string."""
+        guideline_string = entry["guides"]
+        if guideline_string is None or guideline_string == "":
+            return
+
+        for guide_pair_string in guideline_string.split("|"):
+            guideline, guide_increment = guide_pair_string.split(",")
+            guide_increment = int(guide_increment)
+
+            # Guidelines without a matching entry have nothing to choose from.
+            if guideline not in entry:
+                log.warning(f"Guideline '{guideline}' has no {stage} options.")
+                continue
+
+            if guideline == "ancestry":
+                if guide_increment == 1:
+                    self.add(
+                        stage,
+                        guideline,
+                        "Choose your racial ancestry.",
+                        tuple(entry[guideline]),
+                        1,
+                    )
+                continue
+            elif guideline == "bonus":
+                options = tuple(k for k, v in entry[guideline].items() if v < 2)
+                if guide_increment > 0:
+                    self.add(
+                        stage,
+                        guideline,
+                        "Choose your racial bonus.",
+                        options,
+                        guide_increment,
+                    )
+                continue
+
+            granted = self.granted.setdefault(guideline, set())
+
+            # Guidelines with a 0 increment add ALL values by default.
+            if guide_increment == 0:
+                if guideline != "spells":
+                    granted.update(_flatten(entry[guideline]))
+                continue
+
+            options = list()
+            for option in entry[guideline]:
+                if isinstance(option, list):
+                    granted.update(option)
+                else:
+                    options.append(option)
+
+            self.add(
+                stage,
+                guideline,
+                f"Make a selection from the '{guideline}' options.",
+                tuple(o for o in options if o not in granted),
+                guide_increment,
+                tuple(p.index for p in self.points if p.category == guideline),
+            )
+
+    def add_primary_abilities(self, class_base: dict) -> None:
+        """Adds the choice points of a class's primary/secondary abilities."""
+        ranking = ("primary", "secondary")
+        for index, options in enumerate(class_base["primary_ability"].values()):
+            if isinstance(options, list):
+                self.add(
+                    "class",
+                    "primary_ability",
+                    f"{ranking[index].capitalize()}: Choose a {ranking[index]} "
+                    "class attribute.",
+                    tuple(options),
+                    1,
+                )
+
+    def add_spells(self, klass: str, level: int) -> None:
+        """Adds the choice points of a class's cantrips and spells.
+
+        Spells the character gets from elsewhere are only excluded while
+        building, so every spell of the class's lists is an option here. The
+        number of spells a class prepares depends on its ability scores, so
+        is only known while building.
+
+        """
+        spellcasting = SPELLCASTING.get(klass)
+        if spellcasting is None:
+            return
+
+        spell_slots = get_class_progression(klass).spell_slots[level]
+        max_spell_level = spellcasting.get_max_spell_level(level, spell_slots)
+        cantrips = _get_spell_options(klass, range(0, 1))
+        if spellcasting.cantrips[level] != 0 and len(cantrips) != 0:
+            self.add(
+                "spells",
+                "cantrips",
+                "Choose a cantrip.",
+                cantrips,
+                min(spellcasting.cantrips[level], len(cantrips)),
+            )
+
+        spells = _get_spell_options(klass, range(1, max_spell_level + 1))
+        if len(spells) != 0:
+            increment = None
+            if len(spellcasting.spells_known) != 0:
+                increment = min(spellcasting.spells_known[level], len(spells))
+            self.add("spells", "spells", "Choose a spell.", spells, increment)
+
+    def add_upgrades(self, klass: str, level: int, character: dict) -> None:
+        """Adds the choice points of the ability score improvements.
+
+        Feats are offered if the character, as far as it is known ahead of
+        time, meets their requirements; the same checks as the tweak stage.
+
+        """
+        if level < 4:
+            return
+
+        upgrades_available = get_number_of_upgrades(klass, level)
+        feats = tuple(
+            feat
+            for feat in RulesetReader.get_all_feats()
+            if has_feat_requirements(feat, character)
+        )
+        while upgrades_available > 0:
+            upgrade = self.add(
+                "tweak",
+                "upgrade",
+                f"What would you like to upgrade? ({upgrades_available})",
+                ("Ability", "Feat"),
+                1,
+            )
+            bonus = self.add(
+                "tweak",
+                "upgrade_bonus",
+                "Apply how many points to your attribute?",
+                ("1", "2"),
+                1,
+                (upgrade.index,),
+            )
+            self.add(
+                "tweak",
+                "upgrade_ability",
+                "Apply a +1/+2 to which attribute?",
+                ABILITIES,
+                None,
+                (upgrade.index, bonus.index),
+            )
+            feat = self.add(
+                "tweak",
+                "feat",
+                "Which feat do you want to acquire?",
+                feats,
+                1,
+                (upgrade.index,),
+            )
+            self.add(
+                "tweak",
+                "feat_options",
+                "Make the selections for your new feat.",
+                (),
+                None,
+                (upgrade.index, feat.index),
+            )
+            upgrades_available -= 1
+
+
+def _flatten(values: object) -> list:
+    """Flattens nested option lists."""
+    if isinstance(values, (list, tuple)):
+        flattened = list()
+        for value in values:
+            flattened += _flatten(value)
+        return flattened
+    elif isinstance(values, dict):
+        return _flatten(list(values.values()))
+
+    return [values]
+
+
+def _get_spell_options(klass: str, spell_levels: range) -> tuple:
+    """Returns a class's spells of spell_levels, sorted within each level."""
+    options = list()
+    for spell_level in spell_levels:
+        spell_list = get_spell_list(klass, spell_level)
+        options += [spell_list[k] for k in sorted(spell_list)]
+    return tuple(options)
+
+
+def _get_granted(entries: list, guideline: str) -> list:
+    """Returns the values of a guideline that entries grant without a choice."""
+    granted = list()
+    for entry in entries:
+        increments = dict(
+            g.split(",") for g in (entry["guides"] or "").split("|") if g != ""
+        )
+        if int(increments.get(guideline, 0)) == 0:
+            granted += _flatten(entry[guideline])
+    return granted
+
+
+def plan_build(
+    race: str, subrace: str, klass: str, subclass: str, background: str, level: int
+) -> list:
+    """Returns every choice point of a build, in the order they are prompted."""
+    race_base = RulesetReader.get_entry_race(race)
+    if race_base is None:
+        raise ValueError(f"Unknown player race '{race}'.")
+
+    class_base = RulesetReader.get_entry_class(klass)
+    if class_base is None:
+        raise ValueError(f"Unknown player class '{klass}'.")
+
+    background_base = RulesetReader.get_entry_background(background)
+    if background_base is None:
+        raise ValueError(f"Unknown background '{background}'.")
+
+    compiler = _PlanCompiler()
+    compiler.add_guidelines("race", race_base)
+    entries = [race_base, class_base]
+
+    if subrace != "":
+        subrace_base = RulesetReader.get_entry_subrace(subrace)
+        if subrace_base is None:
+            raise ValueError(f"Unknown player subrace '{subrace}'.")
+        compiler.add_guidelines("subrace", subrace_base)
+        entries.append(subrace_base)
+
+    compiler.add_guidelines("background", background_base)
+    compiler.add_primary_abilities(class_base)
+    compiler.add_guidelines("class", class_base)
+
+    if subclass != "":
+        subclass_base = RulesetReader.get_entry_subclass(subclass)
+        if subclass_base is None:
+            raise ValueError(f"Unknown player subclass '{subclass}'.")
+        compiler.add_guidelines("subclass", subclass_base)
+        entries.append(subclass_base)
+
+    # What is known of the character ahead of time, for feat requirements.
+    character = {
+        "armors": _get_granted(entries, "armors"),
+        "feats": list(),
+        "klass": klass,
+        "race": race,
+        "spell_slots": get_class_progression(klass).spell_slots[level],
+        "subrace": subrace,
+        "weapons": _get_granted(entries, "weapons"),
+    }
+    compiler.add_upgrades(klass, level, character)
+    compiler.add_spells(klass, level)
+    return compiler.points
+
+
+def resolve_plan(plan: list, policy: Callable) -> dict:
+    """Answers a build plan up front, returning answers by prompt category.
+
+    The answers can be handed to policies.ScriptedPolicy to run the build
+    without any further decisions. Choices that can only be made while building
+    (i.e feat specific options, prepared spells) are left to the scripted
+    policy's fallback.
+
+    """
+    answers = dict()
+    selected = dict()
+    upgrade = bonus = None
+
+    for point in plan:
+        if point.category == "upgrade_bonus" and upgrade != "Ability":
+            continue
+        elif point.category == "upgrade_ability" and upgrade != "Ability":
+            continue
+        elif point.category == "feat" and upgrade != "Feat":
+            continue
+        elif point.category != "upgrade_ability" and point.increment is None:
+            continue
+
+        increment = point.increment
+        if point.category == "upgrade_ability":
+            increment = 2 if bonus == 1 else 1
+
+        category_answers = answers.setdefault(point.category, list())
+        category_selected = selected.setdefault(point.category, set())
+
+        # Per upgrade selections do not exclude the previous upgrade's answers.
+        if point.stage == "tweak" and point.category != "feat":
+            category_selected = set()
+
+        for _ in range(increment):
+            answer = policy(
+                point.message, point.options, category_selected, point.category
+            )
+            category_answers.append(answer)
+            if point.category not in ("bonus", "upgrade"):
+                category_selected.add(answer)
+
+        if point.category == "upgrade":
+            upgrade = category_answers[-1]
+        elif point.category == "upgrade_bonus":
+            bonus = category_answers[-1]
+
+    return answers
@@ -0,0 +1,99 @@
+from abc import ABC, abstractmethod
+from collections import deque
+import random
+from typing import Callable
+
+
+class _ChoicePolicy(ABC):
+    """Class base for headless prompt policies.
+
+    A policy is called exactly like notifications.prompt and returns one of the
+    available options without any terminal I/O.
+
+    """
+
+    def __call__(
+        self,
+        message: str,
+        prompt_options: list | tuple,
+        selected_options: set = None,
+        category: str | None = None,
+    ) -> str | int:
+        options = get_available_options(prompt_options, selected_options)
+        if len(options) == 0:
+            raise ValueError(f"No options available for prompt '{message}'.")
+
+        selection = self.choose(message, options, category)
+        if isinstance(selection, str) and selection.isnumeric():
+            return int(selection)
+
+        return selection
+
+    @abstractmethod
+    def choose(self, message: str, options: list, category: str | None) -> str:
+        """Returns one of the available options."""
+
+
+class FirstOptionPolicy(_ChoicePolicy):
+    """Class to always choose the first available option."""
+
+    def choose(self, message: str, options: list, category: str | None) -> str:
+        return options[0]
+
+
+class RandomPolicy(_ChoicePolicy):
+    """Class to choose available options at random."""
+
+    def __init__(self, rng: random.Random | None = None):
+        self.rng = random.Random() if rng is None else rng
+
+    def choose(self, message: str, options: list, category: str | None) -> str:
+        return self.rng.choice(options)
+
+    def fork(self) -> "RandomPolicy":
+        """Returns a policy with a random stream of its own, split off this one's."""
+        return RandomPolicy(random.Random(self.rng.getrandbits(64)))
+
+
+class ScriptedPolicy:
+    """Class to answer prompts from answers collected ahead of time.
+
+    Answers are consumed in order per prompt category. If a category has no
+    answers left, or its next answer is not an available option, the fallback
+    policy decides instead.
+
+    """
+
+    def __init__(self, answers: dict, fallback: Callable):
+        self.answers = {k: deque(v) for k, v in answers.items()}
+        self.fallback = fallback
+
+    def __call__(
+        self,
+        message: str,
+        prompt_options: list | tuple,
+        selected_options: set = None,
+        category: str | None = None,
+    ) -> str | int:
+        queue = self.answers.get(category)
+        if queue:
+            answer = queue.popleft()
+            options = get_available_options(prompt_options, selected_options)
+            for option in options:
+                if option == answer or str(option) == str(answer):
+                    if isinstance(option, str) and option.isnumeric():
+                        return int(option)
+                    return option
+
+        return self.fallback(message, prompt_options, selected_options, category)
+
+
+def get_available_options(
+    prompt_options: list | tuple, selected_options: set = None
+) -> list:
+    """Returns prompt options that have not already been selected."""
+    if isinstance(selected_options, (frozenset, list, set, tuple)):
+        selected_options = frozenset(selected_options)
+        return [o for o in prompt_options if o not in selected_options]
+
+    return list(prompt_options)
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import logging
+from types import MappingProxyType
+
+from characters import RulesetReader, normalize_spell_name
+from tweaks import get_number_of_upgrades
+
+log = logging.getLogger("thespian.progression")
+
+LEVELS = range(0, 21)
+
+# Most compiled tables (and spell indexes) kept. Every ruleset version compiles
+# its own, so reloads and overlays would otherwise keep adding to the caches.
+PROGRESSION_CACHE_SIZE = 1024
+SPELL_INDEX_CACHE_SIZE = 16
+
+
+@dataclass(frozen=True)
+class ClassProgression:
+    """Class to hold a class's compiled per level progression.
+
+    Every tuple is indexed by character level (0-20).
+
+    """
+
+    klass: str
+    hit_die: int
+    spell_slots: tuple
+    upgrades: tuple
+
+
+@dataclass(frozen=True)
+class SubclassProgression:
+    """Class to hold a subclass's compiled per level progression.
+
+    Every tuple is indexed by character level (0-20).
+
+    """
+
+    subclass: str
+    bonus_magic: tuple
+
+
+def get_class_progression(klass: str) -> ClassProgression:
+    """Compiles (once) the progression table for a class."""
+    return _compile_class_progression(klass, RulesetReader.version("classes"))
+
+
+def get_subclass_progression(subclass: str) -> SubclassProgression:
+    """Compiles (once) the progression table for a subclass."""
+    return _compile_subclass_progression(
+        subclass, RulesetReader.version("subclasses")
+    )
+
+
+def get_racial_spell_progression(race: str) -> tuple:
+    """Compiles (once) the level indexed racial/subracial spell table."""
+    return _compile_racial_spell_progression(
+        race, RulesetReader.version("races"), RulesetReader.version("subraces")
+    )
+
+
+def warm_progressions() -> None:
+    """Compiles the progression tables and spell lists of the active rules."""
+    for klass in RulesetReader.get_all_classes():
+        get_class_progression(klass)
+    for subclass in RulesetReader.get_all_subclasses():
+        get_subclass_progression(subclass)
+    for race in RulesetReader.get_all_races() + RulesetReader.get_all_subraces():
+        get_racial_spell_progression(race)
+    _compile_spell_index(RulesetReader.version("spell_lists"))
+
+
+def get_spell_list(klass: str, spell_level: int) -> MappingProxyType:
+    """Returns (once compiled) a class's spell list for a spell level.
+
+    Spells are keyed by their normalized names, so they can be compared with
+    spells from other sources (i.e racial spells) using set operations.
+
+    """
+    index = _compile_spell_index(RulesetReader.version("spell_lists"))
+    return index.get((klass, spell_level), _EMPTY_SPELL_LIST)
+
+
+def get_spell_slots(spell_slots: str) -> tuple:
+    """Returns the slots per spell level (1st level first) of a slots string."""
+    return _compile_spell_slots(spell_slots)
+
+
+_EMPTY_SPELL_LIST = MappingProxyType(dict())
+
+
+# Compiled tables are cached per category version, so each ruleset gets its own.
+@lru_cache(maxsize=PROGRESSION_CACHE_SIZE)
+def _compile_class_progression(klass: str, version: str) -> ClassProgression:
+    class_base = RulesetReader.get_entry_class(klass)
+    if class_base is None:
+        raise ValueError(f"Unknown player class '{klass}'.")
+
+    spell_slots = class_base["spell_slots"]
+    return ClassProgression(
+        klass=klass,
+        hit_die=int(class_base["hit_die"]),
+        spell_slots=tuple(spell_slots.get(l, "0") for l in LEVELS),
+        upgrades=tuple(get_number_of_upgrades(klass, l) for l in LEVELS),
+    )
+
+
+@lru_cache(maxsize=PROGRESSION_CACHE_SIZE)
+def _compile_subclass_progression(subclass: str, version: str) -> SubclassProgression:
+    subclass_base = RulesetReader.get_entry_subclass(subclass)
+    if subclass_base is None:
+        raise ValueError(f"Unknown player subclass '{subclass}'.")
+
+    bonus_magic = subclass_base["bonus_magic"]
+    return SubclassProgression(
+        subclass=subclass,
+        bonus_magic=tuple(tuple(bonus_magic.get(l, ())) for l in LEVELS),
+    )
+
+
+@lru_cache(maxsize=PROGRESSION_CACHE_SIZE)
+def _compile_racial_spell_progression(
+    race: str, race_version: str, subrace_version: str
+) -> tuple:
+    race_base = RulesetReader.get_entry_race(race)
+    if race_base is None:
+        race_base = RulesetReader.get_entry_subrace(race)
+    if race_base is None:
+        raise ValueError(f"Unknown player race/subrace '{race}'.")
+
+    # List type spell entries are granted in full at level one.
+    spells = race_base["spells"]
+    if isinstance(spells, list):
+        spells = {1: spells}
+
+    return tuple(tuple(spells.get(l, ())) for l in LEVELS)
+
+
+@lru_cache(maxsize=SPELL_INDEX_CACHE_SIZE)
+def _compile_spell_index(version: str) -> dict:
+    index = dict()
+    for klass, spell_list in RulesetReader.get_spell_lists().items():
+        for spell_level, spells in spell_list.items():
+            if len(spells) != 0:
+                index[(klass, spell_level)] = MappingProxyType(
+                    {normalize_spell_name(s): s for s in spells}
+                )
+    return index
+
+
+@lru_cache(maxsize=PROGRESSION_CACHE_SIZE)
+def _compile_spell_slots(spell_slots: str) -> tuple:
+    # Slot strings list the slots of each spell level, i.e "4,2" or "0".
+    slots = tuple(int(s) for s in spell_slots.split(","))
+    return () if slots == (0,) else slots
@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import heapq
+from itertools import product
+import logging
+
+from attributes import ABILITIES, get_expected_scores
+from characters import RulesetReader
+
+log = logging.getLogger("thespian.recommender")
+
+# Most recommendation matrices kept, one per ruleset version.
+RECOMMENDATION_MATRIX_CACHE_SIZE = 8
+# Most weight vectors each matrix keeps ranked.
+RANK_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class Recommendation:
+    """Class to describe one recommended race and class pair.
+
+    The primary abilities are the class's best primary/secondary ability
+    choices for the weights the pair was ranked with.
+
+    """
+
+    race: str
+    subrace: str
+    klass: str
+    primary_abilities: tuple
+    score: float
+
+
+class RecommendationMatrix:
+    """Class to rank race/subrace and class pairs by weighted ability scores.
+
+    Expected scores are the racial bonuses plus the exact expected scores
+    AttributeGenerator assigns for a class's primary abilities. A pair's score
+    is the weighted sum of its expected scores, which splits into a race score
+    and a class score: the matrix of every pair is their outer sum. Ranking
+    only needs the row and column score vectors, from which the top pairs are
+    taken with a heap.
+
+    """
+
+    def __init__(self):
+        # Concepts are ranked once, so repeated queries only walk the heap. The
+        # cache is the matrix's own, and is dropped with it.
+        self._rank = lru_cache(maxsize=RANK_CACHE_SIZE)(self._get_ranking)
+
+        # Rows: every race (or subrace of a race with subraces).
+        self.races = list()
+        self.bonuses = list()
+        self.bonus_choices = list()
+        for race in RulesetReader.get_all_races():
+            for subrace in RulesetReader.get_all_subraces(race) or ("",):
+                bonus, choices, count = get_race_bonus_options(race, subrace)
+                self.races.append((race, subrace))
+                self.bonuses.append(bonus)
+                self.bonus_choices.append((choices, count))
+
+        # Columns: every class, with one expected score vector per way of
+        # choosing its primary/secondary abilities.
+        self.classes = list()
+        self.expected_scores = list()
+        for klass in RulesetReader.get_all_classes():
+            class_base = RulesetReader.get_entry_class(klass)
+            primaries = get_primary_ability_options(class_base)
+            self.classes.append((klass, primaries))
+            self.expected_scores.append(
+                tuple(
+                    tuple(get_expected_scores(p, dict()).values()) for p in primaries
+                )
+            )
+
+    def get_class_scores(self, weights: tuple) -> list:
+        """Returns each class's best score, and its primary abilities."""
+        scores = list()
+        for (_, primaries), expected_scores in zip(self.classes, self.expected_scores):
+            scores.append(
+                max(
+                    (_dot(weights, e), p)
+                    for e, p in zip(expected_scores, primaries)
+                )
+            )
+        return scores
+
+    def get_race_scores(self, weights: tuple) -> list:
+        """Returns each race's score, choosing its bonus choices best."""
+        scores = list()
+        for bonus, (choices, count) in zip(self.bonuses, self.bonus_choices):
+            chosen = heapq.nlargest(count, (weights[c] for c in choices))
+            scores.append(_dot(weights, bonus) + sum(chosen))
+        return scores
+
+    def get_scores(self, weights: dict) -> list:
+        """Returns the (races x classes) matrix of pair scores."""
+        weights = get_weight_vector(weights)
+        class_scores = [s for s, _ in self.get_class_scores(weights)]
+        return [
+            [r + c for c in class_scores] for r in self.get_race_scores(weights)
+        ]
+
+    def recommend(self, weights: dict, k: int = 10) -> list:
+        """Returns the k best race and class pairs for ability weights."""
+        race_scores, class_scores, rows, columns = self._rank(
+            get_weight_vector(weights)
+        )
+        if len(rows) == 0 or len(columns) == 0:
+            return list()
+
+        def get_score(row: int, column: int) -> float:
+            return race_scores[rows[row]] + class_scores[columns[column]][0]
+
+        # Both axes are sorted, so the next best pair is always next to a pair
+        # already taken: walk outwards from the best one with a max heap.
+        recommendations = list()
+        frontier = [(-get_score(0, 0), 0, 0)]
+        visited = {(0, 0)}
+        while frontier and len(recommendations) < k:
+            score, row, column = heapq.heappop(frontier)
+            race, subrace = self.races[rows[row]]
+            klass, _ = self.classes[columns[column]]
+            recommendations.append(
+                Recommendation(
+                    race, subrace, klass, class_scores[columns[column]][1], -score
+                )
+            )
+            for next_row, next_column in ((row + 1, column), (row, column + 1)):
+                if (
+                    next_row < len(rows)
+                    and next_column < len(columns)
+                    and (next_row, next_column) not in visited
+                ):
+                    visited.add((next_row, next_column))
+                    heapq.heappush(
+                        frontier,
+                        (-get_score(next_row, next_column), next_row, next_column),
+                    )
+
+        return recommendations
+
+    def _get_ranking(self, weights: tuple) -> tuple:
+        """Returns the race and class scores, and both axes sorted by score."""
+        race_scores = self.get_race_scores(weights)
+        class_scores = self.get_class_scores(weights)
+        rows = sorted(range(len(race_scores)), key=lambda i: -race_scores[i])
+        columns = sorted(range(len(class_scores)), key=lambda i: -class_scores[i][0])
+        return race_scores, class_scores, rows, columns
+
+
+def get_primary_ability_options(class_base: dict) -> tuple:
+    """Returns every way of choosing a class's primary/secondary abilities."""
+    options = [
+        a if isinstance(a, list) else [a]
+        for a in class_base["primary_ability"].values()
+    ]
+    return tuple(p for p in product(*options) if len(set(p)) == len(p))
+
+
+def get_race_bonus_options(race: str, subrace: str = "") -> tuple:
+    """Returns the bonus vector, bonus choices and number of choices of a race.
+
+    A subrace's bonuses are added to its race's, as builds fuse them.
+
+    """
+    bonus, choices, count = get_racial_bonus_options(
+        RulesetReader.get_entry_race(race)
+    )
+    if subrace != "":
+        subrace_bonus, subrace_choices, subrace_count = get_racial_bonus_options(
+            RulesetReader.get_entry_subrace(subrace)
+        )
+        bonus = tuple(a + b for a, b in zip(bonus, subrace_bonus))
+        choices = tuple(sorted(set(choices + subrace_choices)))
+        count += subrace_count
+    return bonus, choices, count
+
+
+def get_racial_bonus_options(entry: dict) -> tuple:
+    """Returns a race's fixed bonus vector, bonus choices and number of choices.
+
+    Choices are ABILITIES indexes; each choice made adds 1 to that ability.
+
+    """
+    bonus = entry["bonus"]
+    count = 0
+    for guide_pair_string in (entry["guides"] or "").split("|"):
+        guideline, _, guide_increment = guide_pair_string.partition(",")
+        if guideline == "bonus":
+            count = int(guide_increment)
+
+    # As in honor_guidelines: with a bonus guideline, values below 2 are choices.
+    if count == 0:
+        return tuple(bonus.get(a, 0) for a in ABILITIES), (), 0
+
+    fixed = tuple(bonus.get(a, 0) if bonus.get(a, 0) > 1 else 0 for a in ABILITIES)
+    choices = tuple(i for i, a in enumerate(ABILITIES) if a in bonus and bonus[a] < 2)
+    return fixed, choices, count
+
+
+def get_recommendation_matrix() -> RecommendationMatrix:
+    """Returns (once built) the recommendation matrix of the active rules."""
+    return _compile_recommendation_matrix(
+        RulesetReader.version("races"),
+        RulesetReader.version("subraces"),
+        RulesetReader.version("classes"),
+    )
+
+
+def get_weight_vector(weights: dict) -> tuple:
+    """Returns ability weights as a tuple in ABILITIES order."""
+    for ability in weights:
+        if ability not in ABILITIES:
+            raise ValueError(f"Unknown ability '{ability}'.")
+    return tuple(float(weights.get(a, 0)) for a in ABILITIES)
+
+
+def parse_weights(weight_string: str) -> dict:
+    """Parses ability weights (i.e "Dexterity=2,Wisdom=1" or "dex=2,wis")."""
+    weights = dict()
+    for pair in weight_string.split(","):
+        ability, _, weight = pair.partition("=")
+        ability = ability.strip().capitalize()
+        # Abbreviations (i.e "Dex") name the ability they start.
+        for name in ABILITIES:
+            if len(ability) >= 3 and name.startswith(ability):
+                ability = name
+        try:
+            weights[ability] = float(weight) if weight != "" else 1.0
+        except ValueError:
+            raise ValueError(f"Invalid weight for ability '{ability}'.")
+    get_weight_vector(weights)
+    return weights
+
+
+def recommend(weights: dict, k: int = 10) -> list:
+    """Returns the k best race and class pairs for ability weights."""
+    return get_recommendation_matrix().recommend(weights, k)
+
+
+def _dot(weights: tuple, scores: tuple) -> float:
+    return sum(w * s for w, s in zip(weights, scores))
+
+
+@lru_cache(maxsize=RECOMMENDATION_MATRIX_CACHE_SIZE)
+def _compile_recommendation_matrix(
+    race_version: str, subrace_version: str, class_version: str
+) -> RecommendationMatrix:
+    return RecommendationMatrix()
@@ -0,0 +1,102 @@
+from collections import deque
+import json
+import logging
+from typing import Callable
+import zlib
+
+from policies import get_available_options
+
+log = logging.getLogger("thespian.replay")
+
+REPLAY_FORMAT_VERSION = 1
+
+
+class DecisionRecorder:
+    """Class to record every decision made by a prompt policy.
+
+    Each decision is stored as (category, option set digest, chosen value).
+    The build's seed is saved with them, so a replay can reproduce the build's
+    random draws too.
+
+    """
+
+    def __init__(self, policy: Callable, seed: int | None = None):
+        self.policy = policy
+        self.decisions = list()
+        self.seed = seed
+
+    def __call__(
+        self,
+        message: str,
+        prompt_options: list | tuple,
+        selected_options: set = None,
+        category: str | None = None,
+    ) -> str | int:
+        options = get_available_options(prompt_options, selected_options)
+        selection = self.policy(message, prompt_options, selected_options, category)
+        self.decisions.append((category, get_options_digest(options), selection))
+        return selection
+
+    def save(self, path: str) -> None:
+        """Writes the recorded decisions to a replay file."""
+        with open(path, "w", encoding="utf-8") as replay_file:
+            json.dump(
+                {
+                    "version": REPLAY_FORMAT_VERSION,
+                    "seed": self.seed,
+                    "decisions": self.decisions,
+                },
+                replay_file,
+                separators=(",", ":"),
+            )
+
+
+class ReplayPolicy:
+    """Class to answer prompts from recorded decisions.
+
+    Decisions are replayed in order per prompt category. If the prompt's
+    option set no longer matches the recorded one, or no decisions are left,
+    the fallback policy decides instead. The seed is the recorded build's, if
+    it was saved.
+
+    """
+
+    def __init__(self, decisions: list, fallback: Callable, seed: int | None = None):
+        self.decisions = dict()
+        for category, digest, selection in decisions:
+            self.decisions.setdefault(category, deque()).append((digest, selection))
+        self.fallback = fallback
+        self.seed = seed
+
+    def __call__(
+        self,
+        message: str,
+        prompt_options: list | tuple,
+        selected_options: set = None,
+        category: str | None = None,
+    ) -> str | int:
+        queue = self.decisions.get(category)
+        if queue:
+            digest, selection = queue.popleft()
+            options = get_available_options(prompt_options, selected_options)
+            if digest == get_options_digest(options):
+                return selection
+            log.warning(f"Options for '{category}' changed. Using fallback policy.")
+
+        return self.fallback(message, prompt_options, selected_options, category)
+
+    @classmethod
+    def load(cls, path: str, fallback: Callable):
+        """Loads recorded decisions from a replay file."""
+        with open(path, encoding="utf-8") as replay_file:
+            replay = json.load(replay_file)
+
+        if replay.get("version") != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay file version in '{path}'.")
+
+        return cls(replay["decisions"], fallback, replay.get("seed"))
+
+
+def get_options_digest(options: list) -> int:
+    """Returns a short checksum that identifies an option set."""
+    return zlib.crc32("\x1f".join(str(o) for o in options).encode("utf-8"))
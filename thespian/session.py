@@ -0,0 +1,42 @@
+from copy import copy
+import random
+from typing import Callable
+
+from characters import get_active_ruleset
+from notifications import PromptRecorder, prompt
+
+
+class BuildSession:
+    """Class to carry the state of a single character build.
+
+    A session owns the prompt recorder, the random number generator and the
+    policy that makes the build's choices. Nothing is shared between sessions,
+    so separate builds never see each other's selections. The ruleset active
+    when the session is created is the one the build uses throughout.
+
+    """
+
+    def __init__(
+        self, policy: Callable = prompt, seed: int | None = None, verbose: bool = True
+    ):
+        self.policy = policy
+        self.recorder = PromptRecorder()
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.verbose = verbose
+        self.ruleset = get_active_ruleset()
+
+    def fork(self) -> "BuildSession":
+        """Returns a session with random streams of its own, split off this one's.
+
+        The fork shares this session's recorder and ruleset. Policies that have
+        random streams (i.e RandomPolicy) are forked too; other policies (i.e
+        prompt or scripted answers) are shared.
+
+        """
+        session = copy(self)
+        session.rng = random.Random(self.rng.getrandbits(64))
+        fork_policy = getattr(self.policy, "fork", None)
+        if fork_policy is not None:
+            session.policy = fork_policy()
+        return session
@@ -0,0 +1,62 @@
+from collections.abc import Mapping
+
+from characters import Ruleset, use_ruleset
+
+
+class CharacterSheet(Mapping):
+    """Class to compute a character's derived fields on first access.
+
+    If a ruleset is given, fields are computed with it active.
+
+    """
+
+    def __init__(
+        self,
+        blueprint: dict,
+        builders: dict,
+        fields: tuple | None = None,
+        ruleset: Ruleset | None = None,
+    ):
+        self.blueprint = blueprint
+        self.builders = builders
+        self.fields = tuple(builders.keys()) if fields is None else tuple(fields)
+        self.ruleset = ruleset
+        self._cache = dict()
+
+        for field in self.fields:
+            if field not in builders:
+                raise ValueError(f"Unknown character field '{field}'.")
+
+    def __getitem__(self, field: str) -> object:
+        if field not in self.fields:
+            raise KeyError(field)
+
+        try:
+            return self._cache[field]
+        except KeyError:
+            pass
+
+        if self.ruleset is None:
+            value = self.builders[field](self.blueprint)
+        else:
+            with use_ruleset(self.ruleset):
+                value = self.builders[field](self.blueprint)
+        self._cache[field] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.fields)
+
+    def __len__(self) -> int:
+        return len(self.fields)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.to_dict()!r})"
+
+    def invalidate(self) -> None:
+        """Drops cached fields so they are rebuilt from the blueprint."""
+        self._cache.clear()
+
+    def to_dict(self) -> dict:
+        """Returns all selected fields as a plain dictionary."""
+        return {field: self[field] for field in self.fields}
@@ -0,0 +1,173 @@
+from dataclasses import dataclass
+import logging
+
+from attributes import get_ability_modifier
+from characters import normalize_spell_name
+from progression import get_spell_list, get_spell_slots
+from session import BuildSession
+
+log = logging.getLogger("thespian.spells")
+
+
+@dataclass(frozen=True)
+class Spellcasting:
+    """Class to describe how a spellcasting class gains its spells.
+
+    Every tuple is indexed by character level (0-20). A class with a spells
+    known table learns that many spells. Any other class prepares its ability
+    modifier plus its level divided by level_divisor (at least one) spells.
+    Pact magic slots are all of the same level, given by slot_levels.
+
+    """
+
+    ability: str
+    cantrips: tuple
+    spells_known: tuple = ()
+    level_divisor: int = 1
+    slot_levels: tuple = ()
+
+    def get_max_spell_level(self, level: int, spell_slots: str) -> int:
+        """Returns the highest spell level the character has slots for."""
+        if len(self.slot_levels) != 0:
+            return self.slot_levels[level]
+        return len(get_spell_slots(spell_slots))
+
+    def get_spells_count(self, level: int, spell_slots: str, scores: dict) -> int:
+        """Returns the number of spells the character knows or prepares."""
+        if self.get_max_spell_level(level, spell_slots) == 0:
+            return 0
+        if len(self.spells_known) != 0:
+            return self.spells_known[level]
+        modifier = get_ability_modifier(self.ability, scores)
+        return max(1, modifier + level // self.level_divisor)
+
+
+def _get_cantrips_table(count: int, *levels: int) -> tuple:
+    """Returns a cantrips known table, gaining one cantrip at each of levels."""
+    return tuple(
+        0 if l == 0 else count + sum(l >= n for n in levels) for l in range(0, 21)
+    )
+
+
+_NO_CANTRIPS = (0,) * 21
+
+# The classes that choose spells from their class spell lists. Fighters and
+# Rogues only cast through a subclass (and the Wizard's list), so are left out.
+SPELLCASTING = {
+    "Artificer": Spellcasting(
+        "Intelligence", _get_cantrips_table(2, 10, 14), level_divisor=2
+    ),
+    "Bard": Spellcasting(
+        "Charisma",
+        _get_cantrips_table(2, 4, 10),
+        (0, 4, 5, 6, 7, 8, 9, 10, 11, 12, 14, 15, 15, 16, 18, 19, 19, 20, 22, 22, 22),
+    ),
+    "Cleric": Spellcasting("Wisdom", _get_cantrips_table(3, 4, 10)),
+    "Druid": Spellcasting("Wisdom", _get_cantrips_table(2, 4, 10)),
+    "Paladin": Spellcasting("Charisma", _NO_CANTRIPS, level_divisor=2),
+    "Ranger": Spellcasting(
+        "Wisdom",
+        _NO_CANTRIPS,
+        (0, 0, 2, 3, 3, 4, 4, 5, 5, 6, 6, 7, 7, 8, 8, 9, 9, 10, 10, 11, 11),
+    ),
+    "Sorcerer": Spellcasting(
+        "Charisma",
+        _get_cantrips_table(4, 4, 10),
+        (0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12, 12, 13, 13, 14, 14, 15, 15, 15, 15),
+    ),
+    "Warlock": Spellcasting(
+        "Charisma",
+        _get_cantrips_table(2, 4, 10),
+        (0, 2, 3, 4, 5, 6, 7, 8, 9, 10, 10, 11, 11, 12, 12, 13, 13, 14, 14, 15, 15),
+        slot_levels=(0, 1, 1, 2, 2, 3, 3, 4, 4) + (5,) * 12,
+    ),
+    "Wizard": Spellcasting("Intelligence", _get_cantrips_table(3, 4, 10)),
+}
+
+
+class SpellSelection:
+    """Class to choose a spellcaster's cantrips and known/prepared spells.
+
+    The class's SPELLCASTING entry gives the number of cantrips and of spells,
+    chosen from the class's spell lists up to the highest spell level the
+    character has slots for. Spells the character already has (i.e racial, feat
+    and subclass bonus magic spells) are never offered. The selections are
+    kept by spell level in the blueprint's spellbook; a level up only chooses
+    the spells gained since the previous one.
+
+    """
+
+    def __init__(self, blueprint: dict, session: BuildSession):
+        self.blueprint = blueprint
+        self.session = session
+
+    def select(self) -> dict:
+        """Fills the spellbook up to the character's level."""
+        blueprint = self.blueprint
+        spellbook = blueprint.setdefault("spellbook", dict())
+        spellcasting = SPELLCASTING.get(blueprint["klass"])
+        if spellcasting is None:
+            return spellbook
+
+        level = blueprint["level"]
+        spell_slots = blueprint["spell_slots"]
+        known = self._get_known_spells()
+        self._choose(
+            range(0, 1),
+            spellcasting.cantrips[level],
+            "cantrips",
+            "Choose a cantrip.",
+            known,
+        )
+        self._choose(
+            range(1, spellcasting.get_max_spell_level(level, spell_slots) + 1),
+            spellcasting.get_spells_count(level, spell_slots, blueprint["scores"]),
+            "spells",
+            "Choose a spell.",
+            known,
+        )
+
+        blueprint["spellbook"] = dict(sorted(spellbook.items()))
+        return blueprint["spellbook"]
+
+    def _choose(
+        self, spell_levels: range, count: int, category: str, message: str, known: set
+    ) -> None:
+        """Chooses spells of spell_levels until the spellbook holds count."""
+        klass = self.blueprint["klass"]
+        spellbook = self.blueprint["spellbook"]
+        count -= sum(len(spellbook.get(l, ())) for l in spell_levels)
+        if count <= 0:
+            return
+
+        spell_lists = [(l, get_spell_list(klass, l)) for l in spell_levels]
+        if all(len(spell_list) == 0 for _, spell_list in spell_lists):
+            return
+
+        # Sorted, so seeded builds match between processes.
+        levels = dict()
+        for spell_level, spell_list in spell_lists:
+            for key in sorted(spell_list.keys() - known):
+                levels[spell_list[key]] = spell_level
+
+        options = list(levels)
+        if len(options) < count:
+            log.warning(f"Only {len(options)} {klass} {category} are available.")
+            count = len(options)
+
+        selected = set()
+        for _ in range(count):
+            spell = self.session.policy(message, options, selected, category=category)
+            spellbook.setdefault(levels[spell], list()).append(spell)
+            selected.add(spell)
+            known.add(normalize_spell_name(spell))
+
+    def _get_known_spells(self) -> set:
+        """Returns the normalized names of the spells the character has."""
+        blueprint = self.blueprint
+        known = {normalize_spell_name(s) for s in blueprint["spells"]}
+        for spells in blueprint["bonus_magic"].values():
+            known.update(normalize_spell_name(s) for s in spells.split(", "))
+        for spells in blueprint.get("spellbook", dict()).values():
+            known.update(normalize_spell_name(s) for s in spells)
+        return known
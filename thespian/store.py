@@ -0,0 +1,318 @@
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+
+from attributes import ABILITIES
+from characters import PROFICIENCIES, PROFICIENCY_CATEGORIES
+
+log = logging.getLogger("thespian.store")
+
+SCORE_COLUMNS = tuple(ability.lower() for ability in ABILITIES)
+MASK_COLUMNS = tuple(f"{category}_mask" for category in PROFICIENCY_CATEGORIES)
+ROW_COLUMNS = (
+    ("id", "name", "race", "subrace", "class", "subclass", "level", "created")
+    + SCORE_COLUMNS
+    + MASK_COLUMNS
+    + ("payload",)
+)
+
+SCHEMA = (
+    f"""
+    CREATE TABLE IF NOT EXISTS characters (
+        id INTEGER PRIMARY KEY,
+        name TEXT,
+        race TEXT,
+        subrace TEXT,
+        class TEXT,
+        subclass TEXT,
+        level INTEGER,
+        created REAL NOT NULL,
+        {" ".join(f"{c} INTEGER," for c in SCORE_COLUMNS + MASK_COLUMNS)}
+        payload BLOB NOT NULL
+    )
+    """,
+    # Single column indexes keep equality matches in id order for paging.
+    "CREATE INDEX IF NOT EXISTS characters_race ON characters (race)",
+    "CREATE INDEX IF NOT EXISTS characters_class ON characters (class)",
+    "CREATE INDEX IF NOT EXISTS characters_subclass ON characters (subclass)",
+    "CREATE INDEX IF NOT EXISTS characters_level ON characters (level)",
+    "CREATE INDEX IF NOT EXISTS characters_created ON characters (created)",
+    "CREATE INDEX IF NOT EXISTS characters_class_level ON characters (class, level)",
+    *(
+        f"CREATE INDEX IF NOT EXISTS characters_{c} ON characters ({c})"
+        for c in SCORE_COLUMNS
+    ),
+    # The next unreserved id, so ids handed out before their rows are written
+    # (i.e to queued web requests) are not reused by other writers.
+    "CREATE TABLE IF NOT EXISTS id_sequence (next_id INTEGER NOT NULL)",
+)
+SCHEMA_VERSION = 1
+
+
+@dataclass(frozen=True)
+class CharacterQuery:
+    """Class to describe a filter over stored characters.
+
+    Score bounds are keyed by ability name (i.e 'Wisdom'). Proficiencies are
+    keyed by category and every listed proficiency must be present.
+
+    """
+
+    race: str | None = None
+    subrace: str | None = None
+    klass: str | None = None
+    subclass: str | None = None
+    min_level: int | None = None
+    max_level: int | None = None
+    min_scores: dict = field(default_factory=dict)
+    max_scores: dict = field(default_factory=dict)
+    proficiencies: dict = field(default_factory=dict)
+
+    def to_sql(self) -> tuple:
+        """Returns the query's WHERE clause terms and their parameters."""
+        terms = list()
+        parameters = list()
+
+        for column, value in (
+            ("race", self.race),
+            ("subrace", self.subrace),
+            ("class", self.klass),
+            ("subclass", self.subclass),
+        ):
+            if value is not None:
+                terms.append(f"{column} = ?")
+                parameters.append(value)
+
+        if self.min_level is not None:
+            terms.append("level >= ?")
+            parameters.append(self.min_level)
+        if self.max_level is not None:
+            terms.append("level <= ?")
+            parameters.append(self.max_level)
+
+        for operator, bounds in ((">=", self.min_scores), ("<=", self.max_scores)):
+            for ability, score in bounds.items():
+                if ability not in ABILITIES:
+                    raise ValueError(f"Unknown ability '{ability}'.")
+                terms.append(f"{ability.lower()} {operator} ?")
+                parameters.append(score)
+
+        for category, names in self.proficiencies.items():
+            if category not in PROFICIENCY_CATEGORIES:
+                raise ValueError(f"Unknown proficiency category '{category}'.")
+            mask = PROFICIENCIES.encode(category, names)
+            terms.append(f"{category}_mask & ? = ?")
+            parameters += [mask, mask]
+
+        return terms, parameters
+
+
+class CharacterStore:
+    """Class to persist generated characters in a SQLite database.
+
+    Character payloads are stored as zlib compressed JSON, next to indexed
+    summary columns. Writes are serialized; the database runs in WAL mode so
+    readers in other processes are not blocked by them.
+
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(
+            path, check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode = WAL")
+        self._connection.execute("PRAGMA synchronous = NORMAL")
+        self._create_schema()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute(
+                "SELECT count(*) FROM characters"
+            ).fetchone()
+        return count
+
+    def add(self, character: Mapping, character_id: int | None = None) -> int:
+        """Stores a character, returning its id."""
+        (character_id,) = self.add_many([character], character_id)
+        return character_id
+
+    def add_many(self, characters: list, first_id: int | None = None) -> list:
+        """Stores characters in a single transaction, returning their ids.
+
+        If first_id is set, the characters are stored under consecutive ids
+        starting from it (i.e ids from reserve_ids); otherwise new ids are
+        reserved for them.
+
+        """
+        created = time.time()
+        with self.transaction() as connection:
+            if first_id is None:
+                ids = self._reserve_ids(connection, len(characters))
+            else:
+                ids = list(range(first_id, first_id + len(characters)))
+            connection.executemany(
+                f"INSERT INTO characters ({', '.join(ROW_COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(ROW_COLUMNS))})",
+                (
+                    _get_row(character_id, dict(character), created)
+                    for character_id, character in zip(ids, characters)
+                ),
+            )
+        return ids
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def get(self, character_id: int) -> dict | None:
+        """Returns a stored character by id."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT payload FROM characters WHERE id = ?", (character_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return decode_payload(row[0])
+
+    def page(self, after: int = 0, limit: int = 50) -> list:
+        """Returns up to limit (id, character) pairs with ids after after."""
+        return self.query(CharacterQuery(), after, limit)
+
+    def query(self, query: CharacterQuery, after: int = 0, limit: int = 50) -> list:
+        """Returns up to limit matching (id, character) pairs with ids after after.
+
+        Results are ordered by id, so the last id of a page is the cursor for
+        the next one.
+
+        """
+        terms, parameters = query.to_sql()
+        where = " AND ".join(["id > ?"] + terms)
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT id, payload FROM characters WHERE {where} ORDER BY id LIMIT ?",
+                [after] + parameters + [limit],
+            ).fetchall()
+        return [(character_id, decode_payload(p)) for character_id, p in rows]
+
+    def reserve_ids(self, count: int = 1) -> list:
+        """Reserves ids for characters that will be stored later.
+
+        Ids are reserved in a write transaction, so they are never handed out
+        twice, even to other connections to the database.
+
+        """
+        with self.transaction() as connection:
+            return self._reserve_ids(connection, count)
+
+    def transaction(self):
+        """Returns a context manager for an immediate write transaction."""
+        return _Transaction(self)
+
+    def _reserve_ids(self, connection: sqlite3.Connection, count: int) -> list:
+        (last_id,) = connection.execute(
+            "SELECT coalesce(max(id), 0) FROM characters"
+        ).fetchone()
+        row = connection.execute("SELECT next_id FROM id_sequence").fetchone()
+        first_id = last_id + 1 if row is None else max(row[0], last_id + 1)
+        connection.execute("DELETE FROM id_sequence")
+        connection.execute(
+            "INSERT INTO id_sequence (next_id) VALUES (?)", (first_id + count,)
+        )
+        return list(range(first_id, first_id + count))
+
+    def _create_schema(self) -> None:
+        """Creates the database schema, if the database has none yet."""
+        with self.transaction() as connection:
+            (version,) = connection.execute("PRAGMA user_version").fetchone()
+            if version > SCHEMA_VERSION:
+                raise ValueError(
+                    f"Database '{self.path}' uses a newer schema ({version})."
+                )
+
+            for statement in SCHEMA:
+                connection.execute(statement)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+class _Transaction:
+    """Class to hold the store's write lock for one transaction."""
+
+    def __init__(self, store: CharacterStore):
+        self.store = store
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.store._lock.acquire()
+        try:
+            self.store._connection.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.store._lock.release()
+            raise
+        return self.store._connection
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self.store._connection.execute("COMMIT")
+            else:
+                self.store._connection.execute("ROLLBACK")
+        finally:
+            self.store._lock.release()
+
+
+def decode_payload(payload: bytes) -> dict:
+    """Returns a character from its stored payload."""
+    return json.loads(zlib.decompress(payload))
+
+
+def encode_payload(character: dict) -> bytes:
+    """Returns the compact stored payload of a character."""
+    return zlib.compress(
+        json.dumps(character, separators=(",", ":")).encode("utf-8"), 6
+    )
+
+
+def _get_masks(character: dict) -> tuple:
+    """Returns a character's proficiency bitmasks, in MASK_COLUMNS order."""
+    masks = list()
+    for category in PROFICIENCY_CATEGORIES:
+        names = character.get(category)
+        # Stored sheets list every skill; only proficient ones are encoded.
+        if category == "skills" and isinstance(names, dict):
+            names = [k for k, v in names.items() if v["is_class_skill"]]
+        try:
+            masks.append(PROFICIENCIES.encode(category, names))
+        except ValueError as e:
+            log.warning(f"Could not index {category} of '{character.get('name')}': {e}")
+            masks.append(None)
+    return tuple(masks)
+
+
+def _get_row(character_id: int, character: dict, created: float) -> tuple:
+    return (
+        (
+            character_id,
+            character.get("name"),
+            character.get("race"),
+            character.get("subrace"),
+            character.get("class"),
+            character.get("subclass"),
+            character.get("level"),
+            created,
+        )
+        + _get_scores(character)
+        + _get_masks(character)
+        + (encode_payload(character),)
+    )
+
+
+def _get_scores(character: dict) -> tuple:
+    """Returns a character's ability scores, in SCORE_COLUMNS order."""
+    return tuple(character.get(c, dict()).get("score") for c in SCORE_COLUMNS)
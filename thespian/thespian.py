@@ -1,13 +1,43 @@
 from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter, ArgumentTypeError
-from collections import namedtuple
+from copy import deepcopy
 import logging
 from math import ceil
-
-from attributes import AttributeGenerator, generate_hit_points, get_ability_modifier
-from characters import RulesetReader
+import random
+from typing import Callable
+
+from attributes import (
+    ABILITIES,
+    SCORE_METHODS,
+    AttributeGenerator,
+    generate_hit_points,
+    get_ability_modifier,
+    get_hit_point_increments,
+)
+from characters import (
+    FEATURES,
+    PROFICIENCIES,
+    PROFICIENCY_CATEGORIES,
+    SKILLS,
+    SOURCEBOOKS,
+    RulesetReader,
+    get_ruleset,
+    set_default_ruleset,
+    use_ruleset,
+)
 from httpd import Server
 from metrics import AnthropometricCalculator
-from notifications import PromptRecorder, init_status, prompt
+from notifications import init_status, prompt
+from policies import RandomPolicy
+from progression import (
+    get_class_progression,
+    get_racial_spell_progression,
+    get_subclass_progression,
+)
+from recommender import parse_weights, recommend
+from replay import DecisionRecorder, ReplayPolicy
+from session import BuildSession
+from sheets import CharacterSheet
+from spells import SpellSelection
 from tweaks import AbilityScoreImprovement
 
 __author__ = "Marcus T Taylor"
@@ -15,31 +45,33 @@ __version__ = "220911"
 
 
 log = logging.getLogger("thespian")
-log.setLevel(logging.INFO)
-log_handler = logging.StreamHandler()
-log_handler.setLevel(logging.INFO)
-log_format = logging.Formatter("%(name)s:%(levelname)s:%(message)s")
-log_handler.setFormatter(log_format)
-log.addHandler(log_handler)
 
 
-def define_background(background: str) -> dict:
+def define_background(background: str, session: BuildSession | None = None) -> dict:
     """Defines character background parameters."""
-    background_base = RulesetReader.get_entry_background(background)
+    background_base = deepcopy(RulesetReader.get_entry_background(background))
     if background_base is None:
         raise ValueError(f"Unknown background '{background}'.")
 
     blueprint = dict()
     guidelines = define_guidelines(background_base["guides"])
 
-    return honor_guidelines(guidelines, background_base, blueprint, False)
+    return honor_guidelines(guidelines, background_base, blueprint, False, session)
 
 
 def define_class(
-    klass: str, level: int, racial_bonuses: dict, roll_hp: bool = False
+    klass: str,
+    level: int,
+    racial_bonuses: dict,
+    roll_hp: bool = False,
+    session: BuildSession | None = None,
+    score_method: str = "roll",
 ) -> dict:
     """Defines character class parameters."""
-    class_base = RulesetReader.get_entry_class(klass)
+    if session is None:
+        session = BuildSession()
+
+    class_base = deepcopy(RulesetReader.get_entry_class(klass))
     if class_base is None:
         raise ValueError(f"Unknown player class '{klass}'.")
 
@@ -49,9 +81,6 @@ def define_class(
     blueprint["weapons"] = class_base["weapons"]
     blueprint["bonus_magic"] = dict()
     blueprint["feats"] = list()
-    blueprint["features"] = {
-        k: v for k, v in class_base["features"].items() if k <= level
-    }
     blueprint["klass"] = klass
     blueprint["proficiency_bonus"] = ceil((level / 4) + 1)
     blueprint["savingthrows"] = class_base["savingthrows"]
@@ -64,9 +93,10 @@ def define_class(
             if isinstance(attribute_options, list):
                 ranking = ("primary", "secondary")
                 ranking_text = ranking[index].capitalize()
-                my_ability = prompt(
+                my_ability = session.policy(
                     f"{ranking_text}: Choose a {ranking[index]} class attribute.",
                     attribute_options,
+                    category="primary_ability",
                 )
                 ability_options[index] = my_ability
 
@@ -78,25 +108,31 @@ def define_class(
         blueprint["spell_slots"] = "0"
 
     guidelines = define_guidelines(class_base["guides"])
-    blueprint = honor_guidelines(guidelines, class_base, blueprint)
+    blueprint = honor_guidelines(guidelines, class_base, blueprint, session=session)
+    # Set after the guidelines, which copy the class's unchosen options.
+    blueprint["primary_ability"] = ability_options
 
     # Generate/assign base attributes to character.
-    attributes = AttributeGenerator(ability_options, racial_bonuses).generate()
+    attributes = AttributeGenerator(
+        ability_options, racial_bonuses, session.rng, score_method
+    ).generate()
     blueprint["scores"] = attributes
 
     # Generate/assign hit die/points to character.
     hit_die, hit_points = generate_hit_points(
-        level, class_base["hit_die"], attributes, roll_hp
+        level, class_base["hit_die"], attributes, roll_hp, session.rng
     )
     blueprint["hit_die"] = hit_die
     blueprint["hit_points"] = hit_points
+    blueprint["roll_hp"] = roll_hp
 
     return blueprint
 
 
 def define_guidelines(guideline_string: str) -> dict | None:
     """Defines special racial and class generation guidelines."""
-    if guideline_string is None:
+    # Overlay formats without null (i.e TOML) give an empty string instead.
+    if guideline_string is None or guideline_string == "":
         return None
 
     creation_guidelines = dict()
@@ -116,10 +152,16 @@ def define_guidelines(guideline_string: str) -> dict | None:
 
 
 def define_race(
-    name: str, race: str, sex: str, background: str, alignment: str, level: int
+    name: str,
+    race: str,
+    sex: str,
+    background: str,
+    alignment: str,
+    level: int,
+    session: BuildSession | None = None,
 ) -> dict:
     """Define character race parameters."""
-    race_base = RulesetReader.get_entry_race(race)
+    race_base = deepcopy(RulesetReader.get_entry_race(race))
     if race_base is None:
         raise ValueError(f"Unknown player race '{race}'.")
 
@@ -143,12 +185,14 @@ def define_race(
     blueprint["weapons"] = race_base["weapons"]
 
     guidelines = define_guidelines(race_base["guides"])
-    return honor_guidelines(guidelines, race_base, blueprint)
+    return honor_guidelines(guidelines, race_base, blueprint, session=session)
 
 
-def define_subclass(subclass: str, level: int) -> dict:
+def define_subclass(
+    subclass: str, level: int, session: BuildSession | None = None
+) -> dict:
     """Defines character subclass parameters."""
-    subclass_base = RulesetReader.get_entry_subclass(subclass)
+    subclass_base = deepcopy(RulesetReader.get_entry_subclass(subclass))
     if subclass_base is None:
         raise ValueError(f"Unknown player subclass '{subclass}'.")
 
@@ -160,18 +204,17 @@ def define_subclass(subclass: str, level: int) -> dict:
         l: ", ".join(s) for l, s in subclass_base["bonus_magic"].items() if l <= level
     }
     blueprint["feats"] = list()
-    blueprint["features"] = {
-        k: v for k, v in subclass_base["features"].items() if k <= level
-    }
     blueprint["subclass"] = subclass
 
     guidelines = define_guidelines(subclass_base["guides"])
-    return honor_guidelines(guidelines, subclass_base, blueprint)
+    return honor_guidelines(guidelines, subclass_base, blueprint, session=session)
 
 
-def define_subrace(subrace: str, level: int) -> dict:
+def define_subrace(
+    subrace: str, level: int, session: BuildSession | None = None
+) -> dict:
     """Define character subrace parameters."""
-    subrace_base = RulesetReader.get_entry_subrace(subrace)
+    subrace_base = deepcopy(RulesetReader.get_entry_subrace(subrace))
     if subrace_base is None:
         raise ValueError(f"Unknown player subrace '{subrace}'.")
 
@@ -179,13 +222,14 @@ def define_subrace(subrace: str, level: int) -> dict:
     blueprint["subrace"] = subrace
     blueprint["level"] = level
     blueprint["armors"] = subrace_base["armors"]
+    blueprint["bonus"] = subrace_base["bonus"]
     blueprint["tools"] = subrace_base["tools"]
     blueprint["weapons"] = subrace_base["weapons"]
     blueprint["traits"] = subrace_base["traits"]
 
     guidelines = define_guidelines(subrace_base["guides"])
 
-    return honor_guidelines(guidelines, subrace_base, blueprint)
+    return honor_guidelines(guidelines, subrace_base, blueprint, session=session)
 
 
 def expand_ability(ability: str, scores: dict, skills: list) -> dict:
@@ -211,25 +255,10 @@ def expand_ability(ability: str, scores: dict, skills: list) -> dict:
 
 def expand_skills(skills: list, scores: dict, proficiency_bonus: int = 2) -> dict:
     """Expands skill list with each skill's associated properties."""
-    expanded_skills = dict()
-    for skill in RulesetReader.get_all_skills():
-        ability = RulesetReader.get_skill_ability(skill)
-        modifier = get_ability_modifier(ability, scores)
-
-        if skill in skills:
-            rank = proficiency_bonus + modifier
-            class_skill = True
-        else:
-            rank = modifier
-            class_skill = False
-
-        expanded_skills[skill] = {
-            "ability": ability,
-            "rank": rank,
-            "is_class_skill": class_skill,
-        }
-
-    return expanded_skills
+    skill_mask = PROFICIENCIES.encode("skills", skills)
+    modifiers = {a: get_ability_modifier(a, scores) for a in ABILITIES}
+    ranks = SKILLS.ranks(modifiers, skill_mask, proficiency_bonus)
+    return SKILLS.expand(ranks, skill_mask)
 
 
 def fuse_iterables(original_iterable: dict, fused_iterable: dict) -> dict:
@@ -270,7 +299,8 @@ def fuse_iterables(original_iterable: dict, fused_iterable: dict) -> dict:
         if isinstance(value, list):
             list_value = original_iterable[key]
             if isinstance(list_value, list):
-                original_iterable[key] = list(set(list_value + value))
+                # Ordered union, so seeded builds match between processes.
+                original_iterable[key] = list(dict.fromkeys(list_value + value))
 
     return original_iterable
 
@@ -280,12 +310,17 @@ def honor_guidelines(
     blueprint: dict,
     output: dict,
     set_unuset_guidelines: bool = True,
+    session: BuildSession | None = None,
 ) -> dict:
     """Parses and applies character guidelines."""
     if guidelines is None or not isinstance(guidelines, dict):
         return output
 
-    recorder = PromptRecorder()
+    if session is None:
+        session = BuildSession()
+
+    policy = session.policy
+    recorder = session.recorder
 
     for guideline, _ in guidelines.items():
         # Copy guideline to blueprint, if not specified in blueprint (if allowed).
@@ -303,7 +338,9 @@ def honor_guidelines(
                 continue
 
             ancestry_options = list(blueprint[guideline])
-            my_selection = prompt("Choose your racial ancestry.", ancestry_options)
+            my_selection = policy(
+                "Choose your racial ancestry.", ancestry_options, category=guideline
+            )
             user_inputs.append(my_selection)
             ancestry = user_inputs[0]
             output[guideline] = ancestry
@@ -314,7 +351,9 @@ def honor_guidelines(
             bonus_choices = {k: v for k, v in bonus_options.items() if v < 2}.keys()
             user_inputs = {k: v for k, v in bonus_options.items() if v > 1}
             for _ in range(guide_increment):
-                my_selection = prompt("Choose your racial bonus.", bonus_choices)
+                my_selection = policy(
+                    "Choose your racial bonus.", bonus_choices, category=guideline
+                )
                 user_inputs[my_selection] = 1
 
             output[guideline] = user_inputs
@@ -359,10 +398,11 @@ def honor_guidelines(
 
         # Player can now make additional guideline selections == guide_increment.
         for _ in range(guide_increment):
-            my_selection = prompt(
+            my_selection = policy(
                 f"Make a selection from the '{guideline}' options.",
                 guideline_options,
                 recorder.recall(guideline),
+                category=guideline,
             )
             user_inputs.append(my_selection)
             output[guideline] = user_inputs
@@ -371,6 +411,100 @@ def honor_guidelines(
     return output
 
 
+def level_up(
+    character: CharacterSheet,
+    to_level: int,
+    policy: Callable = prompt,
+    seed: int | None = None,
+) -> CharacterSheet:
+    """Advances a generated character to a higher level.
+
+    Only the changes between the character's current level and to_level are
+    applied: new features, spell slots, hit points, ability score
+    improvements, subclass bonus magic, racial and class spells. Earlier choices,
+    scores and physical traits are kept.
+
+    """
+    blueprint = character.blueprint
+    from_level = blueprint["level"]
+    if to_level not in range(from_level + 1, 21):
+        raise ValueError(f"Cannot level up from level {from_level} to {to_level}.")
+
+    session = BuildSession(policy, seed)
+    with use_ruleset(session.ruleset):
+        _advance_blueprint(blueprint, from_level, to_level, session)
+
+    character.invalidate()
+    return character
+
+
+def _advance_blueprint(
+    blueprint: dict, from_level: int, to_level: int, session: BuildSession
+) -> None:
+    """Applies the level up changes from from_level to to_level to blueprint."""
+    # Earlier selections are excluded from any new choices.
+    for category in PROFICIENCY_CATEGORIES:
+        if category in blueprint:
+            mask = PROFICIENCIES.encode(category, blueprint[category])
+            session.recorder.store(category, PROFICIENCIES.decode(category, mask))
+
+    new_levels = range(from_level + 1, to_level + 1)
+    klass = blueprint["klass"]
+    progression = get_class_progression(klass)
+
+    # Add new racial/subracial spells.
+    spells = list(blueprint["spells"])
+    for race in (blueprint["race"], blueprint["subrace"]):
+        if race == "":
+            continue
+        racial_spells = get_racial_spell_progression(race)
+        for level in new_levels:
+            spells += racial_spells[level]
+    blueprint["spells"] = spells
+
+    # Add new subclass data. A subclass is chosen once the character is eligible.
+    subclass = blueprint["subclass"]
+    if subclass == "" and to_level >= 3:
+        subclass = session.policy(
+            "Choose your subclass.",
+            RulesetReader.get_all_subclasses(klass),
+            category="subclass",
+        )
+        fuse_iterables(blueprint, define_subclass(subclass, to_level, session))
+        blueprint["subclass"] = subclass
+    elif subclass != "":
+        subclass_progression = get_subclass_progression(subclass)
+        for level in new_levels:
+            bonus_magic = subclass_progression.bonus_magic[level]
+            if len(bonus_magic) != 0:
+                blueprint["bonus_magic"][level] = ", ".join(bonus_magic)
+
+    # Add the hit points gained for each new level.
+    modifier = get_ability_modifier("Constitution", blueprint["scores"])
+    blueprint["hit_points"] += sum(
+        get_hit_point_increments(
+            len(new_levels),
+            progression.hit_die,
+            modifier,
+            blueprint["roll_hp"],
+            session.rng,
+        )
+    )
+    blueprint["hit_die"] = f"{to_level}d{progression.hit_die}"
+
+    blueprint["level"] = to_level
+    blueprint["proficiency_bonus"] = ceil((to_level / 4) + 1)
+    blueprint["spell_slots"] = progression.spell_slots[to_level]
+
+    # Apply the ability score improvements gained since the previous level.
+    upgrades = progression.upgrades[to_level] - progression.upgrades[from_level]
+    if upgrades > 0:
+        AbilityScoreImprovement(blueprint, session).tweak(upgrades)
+
+    # Choose the class spells gained since the previous level.
+    SpellSelection(blueprint, session).select()
+
+
 def order_by_dict_keys(iterable: dict) -> dict:
     """Reorders dict by dictionary keys."""
     iterable_keys = sorted(iterable)
@@ -384,6 +518,139 @@ def order_by_dict_keys(iterable: dict) -> dict:
     return reordered_iterable
 
 
+def _get_ability_field(ability: str):
+    """Returns a field builder for an ability block."""
+
+    def build(blueprint: dict) -> dict:
+        return expand_ability(ability, blueprint["scores"], blueprint["skills"])
+
+    return build
+
+
+def _get_features_field(blueprint: dict) -> list:
+    """Returns the character's class and subclass features, in level order."""
+    sources = [("classes", blueprint["klass"])]
+    if blueprint["subclass"] != "":
+        sources.append(("subclasses", blueprint["subclass"]))
+
+    features = list()
+    for level in range(1, blueprint["level"] + 1):
+        for category, name in sources:
+            features += FEATURES.get_features(category, name, level, level - 1)
+    return features
+
+
+def _get_skills_field(blueprint: dict) -> dict:
+    """Expands the character's skills using its proficiency bonus."""
+    proficiency_bonus = ceil(1 + (blueprint["level"] / 4))
+    return expand_skills(blueprint["skills"], blueprint["scores"], proficiency_bonus)
+
+
+# Character output fields, in output order, and how to build each one.
+CHARACTER_FIELDS = {
+    "name": lambda b: b["name"],
+    "race": lambda b: b["race"],
+    "ancestry": lambda b: b["ancestry"],
+    "subrace": lambda b: b["subrace"],
+    "sex": lambda b: b["sex"],
+    "alignment": lambda b: b["alignment"],
+    "background": lambda b: b["background"],
+    "feet": lambda b: b["height"][0],
+    "inches": lambda b: b["height"][1],
+    "weight": lambda b: b["weight"],
+    "size": lambda b: b["size"],
+    "class": lambda b: b["klass"],
+    "subclass": lambda b: b["subclass"],
+    "level": lambda b: b["level"],
+    "hit_points": lambda b: b["hit_points"],
+    "proficiency_bonus": lambda b: ceil(1 + (b["level"] / 4)),
+    **{a.lower(): _get_ability_field(a) for a in ABILITIES},
+    "speed": lambda b: b["speed"],
+    "initiative": lambda b: get_ability_modifier("Dexterity", b["scores"]),
+    "armors": lambda b: b["armors"],
+    "tools": lambda b: b["tools"],
+    "weapons": lambda b: b["weapons"],
+    "languages": lambda b: b["languages"],
+    "savingthrows": lambda b: b["savingthrows"],
+    "skills": _get_skills_field,
+    "feats": lambda b: b["feats"],
+    "traits": lambda b: b["traits"],
+    "features": _get_features_field,
+    "spell_slots": lambda b: b["spell_slots"],
+    "bonus_magic": lambda b: b["bonus_magic"],
+    "spells": lambda b: b["spells"],
+    "spellbook": lambda b: b["spellbook"],
+    "equipment": lambda b: b["equipment"],
+}
+
+# Fields that the optional generation stages contribute to.
+# A stage is skipped when none of its fields are selected.
+STAGE_FIELDS = {
+    "background": {"equipment", "languages", "skills", "tools"}.union(
+        a.lower() for a in ABILITIES
+    ),
+    "metrics": {"feet", "inches", "weight"},
+    "spells": {"spellbook"},
+    "subclass": set(CHARACTER_FIELDS).difference(
+        (
+            "alignment",
+            "ancestry",
+            "background",
+            "class",
+            "feet",
+            "hit_points",
+            "inches",
+            "level",
+            "name",
+            "proficiency_bonus",
+            "race",
+            "savingthrows",
+            "sex",
+            "size",
+            "speed",
+            "spell_slots",
+            "subclass",
+            "subrace",
+            "traits",
+            "weight",
+        )
+    ),
+    "tweak": set(CHARACTER_FIELDS).difference(
+        (
+            "alignment",
+            "ancestry",
+            "background",
+            "bonus_magic",
+            "class",
+            "equipment",
+            "features",
+            "feet",
+            "hit_points",
+            "inches",
+            "level",
+            "name",
+            "proficiency_bonus",
+            "race",
+            "sex",
+            "size",
+            "spell_slots",
+            "subclass",
+            "subrace",
+            "traits",
+            "weight",
+        )
+    ),
+}
+
+# Stages that read what earlier stages chose (i.e feats that offer only
+# skills not already granted), so they run with every stage they read from.
+STAGE_DEPENDENCIES = {
+    "subclass": {"background"},
+    "tweak": {"background", "subclass"},
+    "spells": {"background", "subclass", "tweak"},
+}
+
+
 def thespian(
     name: str,
     race: str,
@@ -396,45 +663,123 @@ def thespian(
     level: int,
     roll_hp: bool = False,
     use_dominant_sex: bool = False,
+    fields: tuple | list | None = None,
+    policy: Callable = prompt,
+    seed: int | None = None,
+    session: BuildSession | None = None,
+    score_method: str = "roll",
+) -> CharacterSheet:
+    """Runs the thespian character generator.
+
+    Derived fields are computed on first access. If fields is specified, only
+    those fields are available and generation stages that contribute to none
+    of them are skipped.
+
+    Choices are made by policy and randomness comes from a generator seeded
+    with seed, both held by the build's session. A prepared session can be
+    passed instead.
+
+    Ability scores are generated with score_method, one of SCORE_METHODS.
+
+    """
+    if session is None:
+        session = BuildSession(policy, seed)
+
+    if session.verbose:
+        init_status(
+            name, race, subrace, sex, background, alignment, klass, subclass, level
+        )
+
+    if fields is None:
+        fields = tuple(CHARACTER_FIELDS)
+    stages = {k for k, v in STAGE_FIELDS.items() if not v.isdisjoint(fields)}
+    for stage in tuple(stages):
+        stages.update(STAGE_DEPENDENCIES.get(stage, ()))
+
+    # Builds keep the ruleset they started with, even if it is reloaded.
+    with use_ruleset(session.ruleset):
+        blueprint = build_blueprint(
+            name,
+            race,
+            subrace,
+            sex,
+            background,
+            alignment,
+            klass,
+            subclass,
+            level,
+            roll_hp,
+            use_dominant_sex,
+            stages,
+            session,
+            score_method,
+        )
+
+    return CharacterSheet(blueprint, CHARACTER_FIELDS, fields, session.ruleset)
+
+
+def build_blueprint(
+    name: str,
+    race: str,
+    subrace: str,
+    sex: str,
+    background: str,
+    alignment: str,
+    klass: str,
+    subclass: str,
+    level: int,
+    roll_hp: bool,
+    use_dominant_sex: bool,
+    stages: set,
+    session: BuildSession,
+    score_method: str = "roll",
 ) -> dict:
-    """Runs the thespian character generator."""
-    init_status(name, race, subrace, sex, background, alignment, klass, subclass, level)
+    """Runs the generation stages of a character build.
+
+    Each optional stage draws from random streams of its own, split off the
+    session's before any stage runs. Skipping a stage then leaves every other
+    stage's draws as they were, so a build of a field subset is always a
+    projection of the full build.
 
+    """
+    stage_sessions = {stage: session.fork() for stage in STAGE_FIELDS}
     blueprint = dict()
     blueprint["subrace"] = subrace
 
     # Define character's racial/subracial (if applicable) data.
-    my_race = define_race(name, race, sex, background, alignment, level)
+    my_race = define_race(name, race, sex, background, alignment, level, session)
     if subrace == "":
         log.warning(f"No subrace options are available for '{race}'.")
     else:
-        my_subrace = define_subrace(subrace, level)
+        my_subrace = define_subrace(subrace, level, session)
         fuse_iterables(my_race, my_subrace)
 
     # Define character's background.
-    my_background = define_background(background)
-
     # Fuse racial/background generated data.
-    fuse_iterables(my_race, my_background)
+    if "background" in stages:
+        my_background = define_background(background, stage_sessions["background"])
+        fuse_iterables(my_race, my_background)
 
     # Generate character's height/weight.
-    height, weight = AnthropometricCalculator(race, sex, subrace).calculate(
-        use_dominant_sex
-    )
-    my_race["height"] = height
-    my_race["weight"] = weight
-    feet, inches = my_race["height"]
+    if "metrics" in stages:
+        height, weight = AnthropometricCalculator(
+            race, sex, subrace, stage_sessions["metrics"].rng
+        ).calculate(use_dominant_sex)
+        my_race["height"] = height
+        my_race["weight"] = weight
 
     # Fuse racial data to the blueprint.
     fuse_iterables(blueprint, my_race)
 
     # Define character's class/subclass data.
-    my_class = define_class(klass, level, blueprint["bonus"], roll_hp)
+    my_class = define_class(
+        klass, level, blueprint["bonus"], roll_hp, session, score_method
+    )
     my_class["subclass"] = subclass
     if subclass == "":
         log.warning("No subclass options are available prior to level 3.")
-    else:
-        my_subclass = define_subclass(subclass, level)
+    elif "subclass" in stages:
+        my_subclass = define_subclass(subclass, level, stage_sessions["subclass"])
         fuse_iterables(my_class, my_subclass)
 
     # Fuse class data to the blueprint.
@@ -444,62 +789,30 @@ def thespian(
     order_by_dict_keys(blueprint)
 
     # Apply level based upgrades.
-    AbilityScoreImprovement(blueprint).tweak()
+    if "tweak" in stages:
+        AbilityScoreImprovement(blueprint, stage_sessions["tweak"]).tweak()
 
-    character = namedtuple("MyCharacter", blueprint.keys())(*blueprint.values())
-    feet, inches = character.height
-    proficiency_bonus = ceil(1 + (character.level / 4))
+    # Choose class spells, once every other source of spells is known.
+    blueprint["spellbook"] = dict()
+    if "spells" in stages:
+        SpellSelection(blueprint, stage_sessions["spells"]).select()
+
+    return blueprint
 
-    features = list()
-    for _, feature_list in character.features.items():
-        features += feature_list
-
-    return {
-        "name": character.name,
-        "race": character.race,
-        "ancestry": character.ancestry,
-        "subrace": character.subrace,
-        "sex": character.sex,
-        "alignment": character.alignment,
-        "background": character.background,
-        "feet": feet,
-        "inches": inches,
-        "weight": character.weight,
-        "size": character.size,
-        "class": character.klass,
-        "subclass": character.subclass,
-        "level": character.level,
-        "hit_points": character.hit_points,
-        "proficiency_bonus": proficiency_bonus,
-        "strength": expand_ability("Strength", character.scores, character.skills),
-        "dexterity": expand_ability("Dexterity", character.scores, character.skills),
-        "constitution": expand_ability(
-            "Constitution", character.scores, character.skills
-        ),
-        "intelligence": expand_ability(
-            "Intelligence", character.scores, character.skills
-        ),
-        "wisdom": expand_ability("Wisdom", character.scores, character.skills),
-        "charisma": expand_ability("Charisma", character.scores, character.skills),
-        "speed": character.speed,
-        "initiative": get_ability_modifier("Dexterity", character.scores),
-        "armors": character.armors,
-        "tools": character.tools,
-        "weapons": character.weapons,
-        "languages": character.languages,
-        "savingthrows": character.savingthrows,
-        "skills": expand_skills(character.skills, character.scores, proficiency_bonus),
-        "feats": character.feats,
-        "traits": character.traits,
-        "features": features,
-        "spell_slots": character.spell_slots,
-        "bonus_magic": character.bonus_magic,
-        "spells": character.spells,
-        "equipment": character.equipment,
-    }
+
+def configure_logging() -> None:
+    """Sends thespian's log messages to the console."""
+    log.setLevel(logging.INFO)
+    log_handler = logging.StreamHandler()
+    log_handler.setLevel(logging.INFO)
+    log_format = logging.Formatter("%(name)s:%(levelname)s:%(message)s")
+    log_handler.setFormatter(log_format)
+    log.addHandler(log_handler)
 
 
 def main() -> None:
+    configure_logging()
+
     app = ArgumentParser(
         description="Generate 5th edition Dungeons & Dragons characters.",
         formatter_class=ArgumentDefaultsHelpFormatter,
@@ -586,8 +899,74 @@ def main() -> None:
         dest="use_dominant_sex",
         help="Account for height/weight differences based on sex.",
     )
+    app.add_argument(
+        "--scores",
+        choices=SCORE_METHODS,
+        default="roll",
+        dest="score_method",
+        help="Sets how ability scores are generated.",
+    )
+    app.add_argument(
+        "--seed",
+        default=None,
+        dest="seed",
+        help="Seed the build's random draws (i.e to override a replay's seed).",
+        type=int,
+    )
+    app.add_argument(
+        "--record",
+        default=None,
+        dest="record",
+        help="Record every prompt decision to a replay file.",
+        metavar="FILE",
+    )
+    app.add_argument(
+        "--replay",
+        default=None,
+        dest="replay",
+        help="Answer prompts from a replay file (other prompts are random).",
+        metavar="FILE",
+    )
+    app.add_argument(
+        "--recommend",
+        default=None,
+        dest="recommend",
+        help="List the best race/class pairs for weights (i.e 'Dexterity=2') and exit.",
+        metavar="WEIGHTS",
+    )
+    app.add_argument(
+        "--top",
+        default=10,
+        dest="top",
+        help="Number of race/class pairs listed by --recommend.",
+        type=int,
+    )
+    app.add_argument(
+        "--sourcebook",
+        action="append",
+        choices=tuple(SOURCEBOOKS),
+        default=None,
+        dest="sourcebooks",
+        help="Only use content from this sourcebook. Can be given more than once.",
+    )
 
     args = app.parse_args()
+    if args.sourcebooks is not None:
+        set_default_ruleset(get_ruleset(sourcebooks=args.sourcebooks))
+
+    if args.recommend is not None:
+        try:
+            weights = parse_weights(args.recommend)
+        except ValueError as e:
+            raise ArgumentTypeError(str(e))
+        for r in recommend(weights, args.top):
+            subrace = "" if r.subrace == "" else f" ({r.subrace})"
+            print(
+                f"{r.score:6.2f}  {r.race}{subrace} {r.klass} "
+                f"[{', '.join(r.primary_abilities)}]"
+            )
+        return
+
     name = args.name
     race = args.race
     subrace = args.subrace
@@ -595,6 +974,11 @@ def main() -> None:
     subclass = args.subclass
     level = args.level
 
+    if race not in RulesetReader.get_all_races():
+        raise ArgumentTypeError(f"Race '{race}' is not in the enabled sourcebooks.")
+    if klass not in RulesetReader.get_all_classes():
+        raise ArgumentTypeError(f"Class '{klass}' is not in the enabled sourcebooks.")
+
     alignment = args.alignment
     if alignment not in RulesetReader.get_all_alignments():
         raise ArgumentTypeError(f"Invalid alignment specified '{alignment}'.")
@@ -614,6 +998,19 @@ def main() -> None:
     if len(subraces) != 0 and subrace not in subraces:
         raise ArgumentTypeError(f"Invalid {race} subrace '{subrace}'.")
 
+    seed = args.seed
+    policy = prompt
+    if args.replay is not None:
+        policy = ReplayPolicy.load(args.replay, prompt)
+        if seed is None:
+            seed = policy.seed
+        policy.fallback = RandomPolicy(random.Random(seed))
+    if args.record is not None:
+        # Recorded builds are always seeded, so their replays can be exact.
+        if seed is None:
+            seed = random.randrange(2**32)
+        policy = DecisionRecorder(policy, seed)
+
     character = thespian(
         name,
         race,
@@ -626,5 +1023,12 @@ def main() -> None:
         level,
         args.roll_hp,
         args.use_dominant_sex,
+        policy=policy,
+        seed=seed,
+        score_method=args.score_method,
     )
+
+    if args.record is not None:
+        policy.save(args.record)
+
     Server.run(character)
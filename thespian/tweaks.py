@@ -1,9 +1,9 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
-from characters import RulesetReader
-from notifications import prompt
+from characters import PROFICIENCIES, RulesetReader
 from parsers import FeatGuidelineBuilder
+from session import BuildSession
 
 log = logging.getLogger("thespian.tweaks")
 
@@ -12,10 +12,11 @@ log = logging.getLogger("thespian.tweaks")
 class AbilityScoreImprovement:
 
     character: dict
+    session: BuildSession = field(default_factory=BuildSession)
 
     def _add_feat_perks(self, feat: str) -> bool | dict | None:
         self.character["feats"].append(feat)
-        feat_parser = FeatGuidelineBuilder(feat, self.character)
+        feat_parser = FeatGuidelineBuilder(feat, self.character, self.session)
         return feat_parser.apply_perks(feat_parser.build_guidelines())
 
     def _get_adjustable_attributes(self, bonus: int) -> list:
@@ -33,135 +34,10 @@ class AbilityScoreImprovement:
         return adjustable_attributes
 
     def _get_number_of_upgrades(self) -> int:
-        number_of_upgrades = 0
-
-        level = self.character["level"]
-        for _ in range(1, level + 1):
-            if (_ % 4) == 0 and _ != 20:
-                number_of_upgrades += 1
-
-        klass = self.character["klass"]
-        if klass == "Fighter" and level >= 6:
-            number_of_upgrades += 1
-        if klass == "Rogue" and level >= 8:
-            number_of_upgrades += 1
-        if klass == "Fighter" and level >= 14:
-            number_of_upgrades += 1
-        if level >= 19:
-            number_of_upgrades += 1
-
-        return number_of_upgrades
+        return get_number_of_upgrades(self.character["klass"], self.character["level"])
 
     def _has_requirements(self, feat: str) -> bool:
-        # Character already has feat.
-        if feat in self.character["feats"]:
-            return False
-
-        klass = self.character["klass"]
-        armors = self.character["armors"]
-
-        # If Heavily, Lightly, or Moderately Armored feat or a Monk.
-        # "Armor Related" or Weapon Master feat but already proficient.
-        if (
-            feat
-            in (
-                "Heavily Armored",
-                "Lightly Armored",
-                "Moderately Armored",
-            )
-            and klass == "Monk"
-        ):
-            return False
-
-        elif feat in (
-            "Heavily Armored",
-            "Lightly Armored",
-            "Moderately Armored",
-            "Weapon Master",
-        ):
-            # Heavily Armored: Character already has heavy armor proficiency.
-            # Lightly Armored: Character already has light armor proficiency.
-            # Moderately Armored: Character already has medium armor proficiency.
-            # Weapon Master: Character already has martial weapon proficiency.
-            if feat == "Heavily Armored" and "Heavy" in armors:
-                return False
-            elif feat == "Lightly Armored" and "Light" in armors:
-                return False
-            elif feat == "Moderately Armored" and "Medium" in armors:
-                return False
-            elif feat == "Weapon Master" and "Martial" in self.character["weapons"]:
-                return False
-
-        # Cycle through ALL prerequisites for the feat.
-        feat_prerequisites = RulesetReader.get_feat_requirements(feat)
-        for requirement, _ in feat_prerequisites.items():
-            # Ignore requirements that are None
-            if feat_prerequisites[requirement] is None:
-                continue
-
-            # Check ability requirements
-            if requirement == "ability":
-                for ability, minimum_score in feat_prerequisites[requirement].items():
-                    my_score = self.character["scores"][ability]
-                    if my_score < minimum_score:
-                        return False
-
-            # Check caster requirements
-            if requirement == "caster":
-                # If no spellcasting ability.
-                if (
-                    feat_prerequisites[requirement]
-                    and self.character["spell_slots"] == "0"
-                ):
-                    return False
-
-                # Magic Initiative requirements check.
-                if feat == "Magic Initiative" and klass not in (
-                    "Bard",
-                    "Cleric",
-                    "Druid",
-                    "Sorcerer",
-                    "Warlock",
-                    "Wizard",
-                ):
-                    return False
-
-                # Ritual Caster requirements check
-                if feat == "Ritual Caster":
-                    primary_ability = self.ability[0]
-                    if primary_ability not in ("Intelligence", "Wisdom"):
-                        return False
-
-                    my_score = self.scores[primary_ability]
-                    minimum_score = feat_prerequisites["ability"][primary_ability]
-
-                    if my_score < minimum_score:
-                        return False
-
-            # Check proficiency requirements
-            if requirement == "proficiency":
-                if feat in (
-                    "Heavy Armor Master",
-                    "Heavily Armored",
-                    "Medium Armor Master",
-                    "Moderately Armored",
-                ):
-                    required_armors = feat_prerequisites[requirement]["armors"]
-                    for armor in required_armors:
-                        if armor not in required_armors:
-                            return False
-
-            # Check race requirements
-            if requirement == "race":
-                if self.character["race"] not in feat_prerequisites[requirement]:
-                    return False
-
-            # Check subrace requirements
-            if requirement == "subrace":
-                if self.character["subrace"] not in feat_prerequisites[requirement]:
-                    return False
-
-        return True
+        return has_feat_requirements(feat, self.character)
 
     def _is_adjustable(self, attribute: str, bonus: int = 1) -> bool:
         if not isinstance(attribute, str):
@@ -183,24 +59,27 @@ class AbilityScoreImprovement:
 
         return True
 
-    def tweak(self) -> None | bool:
-        if self.character["level"] < 4:
-            logging.warning("Character level less than 4. No upgrades available.")
-            return False
-
-        # Get the number of available upgrades.
-        upgrades_available = self._get_number_of_upgrades()
+    def tweak(self, upgrades_available: int | None = None) -> None | bool:
+        # Get the number of available upgrades, unless specified.
+        if upgrades_available is None:
+            if self.character["level"] < 4:
+                log.warning("Character level less than 4. No upgrades available.")
+                return False
+            upgrades_available = self._get_number_of_upgrades()
 
         while upgrades_available > 0:
-            my_upgrade = prompt(
+            my_upgrade = self.session.policy(
                 f"What would you like to upgrade? ({upgrades_available})",
                 ["Ability", "Feat"],
+                category="upgrade",
             )
 
             # Path #1: Upgrade an Ability.
             if my_upgrade == "Ability":
-                my_bonus = prompt(
-                    "Apply how many points to your attribute?", ["1", "2"]
+                my_bonus = self.session.policy(
+                    "Apply how many points to your attribute?",
+                    ["1", "2"],
+                    category="upgrade_bonus",
                 )
 
                 # Apply +2 bonus to one ability.
@@ -208,41 +87,39 @@ class AbilityScoreImprovement:
                 if my_bonus == 1:
                     ability_options = self._get_adjustable_attributes(my_bonus)
                     for _ in range(2):
-                        my_ability = prompt(
+                        my_ability = self.session.policy(
                             "Apply a +1 to which attribute?",
                             ability_options,
+                            category="upgrade_ability",
                         )
                         ability_options.remove(my_ability)
                         self._set_attribute(my_ability, my_bonus)
                 elif my_bonus == 2:
                     ability_options = self._get_adjustable_attributes(my_bonus)
-                    my_ability = prompt(
+                    my_ability = self.session.policy(
                         "Apply a +2 to which attribute?",
                         ability_options,
+                        category="upgrade_ability",
                     )
                     self._set_attribute(my_ability, my_bonus)
 
             # Path #2: Add a new Feat.
             elif my_upgrade == "Feat":
-                # Gather a list of all applicable feats.
-                feat_options = RulesetReader.get_all_feats()
-
-                my_feat = None
-                while my_feat is None:
-                    # Prompt the user to make a selection.
-                    my_feat = prompt(
-                        f"Which feat do you want to acquire?",
+                # Only offer the feats the character meets the requirements of,
+                # so a rejected answer never triggers a second prompt.
+                feat_options = [
+                    feat
+                    for feat in RulesetReader.get_all_feats()
+                    if self._has_requirements(feat)
+                ]
+                if len(feat_options) == 0:
+                    log.warning("You don't meet the requirements for any feat.")
+                else:
+                    my_feat = self.session.policy(
+                        "Which feat do you want to acquire?",
                         feat_options,
+                        category="feat",
                     )
-
-                    # Remove the offending feat (either player already has it or doesn't meet the requirements).
-                    if not self._has_requirements(my_feat):
-                        log.warning(
-                            f"You don't meet the requirements for '{my_feat}'.",
-                        )
-                        my_feat = None
-                        feat_options.remove(my_feat)
-                else:
                     self._add_feat_perks(my_feat)
 
             # De-increment upgrade count.
@@ -257,6 +134,151 @@ class AbilityScoreImprovement:
         self.character["scores"][attribute] = new_score
 
 
+def has_feat_requirements(feat: str, character: dict) -> bool:
+    """Checks if a character meets a feat's requirements.
+
+    Requirements on parts of the character that are not known yet (i.e the
+    ability scores while planning a build) are taken as met.
+
+    """
+    # Character already has feat.
+    if feat in character["feats"]:
+        return False
+
+    klass = character["klass"]
+    armors = PROFICIENCIES.encode("armors", character["armors"])
+    weapons = PROFICIENCIES.encode("weapons", character["weapons"])
+
+    # If Heavily, Lightly, or Moderately Armored feat or a Monk.
+    # "Armor Related" or Weapon Master feat but already proficient.
+    if (
+        feat
+        in (
+            "Heavily Armored",
+            "Lightly Armored",
+            "Moderately Armored",
+        )
+        and klass == "Monk"
+    ):
+        return False
+
+    elif feat in (
+        "Heavily Armored",
+        "Lightly Armored",
+        "Moderately Armored",
+        "Weapon Master",
+    ):
+        # Heavily Armored: Character already has heavy armor proficiency.
+        # Lightly Armored: Character already has light armor proficiency.
+        # Moderately Armored: Character already has medium armor proficiency.
+        # Weapon Master: Character already has martial weapon proficiency.
+        if feat == "Heavily Armored" and PROFICIENCIES.has(
+            "armors", armors, "Heavy"
+        ):
+            return False
+        elif feat == "Lightly Armored" and PROFICIENCIES.has(
+            "armors", armors, "Light"
+        ):
+            return False
+        elif feat == "Moderately Armored" and PROFICIENCIES.has(
+            "armors", armors, "Medium"
+        ):
+            return False
+        elif feat == "Weapon Master" and PROFICIENCIES.has(
+            "weapons", weapons, "Martial"
+        ):
+            return False
+
+    # Cycle through ALL prerequisites for the feat.
+    feat_prerequisites = RulesetReader.get_feat_requirements(feat)
+    for requirement, _ in feat_prerequisites.items():
+        # Ignore requirements that are None
+        if feat_prerequisites[requirement] is None:
+            continue
+
+        # Check ability requirements
+        if requirement == "ability" and "scores" in character:
+            for ability, minimum_score in feat_prerequisites[requirement].items():
+                my_score = character["scores"][ability]
+                if my_score < minimum_score:
+                    return False
+
+        # Check caster requirements
+        if requirement == "caster":
+            # If no spellcasting ability.
+            if feat_prerequisites[requirement] and character["spell_slots"] == "0":
+                return False
+
+            # Magic Initiative requirements check.
+            if feat == "Magic Initiative" and klass not in (
+                "Bard",
+                "Cleric",
+                "Druid",
+                "Sorcerer",
+                "Warlock",
+                "Wizard",
+            ):
+                return False
+
+            # Ritual Caster requirements check
+            if feat == "Ritual Caster" and "scores" in character:
+                primary_ability = character["primary_ability"][0]
+                if primary_ability not in ("Intelligence", "Wisdom"):
+                    return False
+
+                my_score = character["scores"][primary_ability]
+                minimum_score = feat_prerequisites["ability"][primary_ability]
+
+                if my_score < minimum_score:
+                    return False
+
+        # Check proficiency requirements
+        if requirement == "proficiency":
+            if feat in (
+                "Heavy Armor Master",
+                "Heavily Armored",
+                "Medium Armor Master",
+                "Moderately Armored",
+            ):
+                required_armors = PROFICIENCIES.encode(
+                    "armors", feat_prerequisites[requirement]["armors"]
+                )
+                if required_armors & ~armors:
+                    return False
+
+        # Check race requirements
+        if requirement == "race":
+            if character["race"] not in feat_prerequisites[requirement]:
+                return False
+
+        # Check subrace requirements
+        if requirement == "subrace":
+            if character["subrace"] not in feat_prerequisites[requirement]:
+                return False
+
+    return True
+
+
+def get_number_of_upgrades(klass: str, level: int) -> int:
+    """Returns the number of ability score improvements by class and level."""
+    number_of_upgrades = 0
+
+    for _ in range(1, level + 1):
+        if (_ % 4) == 0 and _ != 20:
+            number_of_upgrades += 1
+
+    if klass == "Fighter" and level >= 6:
+        number_of_upgrades += 1
+    if klass == "Rogue" and level >= 8:
+        number_of_upgrades += 1
+    if klass == "Fighter" and level >= 14:
+        number_of_upgrades += 1
+    if level >= 19:
+        number_of_upgrades += 1
+
+    return number_of_upgrades
+
+
 # Begin test code.
 if __name__ == "__main__":
     x = FeatGuidelineBuilder(